@@ -8,21 +8,30 @@ interactive visualizations, step-by-step execution, and hands-on coding.
 __version__ = "2.1.0"
 __author__ = "LeetCode Practice"
 
-# Re-export main components for easy access
-from pyqt6_learning_labs.core import (
-    Colors,
-    Dimensions,
-    Timing,
-    Shortcuts,
-    set_futuristic_style,
-)
-
-from pyqt6_learning_labs.widgets import (
-    CodeEditor,
-    ComplexityWidget,
-    FlowchartWidget,
-    LessonWidget,
-)
+import importlib
+
+# Re-export main components for easy access. They are imported on first use,
+# so headless tools (python -m pyqt6_learning_labs.grade) never load PyQt6.
+_EXPORTS = {
+    'Colors': 'pyqt6_learning_labs.core',
+    'Dimensions': 'pyqt6_learning_labs.core',
+    'Timing': 'pyqt6_learning_labs.core',
+    'Shortcuts': 'pyqt6_learning_labs.core',
+    'set_futuristic_style': 'pyqt6_learning_labs.core',
+    'CodeEditor': 'pyqt6_learning_labs.widgets',
+    'ComplexityWidget': 'pyqt6_learning_labs.widgets',
+    'FlowchartWidget': 'pyqt6_learning_labs.widgets',
+    'LessonWidget': 'pyqt6_learning_labs.widgets',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Version info
@@ -1 +1,6 @@
-from .ui import AddTwoNumbersWidget
+def __getattr__(name):
+    # The widget needs PyQt6; logic and config do not
+    if name == 'AddTwoNumbersWidget':
+        from .ui import AddTwoNumbersWidget
+        return AddTwoNumbersWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -84,6 +84,24 @@ TEST_CASES = [
     ([0, 0, 1], [0, 0, 2], [0, 0, 3]),  # 100 + 200 = 300
 ]
 
+# Scale tier: (digits, seed) for generate_add_two_nums_case. Each case must
+# finish within a budget derived from timing add_two_numbers_reference.
+SCALE_CASES = [
+    (10_000, 1),
+    (100_000, 2),
+]
+
+# Complexity measurement: input sizes (a geometric range, small enough to
+# stay mostly in CPU cache) and the growth the reference solution shows
+COMPLEXITY_SIZES = [250, 500, 1_000, 2_000, 4_000, 8_000, 16_000, 32_000]
+EXPECTED_COMPLEXITY = "O(n)"
+
+# Benchmark report: sizes the reference and the submission are compared at
+BENCHMARK_SIZES = [1_000, 10_000, 100_000]
+
+# Line profiler: (n, seed) inputs from the scale-tier generator
+PROFILE_CASES = [(10_000, 1)]
+
 TEMPLATE_CODE = '''class ListNode:
     def __init__(self, val=0, next=None):
         self.val = val
@@ -1,4 +1,8 @@
-from typing import List, Tuple, Optional
+import random
+from typing import Iterator, List, Optional, Tuple
+
+from pyqt6_learning_labs.core.fuzz import FuzzSpec, shrink_int
+from pyqt6_learning_labs.core.trace import TraceEvent, preview_list
 
 class ListNode:
     def __init__(self, val: int = 0, next: "ListNode | None" = None):
@@ -14,44 +18,194 @@ def list_to_nodes(values: List[int]) -> Optional[ListNode]:
     return dummy.next
 
 def nodes_to_list(head: Optional[ListNode]) -> List[int]:
+    """The values of a linked list; ValueError if it loops back on itself."""
     out: List[int] = []
+    seen = set()
     cur = head
     while cur:
+        if id(cur) in seen:
+            raise ValueError(f"Linked list has a cycle after {len(out)} nodes")
+        seen.add(id(cur))
         out.append(cur.val)
         cur = cur.next
     return out
 
-def add_two_numbers_logic(l1: List[int], l2: List[int], base: int = 10) -> Tuple[List[int], List[str]]:
-    node1 = list_to_nodes(l1)
-    node2 = list_to_nodes(l2)
+def add_two_nums_trace(
+    l1: List[int],
+    l2: List[int],
+    base: int = 10,
+    start: Optional[Tuple[int, int]] = None
+) -> Iterator[TraceEvent]:
+    """
+    Yield the steps of the digit-by-digit addition one at a time.
 
-    dummy = ListNode()
-    cur = dummy
-    carry = 0
-    step = 0
-    trace: List[str] = [f"Input A: {l1}", f"Input B: {l2}", f"Base: {base}"]
+    The digits are read from the input lists by position, in the order the
+    linked-list walk visits them. The last event is "result", holding the
+    sum's digits. describe_add_two_nums_event renders an event as text.
+
+    start resumes at a (position, carry) state from add_two_nums_keyframe().
+    The digits before it are only worked out again if the result is reached.
+    """
+    if start is None:
+        yield TraceEvent("input_a", value=l1, node="start")
+        yield TraceEvent("input_b", value=l2, node="start")
+        yield TraceEvent("base", value=base, node="start")
+        start = (0, 0)
 
-    while node1 or node2 or carry:
-        v1 = node1.val if node1 else 0
-        v2 = node2.val if node2 else 0
+    digits: List[int] = []
+    step, carry = start
+    while step < len(l1) or step < len(l2) or carry:
+        v1 = l1[step] if step < len(l1) else 0
+        v2 = l2[step] if step < len(l2) else 0
         carry_in = carry
         total = v1 + v2 + carry_in
         carry = total // base
         digit = total % base
-        trace.append(
-            f"Step {step}: v1={v1}, v2={v2}, carry in={carry_in}, total={total}, "
-            f"write digit={digit}, carry out={carry}"
-        )
-        cur.next = ListNode(digit)
-        cur = cur.next
-        node1 = node1.next if node1 else None
-        node2 = node2.next if node2 else None
+        yield TraceEvent("add", step, (v1, v2, carry_in), (digit, carry), node="read")
+        digits.append(digit)
         step += 1
 
-    result = nodes_to_list(dummy.next)
-    trace.append(f"Result digits (reverse order): {result}")
-    return result, trace
+    if start[0]:
+        digits = _sum_digits(l1, l2, base, start[0]) + digits
+    yield TraceEvent("result", value=digits, node="done")
+
+def _sum_digits(l1: List[int], l2: List[int], base: int, count: int) -> List[int]:
+    """The first count digits of the sum, without a trace."""
+    digits: List[int] = []
+    carry = 0
+    for step in range(count):
+        total = (l1[step] if step < len(l1) else 0) + (l2[step] if step < len(l2) else 0) + carry
+        carry = total // base
+        digits.append(total % base)
+    return digits
+
+def add_two_nums_keyframe(event: TraceEvent) -> Optional[Tuple[int, int]]:
+    """(position, carry) add_two_nums_trace resumes from after event, if it can resume there."""
+    if event.kind == "add":
+        return event.index + 1, event.delta[1]
+    if event.kind == "base":
+        return 0, 0
+    return None
+
+def add_two_nums_trace_length(l1: List[int], l2: List[int]) -> int:
+    """Most steps add_two_nums_trace yields for l1 and l2."""
+    return max(len(l1), len(l2)) + 5
+
+def add_two_numbers_logic(l1: List[int], l2: List[int], base: int = 10) -> Tuple[List[int], List[TraceEvent]]:
+    """Return the sum's digits and the whole trace."""
+    trace = list(add_two_nums_trace(l1, l2, base))
+    return trace[-1].value, trace
+
+def describe_add_two_nums_event(event: TraceEvent) -> str:
+    """Text of one add_two_numbers_logic step."""
+    kind, index, value, delta, _ = event
+    if kind == "input_a":
+        return f"Input A: {preview_list(value)}"
+    if kind == "input_b":
+        return f"Input B: {preview_list(value)}"
+    if kind == "base":
+        return f"Base: {value}"
+    if kind == "add":
+        v1, v2, carry_in = value
+        digit, carry_out = delta
+        return (
+            f"Step {index}: v1={v1}, v2={v2}, carry in={carry_in}, total={v1 + v2 + carry_in}, "
+            f"write digit={digit}, carry out={carry_out}"
+        )
+    return f"Result digits (reverse order): {preview_list(value)}"
 
 def add_two_nums_complexity(n: int) -> List[int]:
     """O(max(m, n)) -> O(n) roughly."""
     return list(range(1, n + 1))
+
+def add_two_numbers_reference(l1: Optional[ListNode], l2: Optional[ListNode]) -> Optional[ListNode]:
+    """
+    Linked-list solution without tracing, used to time the scale tier.
+    """
+    dummy = ListNode()
+    cur = dummy
+    carry = 0
+    while l1 or l2 or carry:
+        total = carry
+        if l1:
+            total += l1.val
+            l1 = l1.next
+        if l2:
+            total += l2.val
+            l2 = l2.next
+        carry, digit = divmod(total, 10)
+        cur.next = ListNode(digit)
+        cur = cur.next
+    return dummy.next
+
+def generate_add_two_nums_case(n: int, seed: int) -> Tuple[Optional[ListNode], Optional[ListNode]]:
+    """
+    Seeded scale-tier input: two n-digit numbers as linked lists.
+
+    Built inside the sandbox (see safe_exec_suite's arg_converter) since
+    lists this long cannot be pickled node by node.
+    """
+    rng = random.Random(seed)
+    digits1 = [rng.randrange(10) for _ in range(n - 1)] + [rng.randrange(1, 10)]
+    digits2 = [rng.randrange(10) for _ in range(n - 1)] + [rng.randrange(1, 10)]
+    return list_to_nodes(digits1), list_to_nodes(digits2)
+
+
+def random_add_two_nums_input(rng: random.Random) -> Tuple[List[int], List[int]]:
+    """
+    Small random fuzzing input: two numbers as digit lists, least
+    significant first. Runs of 9s are common, to exercise long carries.
+    """
+    def number() -> List[int]:
+        length = rng.randint(1, 6)
+        if rng.random() < 0.3:
+            return [9] * length
+        digits = [rng.randrange(10) for _ in range(length - 1)]
+        digits.append(rng.randrange(1, 10) if length > 1 else rng.randrange(10))
+        return digits
+
+    return number(), number()
+
+def add_two_nums_fuzz_reference(l1: List[int], l2: List[int]) -> List[int]:
+    return add_two_numbers_logic(l1, l2)[0]
+
+def add_two_nums_call_args(l1: List[int], l2: List[int]) -> Tuple[Optional[ListNode], Optional[ListNode]]:
+    """Turn a fuzzing input into the linked lists add_two_numbers() takes."""
+    return list_to_nodes(l1), list_to_nodes(l2)
+
+def check_add_two_nums(args: Tuple[List[int], List[int]], expected: List[int], actual) -> Optional[str]:
+    if actual == expected:
+        return None
+    return "The digits of the sum differ from the reference"
+
+def shrink_add_two_nums(args: Tuple[List[int], List[int]]):
+    """Fewer digits first, then smaller digits; every candidate is a valid number."""
+    def valid(digits: List[int]) -> bool:
+        return len(digits) == 1 or digits[-1] != 0
+
+    def replace(which: int, digits: List[int]) -> Tuple[List[int], List[int]]:
+        return (digits, args[1]) if which == 0 else (args[0], digits)
+
+    for which, digits in enumerate(args):
+        if len(digits) > 1:
+            for index in range(len(digits)):
+                shorter = digits[:index] + digits[index + 1:]
+                if valid(shorter):
+                    yield replace(which, shorter)
+    for which, digits in enumerate(args):
+        for index, digit in enumerate(digits):
+            for smaller in shrink_int(digit):
+                candidate = digits[:index] + [smaller] + digits[index + 1:]
+                if valid(candidate):
+                    yield replace(which, candidate)
+
+ADD_TWO_NUMS_FUZZ = FuzzSpec(
+    "add_two_numbers",
+    random_add_two_nums_input,
+    add_two_nums_fuzz_reference,
+    check_add_two_nums,
+    shrink_add_two_nums,
+    arg_converter=add_two_nums_call_args,
+    result_converter=nodes_to_list,
+    namespace={"ListNode": ListNode},
+)
@@ -1,25 +1,62 @@
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTabWidget, QLabel, QFormLayout,
-    QLineEdit, QSpinBox, QPushButton, QTextEdit, QHBoxLayout,
-    QProgressBar, QApplication
+    QLineEdit, QSpinBox, QPushButton, QHBoxLayout,
+    QProgressBar, QApplication, QSlider, QFileDialog
 )
 from PyQt6.QtGui import QShortcut, QKeySequence
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, QElapsedTimer, pyqtSignal
 
 from pyqt6_learning_labs.widgets.lesson import LessonWidget
 from pyqt6_learning_labs.widgets.flowchart import FlowchartWidget
 from pyqt6_learning_labs.widgets.complexity import ComplexityWidget
-from pyqt6_learning_labs.widgets.code_editor import CodeEditor
+from pyqt6_learning_labs.widgets.code_lab import CodeLab, CodeLabProblem
+from pyqt6_learning_labs.widgets.test_runner import TraceWriter
+from pyqt6_learning_labs.widgets.trace_view import TraceView
 from pyqt6_learning_labs.apps.add_two_nums.logic import (
-    add_two_numbers_logic, add_two_nums_complexity,
-    list_to_nodes, nodes_to_list, ListNode
+    add_two_nums_trace, add_two_nums_trace_length, add_two_nums_keyframe, describe_add_two_nums_event, add_two_nums_complexity,
+    nodes_to_list, ListNode, add_two_nums_call_args,
+    add_two_numbers_reference, generate_add_two_nums_case, ADD_TWO_NUMS_FUZZ
 )
-from pyqt6_learning_labs.apps.add_two_nums.config import FLOWCHART_NODES, FLOWCHART_EDGES, TEST_CASES, TEMPLATE_CODE
-from pyqt6_learning_labs.core.constants import Colors, Timing
+from pyqt6_learning_labs.apps.add_two_nums.config import (
+    FLOWCHART_NODES, FLOWCHART_EDGES, TEST_CASES, SCALE_CASES,
+    COMPLEXITY_SIZES, EXPECTED_COMPLEXITY, BENCHMARK_SIZES, PROFILE_CASES, TEMPLATE_CODE
+)
+from pyqt6_learning_labs.core.constants import Colors, Timing, Playground
 from pyqt6_learning_labs.core.utils import get_lessons_dir
-from pyqt6_learning_labs.core.safe_exec import safe_exec_function
+from pyqt6_learning_labs.core.trace import TraceStream, preview_list
+from pyqt6_learning_labs.core.trace_file import OPEN_FILTER, SAVE_FILTERS, TraceReader, trace_file_format
+
+
+# Add Two Numbers in the shared Code Lab. The answers are read back inside
+# the sandbox, since the submission's ListNode class cannot leave a worker.
+ADD_TWO_NUMS_CODE_LAB = CodeLabProblem(
+    func_name="add_two_numbers",
+    signature="add_two_numbers(l1, l2)",
+    instructions=(
+        "Write your implementation below. The function receives two linked lists "
+        "representing numbers in reverse order and should return a new linked list with the sum."
+    ),
+    template=TEMPLATE_CODE,
+    test_cases=TEST_CASES,
+    case_separator=" + ",
+    arg_names=("l1", "l2"),
+    scale_cases=SCALE_CASES,
+    complexity_sizes=COMPLEXITY_SIZES,
+    expected_complexity=EXPECTED_COMPLEXITY,
+    benchmark_sizes=BENCHMARK_SIZES,
+    profile_cases=PROFILE_CASES,
+    generate=generate_add_two_nums_case,
+    reference=add_two_numbers_reference,
+    fuzz=ADD_TWO_NUMS_FUZZ,
+    report_name="add-two-numbers",
+    to_args=add_two_nums_call_args,
+    to_expected=nodes_to_list,
+    namespace={"ListNode": ListNode},
+    result_converter=nodes_to_list,
+)
 
 
 class AddTwoNumsPlayground(QWidget):
@@ -30,11 +67,18 @@ class AddTwoNumsPlayground(QWidget):
     def __init__(self, flowchart_widget: Optional[FlowchartWidget] = None):
         super().__init__()
         self.flowchart = flowchart_widget
-        self.trace_steps: List[str] = []
+        self.trace: Optional[TraceStream] = None  # Steps of the current run, produced on demand
+        self._trace_file: Optional[TraceReader] = None  # File a loaded trace is replayed from
+        self._trace_error: Optional[str] = None  # Why the loaded file's trace ended early
+        self._writer: Optional[TraceWriter] = None  # Saving a trace in the background
+        self._save_total = 0  # Expected events in the trace being saved
         self.current_step = 0
         self.is_playing = False
         self.play_timer = QTimer()
+        self.play_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.play_timer.timeout.connect(self._auto_step)
+        self.play_clock = QElapsedTimer()
+        self._played = 0  # Steps auto-play has advanced since play_clock started
 
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -105,6 +149,16 @@ class AddTwoNumsPlayground(QWidget):
         self.play_btn.clicked.connect(self.toggle_play)
         control_bar.addWidget(self.play_btn)
 
+        self.speed_input = QSpinBox()
+        self.speed_input.setRange(Playground.PLAY_SPEED_MIN, Playground.PLAY_SPEED_MAX)
+        self.speed_input.setValue(1000 // Timing.STEP_DELAY_MS)
+        self.speed_input.setSuffix(" steps/s")
+        self.speed_input.setStepType(QSpinBox.StepType.AdaptiveDecimalStepType)
+        self.speed_input.setToolTip("Auto-play speed")
+        self.speed_input.setAccessibleName("Auto-play speed in steps per second")
+        self.speed_input.valueChanged.connect(self._on_speed_changed)
+        control_bar.addWidget(self.speed_input)
+
         self.reset_btn = QPushButton("Reset")
         self.reset_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.reset_btn.clicked.connect(self.reset)
@@ -166,8 +220,30 @@ class AddTwoNumsPlayground(QWidget):
             }}
         """)
         status_bar.addWidget(self.export_btn)
+
+        self.save_btn = QPushButton("💾 Save Trace")
+        self.save_btn.clicked.connect(self.save_trace)
+        self.save_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.save_btn.setToolTip("Stream the whole trace to a .trace or .jsonl file")
+        self.save_btn.setStyleSheet(self.export_btn.styleSheet())
+        status_bar.addWidget(self.save_btn)
+
+        self.load_btn = QPushButton("📂 Load Trace")
+        self.load_btn.clicked.connect(self.load_trace)
+        self.load_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.load_btn.setToolTip("Replay a saved trace file")
+        self.load_btn.setStyleSheet(self.export_btn.styleSheet())
+        status_bar.addWidget(self.load_btn)
         layout.addLayout(status_bar)
 
+        # Scrubber - seek to any step, replayed from the nearest keyframe
+        self.scrubber = QSlider(Qt.Orientation.Horizontal)
+        self.scrubber.setRange(0, 0)
+        self.scrubber.setEnabled(False)
+        self.scrubber.setAccessibleName("Seek to a trace step")
+        self.scrubber.valueChanged.connect(self.seek)
+        layout.addWidget(self.scrubber)
+
         # Current step display
         self.current_step_label = QLabel("Click ▶ Run to execute the algorithm")
         self.current_step_label.setStyleSheet(f"""
@@ -182,122 +258,124 @@ class AddTwoNumsPlayground(QWidget):
         layout.addWidget(self.current_step_label)
 
         # Trace output - takes remaining space
-        self.trace_box = QTextEdit()
-        self.trace_box.setReadOnly(True)
-        self.trace_box.setPlaceholderText("Execution trace will appear here...")
-        self.trace_box.setStyleSheet(f"""
-            QTextEdit {{
-                background-color: {Colors.BG_CARD};
-                border: 1px solid {Colors.ACCENT_TERTIARY};
-                border-radius: 4px;
-                padding: 12px;
-                font-family: 'Courier New', monospace;
-                font-size: 14px;
-                line-height: 1.5;
-            }}
-        """)
+        self.trace_box = TraceView()
         layout.addWidget(self.trace_box, 1)
 
-        # Map trace patterns to flowchart nodes
-        self._node_patterns = {
-            "Input A:": "start",
-            "Input B:": "start",
-            "Base:": "start",
-            "v1=": "read",
-            "total=": "sum",
-            "write digit": "split",
-            "carry out": "append",
-            "Result digits": "done",
-        }
-
-    def _get_flowchart_node(self, step_text: str) -> Optional[str]:
-        """Determine which flowchart node corresponds to a trace step."""
-        for pattern, node_key in self._node_patterns.items():
-            if pattern in step_text:
-                return node_key
-        return None
-
-    def _update_flowchart(self, step_text: str):
+    def _update_flowchart(self, node_key: Optional[str]):
         """Update flowchart highlighting based on current step."""
-        if self.flowchart:
-            node_key = self._get_flowchart_node(step_text)
-            if node_key:
-                self.flowchart.highlight_node(node_key)
-                self.step_changed.emit(node_key)
+        if self.flowchart and node_key:
+            self.flowchart.highlight_node(node_key)
+            self.step_changed.emit(node_key)
 
-    def run_all(self):
-        """Run the complete trace at once."""
+    def _parse_inputs(self) -> Optional[tuple]:
+        """(l1, l2, base) from the input fields, or None after showing the error."""
         try:
             l1 = [int(x.strip()) for x in self.list1_input.text().split(",") if x.strip()]
             l2 = [int(x.strip()) for x in self.list2_input.text().split(",") if x.strip()]
         except ValueError:
             self.result_label.setText("Error: Invalid input list")
             self.result_label.setStyleSheet(f"color: {Colors.ERROR}; font-weight: bold;")
-            return
-
-        base = self.base_spin.value()
-        result, self.trace_steps = add_two_numbers_logic(l1, l2, base)
+            return None
+        return l1, l2, self.base_spin.value()
+
+    def _start_trace(self) -> bool:
+        """Start streaming the trace for the current inputs; False if they are invalid."""
+        inputs = self._parse_inputs()
+        if inputs is None:
+            return False
+
+        l1, l2, base = inputs
+        self._close_trace_file()
+        self.trace = TraceStream(
+            add_two_nums_trace(l1, l2, base), describe_add_two_nums_event, add_two_nums_trace_length(l1, l2),
+            resume=partial(add_two_nums_trace, l1, l2, base), keyframe=add_two_nums_keyframe
+        )
+        self.current_step = 0
+        return True
 
-        self.result_label.setText(f"Result: {result}")
+    def _show_result(self):
+        """Show the sum once the trace has produced its last step."""
+        if self._trace_error is not None:
+            self._show_error(self._trace_error)
+            return
+        if self.trace.final is None:
+            return
+        result = self.trace.final.value
+        self.result_label.setText(f"Result: {preview_list(result)}")
         self.result_label.setStyleSheet(f"color: {Colors.ACCENT_SECONDARY}; font-weight: bold;")
 
-        # Show all steps at once
-        self.current_step = len(self.trace_steps)
-        self.trace_box.setPlainText("\n".join(self.trace_steps))
-        self.progress.setMaximum(len(self.trace_steps))
-        self.progress.setValue(len(self.trace_steps))
+    def _show_step(self):
+        """Update progress, labels, flowchart and trace box for current_step."""
+        # "~" until the generator has run out and the step count is known
+        self.progress.setFormat("Step %v of ~%m" if self.trace.total is None else "Step %v of %m")
+        self.progress.setMaximum(self.trace.estimate)
+        self.progress.setValue(self.current_step)
+        self._sync_scrubber()
+
+        self.current_step_label.setText(self.trace.text(self.current_step - 1))
+        self._update_flowchart(self.trace.event(self.current_step - 1).node)
+        self.trace_box.show_steps(self.trace, self.trace.first_kept, self.current_step)
+        self._show_result()
 
-        if self.trace_steps:
-            self.current_step_label.setText(self.trace_steps[-1])
-            self._update_flowchart(self.trace_steps[-1])
+    def run_all(self):
+        """Run the complete trace at once."""
+        if not self._start_trace():
+            return
 
+        # Show all steps at once (the trace box keeps the last TRACE_HISTORY)
+        self.current_step = self.trace.run_to_end()
+        if self.current_step:
+            self._show_step()
         self._update_buttons()
 
     def step_forward(self):
         """Advance one step in the trace."""
-        if not self.trace_steps:
-            try:
-                l1 = [int(x.strip()) for x in self.list1_input.text().split(",") if x.strip()]
-                l2 = [int(x.strip()) for x in self.list2_input.text().split(",") if x.strip()]
-            except ValueError:
-                self.result_label.setText("Error: Invalid input list")
-                return
-
-            base = self.base_spin.value()
-            result, self.trace_steps = add_two_numbers_logic(l1, l2, base)
-            self.current_step = 0
-            self.progress.setMaximum(len(self.trace_steps))
-
-            self.result_label.setText(f"Result: {result}")
-            self.result_label.setStyleSheet(f"color: {Colors.ACCENT_SECONDARY}; font-weight: bold;")
-
-        if self.current_step < len(self.trace_steps):
-            step_text = self.trace_steps[self.current_step]
+        if self.trace is None and not self._start_trace():
+            return
+
+        if self.trace.available(self.current_step):
             self.current_step += 1
-            self.progress.setValue(self.current_step)
-            self.current_step_label.setText(step_text)
-            self._update_flowchart(step_text)
-            self.trace_box.setPlainText("\n".join(self.trace_steps[:self.current_step]))
+            self._show_step()
 
         self._update_buttons()
 
     def step_back(self):
         """Go back one step in the trace."""
-        if self.current_step > 1:
+        if self.current_step > 1 and self.trace.seek(self.current_step - 2):
             self.current_step -= 1
-            self.progress.setValue(self.current_step)
-            step_text = self.trace_steps[self.current_step - 1]
-            self.current_step_label.setText(step_text)
-            self._update_flowchart(step_text)
-            self.trace_box.setPlainText("\n".join(self.trace_steps[:self.current_step]))
+            self._show_step()
         elif self.current_step == 1:
-            self.current_step = 0
-            self.progress.setValue(0)
-            self.current_step_label.setText("Click ▶ Run to execute the algorithm")
-            self.trace_box.clear()
+            self._show_start()
 
         self._update_buttons()
 
+    def seek(self, step: int):
+        """Show the first step steps of the trace, replaying from a keyframe if needed."""
+        if self.trace is None or step == self.current_step:
+            return
+        if step == 0:
+            self._show_start()
+        else:
+            # Past the end the stream stops at its last step
+            self.current_step = step if self.trace.seek(step - 1) else self.trace.produced
+            self._show_step()
+        self._update_buttons()
+
+    def _show_start(self):
+        """Show the trace before its first step."""
+        self.current_step = 0
+        self.progress.setValue(0)
+        self._sync_scrubber()
+        self.current_step_label.setText("Click ▶ Run to execute the algorithm")
+        self.trace_box.clear()
+
+    def _sync_scrubber(self):
+        """Move the scrubber to current_step without seeking."""
+        self.scrubber.blockSignals(True)
+        self.scrubber.setMaximum(self.trace.estimate if self.trace is not None else 0)
+        self.scrubber.setValue(self.current_step)
+        self.scrubber.blockSignals(False)
+
     def toggle_play(self):
         """Toggle auto-play mode."""
         if self.is_playing:
@@ -305,22 +383,45 @@ class AddTwoNumsPlayground(QWidget):
             self.play_timer.stop()
             self.play_btn.setText("Auto")
         else:
-            if not self.trace_steps:
+            if self.trace is None:
                 self.step_forward()
             self.is_playing = True
             self.play_btn.setText("⏸ Pause")
-            self.play_timer.start(Timing.STEP_DELAY_MS)
+            self._start_play_clock()
+
+    def _start_play_clock(self):
+        """(Re)start auto-play timing at the current speed."""
+        self._played = 0
+        self.play_clock.start()
+        # A tick per step when slow; above display rate, a tick per frame
+        self.play_timer.start(max(Playground.FRAME_INTERVAL_MS, 1000 // self.speed_input.value()))
+
+    def _on_speed_changed(self):
+        if self.is_playing:
+            self._start_play_clock()
 
     def _auto_step(self):
-        """Called by timer for auto-play."""
-        if self.current_step < len(self.trace_steps):
-            self.step_forward()
-        else:
-            self.toggle_play()
+        """Called by timer for auto-play: advance every step due, then repaint once."""
+        speed = self.speed_input.value()
+        due_total = self.play_clock.elapsed() * speed // 1000
+        due = due_total - self._played
+        if due <= 0:
+            return  # Timer fired a little early
+        self._played = due_total
+        # After a stall, catch up a few frames' worth rather than everything
+        due = min(due, max(1, speed * Playground.FRAME_INTERVAL_MS * 4 // 1000))
+
+        if self.trace is None or not self.trace.available(self.current_step):
+            self.toggle_play()  # Stop at end
+            return
+        stop = self.current_step + due
+        self.current_step = stop if self.trace.available(stop - 1) else self.trace.produced
+        self._show_step()
+        self._update_buttons()
 
     def _on_input_changed(self):
         """Reset trace when inputs change since old trace is invalid."""
-        if self.trace_steps:  # Only reset if there's an existing trace
+        if self.trace is not None:  # Only reset if there's an existing trace
             self.reset()
 
     def reset(self):
@@ -328,151 +429,129 @@ class AddTwoNumsPlayground(QWidget):
         self.is_playing = False
         self.play_timer.stop()
         self.play_btn.setText("Auto")
-        self.trace_steps = []
+        self.trace = None
+        self._close_trace_file()
         self.current_step = 0
         self.progress.setValue(0)
         self.progress.setMaximum(100)
+        self.progress.setFormat("Step %v of %m")
         self.result_label.setText("Result: —")
         self.result_label.setStyleSheet(f"font-weight: bold; color: {Colors.ACCENT_SECONDARY};")
         self.current_step_label.setText("Click ▶ Run to execute the algorithm")
         self.trace_box.clear()
+        self._sync_scrubber()
         self._update_buttons()
 
     def _update_buttons(self):
         """Update button states based on current state."""
-        has_trace = len(self.trace_steps) > 0
+        has_trace = self.trace is not None
         at_start = self.current_step == 0
-        at_end = has_trace and self.current_step >= len(self.trace_steps)
+        at_end = has_trace and not self.trace.available(self.current_step)
 
         # Back only enabled if we have steps to go back to
         self.step_back_btn.setEnabled(has_trace and not at_start)
+        self.scrubber.setEnabled(has_trace)
         # Forward enabled unless we're at the end of a completed trace
         self.step_forward_btn.setEnabled(not at_end)
         # Auto enabled unless we're at the end of a completed trace
         self.play_btn.setEnabled(not at_end)
 
     def export_trace(self):
-        """Copy trace to clipboard."""
-        if self.trace_steps:
+        """Copy the steps shown so far to the clipboard."""
+        if self.trace is not None:
             clipboard = QApplication.clipboard()
             trace_text = f"Add Two Numbers Trace\n{'='*40}\n"
             trace_text += f"List A: {self.list1_input.text()}\n"
             trace_text += f"List B: {self.list2_input.text()}\n"
             trace_text += f"Base: {self.base_spin.value()}\n"
             trace_text += f"{'='*40}\n\n"
-            trace_text += "\n".join(self.trace_steps)
+            if self.trace.first_kept:
+                trace_text += f"(first {self.trace.first_kept:,} steps no longer kept)\n"
+            trace_text += "\n".join(self.trace.texts(self.trace.first_kept, self.current_step))
             trace_text += f"\n\n{self.result_label.text()}"
             clipboard.setText(trace_text)
-
             original_text = self.export_btn.text()
             self.export_btn.setText("Copied!")
             QTimer.singleShot(1500, lambda: self.export_btn.setText(original_text))
 
+    def save_trace(self):
+        """Stream the whole trace for the current inputs to a file on a background thread."""
+        if self._writer is not None:
+            self._writer.cancel()  # The button cancels while a save is running
+            return
+        inputs = self._parse_inputs()
+        if inputs is None:
+            return
+        path, chosen = QFileDialog.getSaveFileName(self, "Save Trace", "add-two-numbers-trace.trace", ";;".join(SAVE_FILTERS))
+        if not path:
+            return
+        try:
+            trace_file_format(path)
+        except ValueError:
+            path += SAVE_FILTERS.get(chosen, ".trace")
+
+        self._save_total = add_two_nums_trace_length(*inputs[:2])
+        self._writer = TraceWriter(path, add_two_nums_trace(*inputs), "add_two_numbers", parent=self)
+        self._writer.progress.connect(self._on_save_progress)
+        self._writer.write_finished.connect(self._on_save_finished)
+        self._writer.finished.connect(self._writer.deleteLater)
+        self.save_btn.setText("✖ Cancel Save")
+        self._writer.start()
+
+    def _on_save_progress(self, written: int):
+        self.save_btn.setText(f"✖ Cancel Save ({min(written / self._save_total, 1):.0%})")
+
+    def _on_save_finished(self, written: int, error: str):
+        cancelled = self._writer.cancelled
+        self._writer = None
+        self.save_btn.setText("💾 Save Trace")
+        if error:
+            self._show_error(error)
+        elif not cancelled:
+            self.save_btn.setText("Saved!")
+            QTimer.singleShot(1500, lambda: self.save_btn.setText("💾 Save Trace"))
+
+    def load_trace(self):
+        """Replay a saved trace file in the playground."""
+        path, _ = QFileDialog.getOpenFileName(self, "Load Trace", "", OPEN_FILTER)
+        if not path:
+            return
+        try:
+            reader = TraceReader(path)
+        except (OSError, ValueError) as e:
+            self._show_error(str(e))
+            return
+        if reader.problem != "add_two_numbers":
+            reader.close()
+            self.result_label.setText(f"Error: That trace is from {reader.problem}")
+            self.result_label.setStyleSheet(f"color: {Colors.ERROR}; font-weight: bold;")
+            return
 
-class AddTwoNumsCodeLab(QWidget):
-    def __init__(self):
-        super().__init__()
-        layout = QVBoxLayout(self)
-        layout.setSpacing(15)
-        layout.setContentsMargins(20, 20, 20, 20)
+        self.reset()
+        self._trace_file = reader
+        self.trace = TraceStream(
+            self._replay(), describe_add_two_nums_event, reader.steps or 0,
+            resume=self._replay, keyframe=reader.keyframe
+        )
+        self.step_forward()
 
-        # Instructions
-        header = QLabel("Code Lab - Implement add_two_numbers(l1, l2)")
-        header.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {Colors.ACCENT_PRIMARY};")
-        layout.addWidget(header)
+    def _replay(self, offset: Optional[int] = None):
+        """The loaded file's events; a corrupt record ends the trace with its error shown."""
+        try:
+            yield from self._trace_file.events(offset)
+        except (OSError, ValueError) as e:
+            self._trace_error = str(e)
+            self._show_error(self._trace_error)
 
-        instructions = QLabel(
-            "Write your implementation below. The function receives two linked lists "
-            "representing numbers in reverse order and should return a new linked list with the sum."
-        )
-        instructions.setWordWrap(True)
-        instructions.setStyleSheet(f"color: {Colors.TEXT_SECONDARY};")
-        layout.addWidget(instructions)
-
-        self.editor = CodeEditor(TEMPLATE_CODE)
-        layout.addWidget(self.editor)
-
-        # Button row
-        btn_layout = QHBoxLayout()
-
-        test_btn = QPushButton("Run Tests")
-        test_btn.clicked.connect(self.run_tests)
-        test_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        test_btn.setAccessibleName("Run test cases against your code")
-        btn_layout.addWidget(test_btn)
-
-        reset_btn = QPushButton("Reset Code")
-        reset_btn.clicked.connect(self.reset_code)
-        reset_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        reset_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                color: {Colors.TEXT_SECONDARY};
-                border: 1px solid {Colors.ACCENT_TERTIARY};
-            }}
-            QPushButton:hover {{
-                color: {Colors.ERROR};
-                border-color: {Colors.ERROR};
-            }}
-        """)
-        btn_layout.addWidget(reset_btn)
-
-        btn_layout.addStretch()
-        layout.addLayout(btn_layout)
-
-        # Results
-        self.feedback = QTextEdit()
-        self.feedback.setReadOnly(True)
-        self.feedback.setMaximumHeight(180)
-        self.feedback.setPlaceholderText("Test results will appear here...")
-        layout.addWidget(self.feedback)
-
-    def reset_code(self):
-        """Reset code to template."""
-        self.editor.set_code(TEMPLATE_CODE)
-        self.feedback.clear()
-
-    def run_tests(self):
-        code = self.editor.get_code()
-
-        results = []
-        all_passed = True
-        tests_run = 0
-
-        for l1_vals, l2_vals, expected in TEST_CASES:
-            # Create linked lists for safe execution namespace
-            namespace = {"ListNode": ListNode}
-
-            # First compile the code to define add_two_numbers
-            success, result, message = safe_exec_function(
-                code,
-                "add_two_numbers",
-                args=(list_to_nodes(l1_vals), list_to_nodes(l2_vals)),
-                namespace=namespace,
-                timeout=2.0
-            )
-
-            tests_run += 1
-
-            if not success:
-                results.append(f"ERROR: {l1_vals} + {l2_vals} -> {message}")
-                all_passed = False
-            else:
-                res = nodes_to_list(result)
-                if res == expected:
-                    results.append(f"PASS: {l1_vals} + {l2_vals} -> {res}")
-                else:
-                    results.append(f"FAIL: {l1_vals} + {l2_vals} -> Expected {expected}, Got {res}")
-                    all_passed = False
-
-        final_msg = "\n".join(results)
-        if all_passed and tests_run > 0:
-            final_msg += f"\n\nAll {tests_run} Tests Passed! Great Job!"
-            self.feedback.setStyleSheet(f"color: {Colors.SUCCESS};")
-        else:
-            self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+    def _show_error(self, message: str):
+        self.result_label.setText(f"Error: {message}")
+        self.result_label.setStyleSheet(f"color: {Colors.ERROR}; font-weight: bold;")
 
-        self.feedback.setPlainText(final_msg)
+    def _close_trace_file(self):
+        self._trace_error = None
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = None
 
 
 class AddTwoNumbersWidget(QWidget):
@@ -498,17 +577,17 @@ class AddTwoNumbersWidget(QWidget):
         self.tabs.addTab(self.flowchart, "Flowchart")
 
         # Complexity Tab
-        self.tabs.addTab(
-            ComplexityWidget(
-                "Time Complexity: O(max(m, n))",
-                "Max List Length",
-                "Operations",
-                add_two_nums_complexity
-            ),
-            "Complexity"
+        self.complexity = ComplexityWidget(
+            "Time Complexity: O(max(m, n))",
+            "Max List Length",
+            "Operations",
+            add_two_nums_complexity
         )
+        self.tabs.addTab(self.complexity, "Complexity")
 
-        # Code Lab Tab
-        self.tabs.addTab(AddTwoNumsCodeLab(), "Code Lab")
+        # Code Lab Tab, whose measurements are plotted on the complexity tab
+        self.code_lab = CodeLab(ADD_TWO_NUMS_CODE_LAB)
+        self.code_lab.complexity_measured.connect(self.complexity.set_measurements)
+        self.tabs.addTab(self.code_lab, "Code Lab")
 
         layout.addWidget(self.tabs)
@@ -1 +1,6 @@
-from .ui import TwoSumWidget
+def __getattr__(name):
+    # The widget needs PyQt6; logic and config do not
+    if name == 'TwoSumWidget':
+        from .ui import TwoSumWidget
+        return TwoSumWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -75,6 +75,25 @@ TEST_CASES = [
     ([1, 2, 3], 100, []),
 ]
 
+# Scale tier: (n, seed) for generate_two_sum_case. Each case must finish
+# within a budget derived from timing two_sum_reference on the same input.
+SCALE_CASES = [
+    (10_000, 1),
+    (100_000, 2),
+    (1_000_000, 3),
+]
+
+# Complexity measurement: input sizes (a geometric range, small enough to
+# stay mostly in CPU cache) and the growth the reference solution shows
+COMPLEXITY_SIZES = [250, 500, 1_000, 2_000, 4_000, 8_000, 16_000, 32_000]
+EXPECTED_COMPLEXITY = "O(n)"
+
+# Benchmark report: sizes the reference and the submission are compared at
+BENCHMARK_SIZES = [1_000, 10_000, 100_000]
+
+# Line profiler: (n, seed) inputs from the scale-tier generator
+PROFILE_CASES = [(10_000, 1)]
+
 TEMPLATE_CODE = '''def two_sum(nums, target):
     """Return the indices of the two numbers that hit the target."""
     seen = {}
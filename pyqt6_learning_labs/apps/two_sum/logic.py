@@ -1,28 +1,167 @@
-from typing import List, Tuple, Dict
+import random
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def two_sum_logic(nums: List[int], target: int) -> Tuple[List[int], List[str]]:
+from pyqt6_learning_labs.core.fuzz import FuzzSpec, shrink_int
+from pyqt6_learning_labs.core.trace import TraceEvent, preview_list
+
+def two_sum_trace(nums: List[int], target: int, start: Optional[int] = None) -> Iterator[TraceEvent]:
     """
-    Return indices and a textual trace of the algorithm.
+    Yield the steps of the hash map algorithm one at a time.
+
+    The last event is "found" (index and delta give the answer) or
+    "not_found". describe_two_sum_event renders an event as text.
+
+    start resumes at that index of nums, from a two_sum_keyframe() state.
+    The seen map is rebuilt from nums[:start] instead of being stored in the
+    keyframe: entries are written in index order, so dict(zip()) gives the
+    same map at C speed, and a keyframe stays one int.
     """
-    seen: Dict[int, int] = {}
-    steps = [f"Target: {target}", f"Input: {nums}"]
+    if start is None:
+        seen: Dict[int, int] = {}
+        yield TraceEvent("target", value=target, node="start")
+        yield TraceEvent("input", value=nums, node="start")
+        start = 0
+    else:
+        seen = dict(zip(islice(nums, start), range(start)))
 
-    for index, value in enumerate(nums):
+    for index in range(start, len(nums)):
+        value = nums[index]
         needed = target - value
-        steps.append(f"Index {index}: value={value}, need={needed}")
+        yield TraceEvent("visit", index, value, needed, node="loop")
 
         if needed in seen:
-            steps.append(
-                f"Found complement! seen[{needed}]={seen[needed]} so return [{seen[needed]}, {index}]"
-            )
-            return [seen[needed], index], steps
+            yield TraceEvent("found", index, value, (needed, seen[needed]), node="return")
+            return
 
         seen[value] = index
-        steps.append(f"Store {value} -> {index} in dictionary: {seen}")
+        yield TraceEvent("store", index, value, len(seen), node="store")
+
+    yield TraceEvent("not_found", node="check")
+
+def two_sum_keyframe(event: TraceEvent) -> Optional[int]:
+    """Index two_sum_trace resumes from after event, if it can resume there."""
+    if event.kind == "store":
+        return event.index + 1
+    if event.kind == "input":
+        return 0
+    return None
+
+def two_sum_trace_length(nums: List[int]) -> int:
+    """Most steps two_sum_trace yields for nums."""
+    return 2 * len(nums) + 3
+
+def two_sum_answer(event: TraceEvent) -> List[int]:
+    """The answer given by the last event of a trace."""
+    if event.kind == "found":
+        return [event.delta[1], event.index]
+    return []
 
-    steps.append("No pair found that sums to the target.")
-    return [], steps
+def two_sum_logic(nums: List[int], target: int) -> Tuple[List[int], List[TraceEvent]]:
+    """
+    Return indices and the whole trace of the algorithm.
+    """
+    trace = list(two_sum_trace(nums, target))
+    return two_sum_answer(trace[-1]), trace
+
+def describe_two_sum_event(event: TraceEvent) -> str:
+    """Text of one two_sum_logic step."""
+    kind, index, value, delta, _ = event
+    if kind == "target":
+        return f"Target: {value}"
+    if kind == "input":
+        return f"Input: {preview_list(value)}"
+    if kind == "visit":
+        return f"Index {index}: value={value}, need={delta}"
+    if kind == "found":
+        needed, seen_index = delta
+        return f"Found complement! seen[{needed}]={seen_index} so return [{seen_index}, {index}]"
+    if kind == "store":
+        return f"Store {value} -> {index} in dictionary ({delta} {'entry' if delta == 1 else 'entries'})"
+    return "No pair found that sums to the target."
 
 def two_sum_complexity(n: int) -> List[int]:
     """O(n) complexity."""
     return list(range(1, n + 1))
+
+def two_sum_reference(nums: List[int], target: int) -> List[int]:
+    """
+    Hash map solution without tracing, used to time the scale tier.
+    """
+    seen: Dict[int, int] = {}
+    for index, value in enumerate(nums):
+        needed = target - value
+        if needed in seen:
+            return [seen[needed], index]
+        seen[value] = index
+    return []
+
+def generate_two_sum_case(n: int, seed: int) -> Tuple[List[int], int]:
+    """
+    Seeded scale-tier input of length n with exactly one answer.
+
+    Filler values are multiples of 4 and the answer pair is 1 mod 4, so no
+    other pair can reach the target (which is 2 mod 4). The pair is the last
+    two elements, the worst case for a forward scan, so the work an input
+    takes depends on n alone (complexity measurement relies on this).
+    """
+    rng = random.Random(seed)
+    nums = [4 * rng.randrange(-n, n) for _ in range(n)]
+    first, second = n - 2, n - 1
+    nums[first] = 4 * rng.randrange(-n, n) + 1
+    nums[second] = 4 * rng.randrange(-n, n) + 1
+    return nums, nums[first] + nums[second]
+
+
+def random_two_sum_input(rng: random.Random) -> Tuple[List[int], int]:
+    """
+    Small random fuzzing input, usually with at least one answer.
+
+    Values come from a narrow range so duplicates, zeros and negative
+    numbers turn up often.
+    """
+    nums = [rng.randint(-10, 10) for _ in range(rng.randint(2, 10))]
+    if rng.random() < 0.8:
+        first, second = rng.sample(range(len(nums)), 2)
+        return nums, nums[first] + nums[second]
+    return nums, rng.randint(-20, 20)
+
+def two_sum_fuzz_reference(nums: List[int], target: int) -> List[int]:
+    return two_sum_logic(nums, target)[0]
+
+def check_two_sum(args: Tuple[List[int], int], expected: List[int], actual) -> Optional[str]:
+    """
+    Judge a fuzzed answer. Any two different indices whose values sum to
+    the target are accepted, not only the pair two_sum_logic finds.
+    """
+    nums, target = args
+    if not expected:
+        return None if actual == [] else f"No two numbers sum to {target}, so the answer is []"
+    if not isinstance(actual, (list, tuple)) or len(actual) != 2:
+        return f"Expected a pair of indices such as {expected}"
+    if not all(isinstance(index, int) and 0 <= index < len(nums) for index in actual):
+        return f"{list(actual)} are not indices of nums"
+    first, second = actual
+    if first == second:
+        return f"Index {first} is used twice"
+    if nums[first] + nums[second] != target:
+        return f"nums[{first}] + nums[{second}] is {nums[first] + nums[second]}, not {target}"
+    return None
+
+def shrink_two_sum(args: Tuple[List[int], int]):
+    """Shorter lists first, then values and target closer to zero."""
+    nums, target = args
+    if len(nums) > 2:
+        for index in range(len(nums)):
+            yield nums[:index] + nums[index + 1:], target
+    for index, value in enumerate(nums):
+        for smaller in shrink_int(value):
+            # Moving the target along keeps a pair using this value intact
+            yield nums[:index] + [smaller] + nums[index + 1:], target + smaller - value
+            yield nums[:index] + [smaller] + nums[index + 1:], target
+    for smaller in shrink_int(target):
+        yield nums, smaller
+
+TWO_SUM_FUZZ = FuzzSpec(
+    "two_sum", random_two_sum_input, two_sum_fuzz_reference, check_two_sum, shrink_two_sum
+)
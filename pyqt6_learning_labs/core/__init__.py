@@ -1,22 +1,42 @@
 """
 Core utilities and configuration for PyQt6 Learning Labs.
+
+Only theme needs PyQt6; set_futuristic_style is imported on first use so the
+sandbox and the headless grader can run without it.
 """
 
-from pyqt6_learning_labs.core.constants import Colors, Dimensions, Timing, Shortcuts
-from pyqt6_learning_labs.core.theme import set_futuristic_style
+from pyqt6_learning_labs.core.constants import Colors, Dimensions, Timing, Shortcuts, Sandbox, Playground
 from pyqt6_learning_labs.core.utils import (
     load_lesson_markdown,
     markdown_to_html,
     get_styled_html,
     get_base_dir,
-    get_lessons_dir
+    get_lessons_dir,
+    get_cache_dir
 )
 from pyqt6_learning_labs.core.safe_exec import (
     safe_exec,
     safe_exec_function,
+    safe_exec_module,
+    safe_exec_suite,
+    safe_exec_async,
+    safe_exec_function_async,
+    safe_exec_suite_async,
+    SandboxedModule,
+    CaseResult,
+    ExecResult,
+    CancelToken,
     check_code_safety,
+    compile_checked,
+    enable_code_disk_cache,
+    configure_sandbox,
+    shutdown_sandbox,
+    sandbox_backend,
     CodeSecurityError,
-    CodeTimeoutError
+    CodeTimeoutError,
+    CodeFuelExhaustedError,
+    CodeMemoryError,
+    CodeCancelledError
 )
 
 __all__ = [
@@ -25,6 +45,8 @@ __all__ = [
     'Dimensions',
     'Timing',
     'Shortcuts',
+    'Sandbox',
+    'Playground',
 
     # Theme
     'set_futuristic_style',
@@ -35,11 +57,36 @@ __all__ = [
     'get_styled_html',
     'get_base_dir',
     'get_lessons_dir',
+    'get_cache_dir',
 
     # Safe execution
     'safe_exec',
     'safe_exec_function',
+    'safe_exec_module',
+    'safe_exec_suite',
+    'safe_exec_async',
+    'safe_exec_function_async',
+    'safe_exec_suite_async',
+    'SandboxedModule',
+    'CaseResult',
+    'ExecResult',
+    'CancelToken',
     'check_code_safety',
+    'compile_checked',
+    'enable_code_disk_cache',
+    'configure_sandbox',
+    'shutdown_sandbox',
+    'sandbox_backend',
     'CodeSecurityError',
     'CodeTimeoutError',
+    'CodeFuelExhaustedError',
+    'CodeMemoryError',
+    'CodeCancelledError',
 ]
+
+
+def __getattr__(name):
+    if name == 'set_futuristic_style':
+        from pyqt6_learning_labs.core.theme import set_futuristic_style
+        return set_futuristic_style
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
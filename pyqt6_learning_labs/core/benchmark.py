@@ -0,0 +1,414 @@
+"""
+Timing helpers for the Code Lab scale tier and complexity measurement.
+
+Scale-tier inputs are generated from (n, seed) so the reference solution
+can be timed on exactly the input the submission later receives inside the
+sandbox. Each case's budget is a multiple of the reference time.
+
+Complexity measurement times a submission over a geometric range of sizes
+and fits the timings against the usual growth models. The benchmark report
+compares the timing distribution of a submission with the reference's, and
+the line profile helpers summarize safe_exec_suite(profile=True) results.
+"""
+import gc
+import json
+import math
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyqt6_learning_labs.core.constants import Sandbox
+
+
+class ScaleCase(NamedTuple):
+    """A prepared scale-tier case."""
+    n: int
+    seed: int
+    expected: Any
+    reference_s: float  # Best reference time over the repeats
+    budget_s: float
+
+
+def time_call(func: Callable[..., Any], args: tuple, repeats: int = 3) -> Tuple[float, Any]:
+    """
+    Time func(*args) with the garbage collector paused.
+
+    Returns:
+        (best time in seconds over repeats, result of the last call)
+    """
+    best = float("inf")
+    result = None
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, result
+
+
+def scale_budget(reference_s: float) -> float:
+    """Time a submission may take on an input the reference ran in reference_s."""
+    return max(reference_s * Sandbox.SCALE_BUDGET_FACTOR, Sandbox.SCALE_MIN_BUDGET_S)
+
+
+def prepare_scale_cases(
+    cases: Sequence[Tuple[int, int]],
+    generate: Callable[[int, int], tuple],
+    reference: Callable[..., Any],
+    to_expected: Optional[Callable[[Any], Any]] = None
+) -> List[ScaleCase]:
+    """
+    Generate each (n, seed) input, time the reference on it and set a budget.
+
+    Args:
+        cases: (n, seed) pairs
+        generate: Builds the function arguments from (n, seed)
+        reference: Reference implementation taking those arguments
+        to_expected: Turns the reference result into the value a
+            submission's (converted) result is compared with
+    """
+    prepared = []
+    for n, seed in cases:
+        reference_s, result = time_call(reference, generate(n, seed))
+        expected = to_expected(result) if to_expected is not None else result
+        prepared.append(ScaleCase(n, seed, expected, reference_s, scale_budget(reference_s)))
+    return prepared
+
+
+def scale_timeout(cases: Sequence[ScaleCase]) -> float:
+    """Per-case sandbox timeout for a scale tier."""
+    return max(case.budget_s for case in cases) * Sandbox.SCALE_TIMEOUT_FACTOR
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} us"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_bytes(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def scale_verdict(case: ScaleCase, outcome) -> Tuple[str, str]:
+    """
+    Classify one scale-tier CaseResult.
+
+    Returns:
+        (verdict, feedback line) where verdict is "pass", "slow", "fail" or
+        "error"; "slow" means a correct answer that missed the budget
+    """
+    label = f"n={case.n:,}"
+    budget = format_seconds(case.budget_s)
+
+    if outcome.status == "timeout":
+        return "slow", f"SCALE SLOW: {label} -> stopped after {format_seconds(outcome.elapsed)} (budget {budget})"
+    if outcome.status != "ok":
+        return "error", f"SCALE ERROR: {label} -> {outcome.message}"
+    if outcome.value != case.expected:
+        return "fail", f"SCALE FAIL: {label} -> wrong answer"
+
+    took = format_seconds(outcome.elapsed)
+    ratio = outcome.elapsed / case.reference_s if case.reference_s > 0 else 0.0
+    if outcome.elapsed > case.budget_s:
+        return "slow", f"SCALE SLOW: {label} -> {took} (budget {budget}, {ratio:.0f}x reference)"
+    return "pass", f"SCALE PASS: {label} -> {took} (budget {budget}, {ratio:.1f}x reference)"
+
+
+# Growth models for complexity fitting, in order of preference on a tie
+COMPLEXITY_MODELS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n²)": lambda n: n * n,
+}
+
+
+# A simpler model is preferred unless a faster growing one has an error at
+# least this many times lower
+OCCAM_TOLERANCE = 1.5
+
+# Per-model overrides of OCCAM_TOLERANCE. Over the measured sizes O(n log n)
+# grows less than twice as fast as O(n), about as much as cache effects alone
+# slow large inputs down, so a linear fit needs a wider margin to lose
+OCCAM_TOLERANCES: Dict[str, float] = {"O(n)": 3.0}
+
+# Below this confidence a fit that differs from the expected model is too
+# close to call, and is not reported as a mismatch
+COMPLEXITY_MIN_CONFIDENCE = 0.75
+
+
+class ComplexityFit(NamedTuple):
+    """Best growth model for a set of timings."""
+    label: str  # Key of COMPLEXITY_MODELS
+    confidence: float  # 0..1, how clearly the best model beats the runner-up
+    overhead: float  # Fitted constant time in seconds
+    scale: float  # Fitted seconds per unit of the model
+    errors: Dict[str, float]  # Relative RMS error of every model
+
+    def predict(self, n: float) -> float:
+        return self.overhead + self.scale * COMPLEXITY_MODELS[self.label](n)
+
+
+def complexity_cases(sizes: Sequence[int], warmup: int = 1, repeats: int = 5) -> List[Tuple[int, int]]:
+    """
+    (n, seed) suite cases for measuring sizes: warm-up runs, then the timed
+    repeats, all on the same input for a given size.
+    """
+    return [(n, index) for index, n in enumerate(sizes) for _ in range(warmup + repeats)]
+
+
+def timed_runs(
+    sizes: Sequence[int],
+    outcomes: Sequence[Any],
+    warmup: int = 1,
+    repeats: int = 5
+) -> Tuple[List[int], List[List[float]]]:
+    """
+    Times of the timed repeats per size from the CaseResults of
+    complexity_cases(), warm-up runs left out.
+
+    Sizes with a repeat that did not finish are dropped, along with every
+    larger size.
+    """
+    measured_sizes, runs_per_size = [], []
+    per_size = warmup + repeats
+    for index, n in enumerate(sizes):
+        runs = outcomes[index * per_size + warmup:(index + 1) * per_size]
+        if len(runs) < repeats or any(run.status != "ok" for run in runs):
+            break
+        measured_sizes.append(n)
+        runs_per_size.append([run.elapsed for run in runs])
+    return measured_sizes, runs_per_size
+
+
+def best_times(
+    sizes: Sequence[int],
+    outcomes: Sequence[Any],
+    warmup: int = 1,
+    repeats: int = 5
+) -> Tuple[List[int], List[float]]:
+    """Best timed repeat per size; see timed_runs()."""
+    measured_sizes, runs_per_size = timed_runs(sizes, outcomes, warmup, repeats)
+    return measured_sizes, [min(runs) for runs in runs_per_size]
+
+
+def _fit_model(model: Callable[[float], float], sizes, times) -> Tuple[float, float, float]:
+    """
+    Fit times ~ overhead + scale * model(n), both terms non-negative, by
+    least squares on relative error (so small sizes count as much as large).
+
+    Returns:
+        (overhead, scale, relative RMS error)
+    """
+    xs = [model(n) for n in sizes]
+    weights = [1.0 / (t * t) for t in times]
+
+    def error(overhead, scale):
+        return math.sqrt(sum(
+            w * (overhead + scale * x - t) ** 2 for w, x, t in zip(weights, xs, times)
+        ) / len(times))
+
+    def fit_scale_only():
+        sxx = sum(w * x * x for w, x in zip(weights, xs))
+        return 0.0, sum(w * x * t for w, x, t in zip(weights, xs, times)) / sxx
+
+    def fit_overhead_only():
+        return sum(w * t for w, t in zip(weights, times)) / sum(weights), 0.0
+
+    # Weighted normal equations for the two-term model
+    sw = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, xs))
+    sxx = sum(w * x * x for w, x in zip(weights, xs))
+    st = sum(w * t for w, t in zip(weights, times))
+    sxt = sum(w * x * t for w, x, t in zip(weights, xs, times))
+    det = sw * sxx - sx * sx
+
+    candidates = [fit_scale_only(), fit_overhead_only()]
+    if det > 1e-12 * sw * sxx:
+        overhead = (sxx * st - sx * sxt) / det
+        scale = (sw * sxt - sx * st) / det
+        if overhead >= 0 and scale >= 0:
+            candidates.append((overhead, scale))
+    overhead, scale = min(candidates, key=lambda c: error(*c))
+    return overhead, scale, error(overhead, scale)
+
+
+def fit_complexity(sizes: Sequence[int], times: Sequence[float]) -> Optional[ComplexityFit]:
+    """
+    Pick the growth model in COMPLEXITY_MODELS that best explains the timings.
+
+    The simplest model within OCCAM_TOLERANCE (or its OCCAM_TOLERANCES
+    entry) of the lowest error wins: a faster growing model can always mimic
+    a slower one by shrinking its scale, and cache effects make large inputs
+    slightly slower per element on real hardware, which reads as an extra
+    log factor. Confidence compares the winner's error with the closest
+    other model that actually grows over the measured range: near 1 when
+    only one model fits, near 0 when two are indistinguishable (typically
+    O(n) and O(n log n)).
+
+    Returns:
+        The best fit, or None with fewer than three usable points
+    """
+    points = [(n, t) for n, t in zip(sizes, times) if n >= 1 and t > 0]
+    if len(points) < 3:
+        return None
+    sizes = [n for n, _ in points]
+    times = [t for _, t in points]
+
+    fits = {label: _fit_model(model, sizes, times) for label, model in COMPLEXITY_MODELS.items()}
+    lowest = min(fit[2] for fit in fits.values())
+    best = next(
+        label for label, fit in fits.items()
+        if fit[2] <= lowest * OCCAM_TOLERANCES.get(label, OCCAM_TOLERANCE)
+    )
+    overhead, scale, best_error = fits[best]
+
+    def grows(label):
+        # Whether the growth term matters at the largest size
+        fit_overhead, fit_scale, _ = fits[label]
+        growth = fit_scale * COMPLEXITY_MODELS[label](sizes[-1])
+        return growth > 0.05 * (fit_overhead + growth)
+
+    rivals = [fit[2] for label, fit in fits.items() if label != best and grows(label)]
+    if not rivals:
+        confidence = 1.0
+    else:
+        closest = min(rivals)
+        worse = max(best_error, closest)
+        confidence = 1.0 - min(best_error, closest) / worse if worse > 0 else 0.0
+
+    return ComplexityFit(
+        best, confidence, overhead, scale,
+        {label: fit[2] for label, fit in fits.items()}
+    )
+
+
+class TimingStats(NamedTuple):
+    """Summary of repeated timings, in seconds."""
+    min: float
+    median: float
+    p95: float
+    runs: int
+
+
+def timing_stats(times: Sequence[float]) -> TimingStats:
+    """min / median / 95th percentile (nearest rank) of a non-empty sample."""
+    ordered = sorted(times)
+    count = len(ordered)
+    middle = count // 2
+    median = ordered[middle] if count % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    p95 = ordered[max(0, math.ceil(0.95 * count) - 1)]
+    return TimingStats(ordered[0], median, p95, count)
+
+
+def time_runs(
+    func: Callable[..., Any],
+    cases: Sequence[Tuple[int, int]],
+    generate: Callable[[int, int], tuple]
+) -> List[float]:
+    """
+    Time func on complexity_cases() the way safe_exec_suite times a
+    submission: fresh arguments for every run, garbage collector left on.
+
+    Returns:
+        Elapsed seconds for every case, warm-up runs included, so the list
+        lines up with a submission's CaseResults
+    """
+    times = []
+    for n, seed in cases:
+        args = generate(n, seed)
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+class BenchmarkRow(NamedTuple):
+    """Reference and submission timings for one input size."""
+    n: int
+    reference: TimingStats
+    submission: Optional[TimingStats]  # None when the submission did not finish
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Submission median over reference median."""
+        if self.submission is None or self.reference.median <= 0:
+            return None
+        return self.submission.median / self.reference.median
+
+
+def benchmark_rows(
+    sizes: Sequence[int],
+    reference_times: Sequence[float],
+    outcomes: Sequence[Any],
+    warmup: int = 1,
+    repeats: int = 5
+) -> List[BenchmarkRow]:
+    """
+    Pair up reference times from time_runs() with a submission's CaseResults
+    for the same complexity_cases().
+    """
+    per_size = warmup + repeats
+    finished, runs_per_size = timed_runs(sizes, outcomes, warmup, repeats)
+    rows = []
+    for index, n in enumerate(sizes):
+        reference = reference_times[index * per_size + warmup:(index + 1) * per_size]
+        submission = timing_stats(runs_per_size[index]) if index < len(finished) else None
+        rows.append(BenchmarkRow(n, timing_stats(reference), submission))
+    return rows
+
+
+def benchmark_report(problem: str, rows: Sequence[BenchmarkRow], backend: str) -> Dict[str, Any]:
+    """JSON-serializable report, to track submissions against the reference over time."""
+    return {
+        "problem": problem,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": backend,
+        "rows": [
+            {
+                "n": row.n,
+                "reference": row.reference._asdict(),
+                "submission": row.submission._asdict() if row.submission is not None else None,
+                "ratio": row.ratio,
+            }
+            for row in rows
+        ],
+    }
+
+
+def export_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def merge_line_profiles(
+    profiles: Iterable[Optional[Dict[int, Tuple[int, float]]]]
+) -> Dict[int, Tuple[int, float]]:
+    """Sum per-line (hits, seconds) over several cases; None entries are skipped."""
+    merged: Dict[int, Tuple[int, float]] = {}
+    for profile in profiles:
+        for line, (hits, seconds) in (profile or {}).items():
+            total_hits, total_seconds = merged.get(line, (0, 0.0))
+            merged[line] = (total_hits + hits, total_seconds + seconds)
+    return merged
+
+
+def hot_lines(profile: Dict[int, Tuple[int, float]], count: int = 3) -> List[Tuple[int, int, float]]:
+    """The count lines with the most time, as (line, hits, seconds), hottest first."""
+    ranked = sorted(profile.items(), key=lambda item: item[1][1], reverse=True)
+    return [(line, hits, seconds) for line, (hits, seconds) in ranked[:count]]
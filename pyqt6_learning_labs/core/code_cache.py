@@ -0,0 +1,125 @@
+"""
+Content-hash cache of sandbox safety verdicts and compiled code objects.
+
+Re-running unchanged editor text skips parsing, the safety walk and
+compilation entirely. Sources registered with enable_disk() (the shipped
+template code) are also kept on disk as marshalled code objects so they
+survive restarts.
+"""
+import hashlib
+import importlib.util
+import marshal
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import CodeType
+from typing import Iterable, Optional, Tuple
+
+# (error message, None) for rejected code, (None, code object) for safe code
+CacheEntry = Tuple[Optional[str], Optional[CodeType]]
+
+
+class CodeCache:
+    """
+    Bounded LRU of safety verdicts and code objects keyed by source hash.
+
+    Keys also cover the interpreter's bytecode magic number and rules, a
+    string naming the safety rules the verdicts were made under, so entries
+    from another Python or an older checker are never used.
+    """
+
+    def __init__(self, max_entries: int = 128, rules: str = ""):
+        self.max_entries = max_entries
+        self.rules = rules
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_dir: Optional[Path] = None
+        self._disk_keys = set()
+
+    def key(self, source: str) -> str:
+        """Hash identifying a source string checked under these rules."""
+        digest = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+        digest.update(self.rules.encode("utf-8") + b"\0")
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a source hash, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store the verdict (and code object) for a source hash."""
+        self._remember(key, entry)
+        if entry[1] is not None:
+            self._write_disk(key, entry[1])
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (files on disk are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # --- On-disk cache for registered sources ---
+    def enable_disk(self, directory: Path, sources: Iterable[str]) -> None:
+        """
+        Persist compiled code for the given sources under directory.
+
+        Only these sources are read from or written to disk; anything else
+        (user edits) stays in memory.
+        """
+        self._disk_dir = Path(directory)
+        self._disk_keys = {self.key(source) for source in sources}
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self._disk_dir is None or key not in self._disk_keys:
+            return None
+        return self._disk_dir / f"{key}.bin"
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        # Files written by another Python version are ignored
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            code = marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return (None, code) if isinstance(code, CodeType) else None
+
+    def _write_disk(self, key: str, code: CodeType) -> None:
+        path = self._disk_path(key)
+        if path is None or path.exists():
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+            tmp_path.replace(path)
+        except OSError:
+            pass  # The disk cache is best effort
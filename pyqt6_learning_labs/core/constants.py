@@ -58,6 +58,40 @@ class Timing:
     TOOLTIP_DELAY_MS = 500
 
 
+class Playground:
+    """Step-by-step playground settings."""
+    TRACE_LOOKAHEAD = 256  # Steps produced ahead of the one being shown
+    TRACE_HISTORY = 10_000  # Steps kept behind it, for stepping back and the trace box
+    PREVIEW_ITEMS = 20  # List items shown in a trace line before it is shortened
+    KEYFRAME_INTERVAL = 1_000  # Steps between keyframes; a seek replays at most this many
+    TRACE_TEXT_LINES = 2_000  # Lines shown as plain text before the trace box becomes a list view
+    PLAY_SPEED_MIN = 1  # Auto-play steps per second
+    PLAY_SPEED_MAX = 10_000
+    FRAME_INTERVAL_MS = 16  # Auto-play repaints at most this often, advancing every step due
+
+
+class Sandbox:
+    """Code Lab sandbox settings."""
+    BACKEND = "process"  # "process" (killable worker pool) or "thread"
+    POOL_SIZE = 2
+    MAX_JOBS_PER_WORKER = 100
+    WARM_UP = True
+    TEST_FUEL = 1_000_000  # Executed lines allowed per test case
+    TEST_TIMEOUT_S = 5.0  # Wall-clock backstop per test case
+    TEST_MEMORY_LIMIT_MB = 256  # Memory a test case may allocate
+    SCALE_BUDGET_FACTOR = 10.0  # Scale-tier budget as a multiple of the reference time
+    SCALE_MIN_BUDGET_S = 0.05  # Floor for tiny reference times
+    SCALE_TIMEOUT_FACTOR = 3.0  # Stop a scale case after this many budgets
+    SCALE_MEMORY_TIMEOUT_FACTOR = 3.0  # Extra time for the scale-tier memory pass (tracemalloc)
+    COMPLEXITY_TIMEOUT_S = 2.0  # Per timed run when measuring complexity or benchmarking
+    BENCHMARK_REPEATS = 10  # Timed runs per size in the benchmark report
+    FUZZ_CASES = 10_000  # Random inputs per fuzz run
+    FUZZ_FUEL = 10_000  # Executed lines allowed per fuzzing input; they are all small
+    FUZZ_BATCH_SIZE = 250  # Inputs per sandbox job when fuzzing
+    FUZZ_SHRINK_ROUNDS = 100  # Most shrinking steps for a failing input
+    GRADE_CACHE_MAX_MB = 64  # Disk space for cached grading results
+
+
 class Shortcuts:
     """Keyboard shortcuts."""
     HOME = "Ctrl+H"
@@ -0,0 +1,260 @@
+"""
+Randomized differential testing for the Code Labs.
+
+A FuzzSpec describes one problem: how to draw a small random input from a
+seeded generator, the reference answer for it, how to judge a submission's
+answer, and how to shrink a failing input. run_fuzz() splits the seeds into
+batches and runs one batch per sandbox worker process at a time; each
+worker generates its own inputs, runs the submission on them and sends back
+only the failures. The first failure is then shrunk to a minimal
+counterexample.
+
+Every function in a FuzzSpec must be defined at module level, so the spec
+can be sent to a pool worker.
+"""
+import copy
+import importlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyqt6_learning_labs.core.constants import Sandbox
+from pyqt6_learning_labs.core.safe_exec import (
+    CancelToken, CaseResult, _pool_watcher, _run_suite_local
+)
+
+# The package re-exports the safe_exec function under the module's name
+_sandbox = importlib.import_module("pyqt6_learning_labs.core.safe_exec")
+
+
+class FuzzSpec(NamedTuple):
+    """How to fuzz one problem's submissions."""
+    func_name: str
+    generate: Callable[[random.Random], tuple]  # Random input, as plain data
+    reference: Callable[..., Any]  # Expected answer for an input
+    check: Callable[[tuple, Any, Any], Optional[str]]  # (input, expected, actual) -> None, or what is wrong
+    shrink: Callable[[tuple], Iterable[tuple]]  # Simpler inputs, most promising first
+    arg_converter: Optional[Callable[..., tuple]] = None  # Input -> call arguments, in the sandbox
+    result_converter: Optional[Callable[[Any], Any]] = None
+    namespace: Optional[Dict[str, Any]] = None
+
+
+class FuzzFailure(NamedTuple):
+    """An input the submission got wrong."""
+    args: tuple
+    expected: Any
+    actual: Any  # None when the call did not return
+    message: str
+    seed: Optional[int] = None  # None for inputs produced by shrinking
+
+
+class FuzzReport(NamedTuple):
+    """Outcome of run_fuzz()."""
+    seed: int  # Base seed; rerun with it to reproduce the inputs
+    cases: int  # Inputs that were run
+    failures: int
+    first_failure: Optional[FuzzFailure]
+    counterexample: Optional[FuzzFailure]  # first_failure after shrinking
+    elapsed: float
+    cancelled: bool = False
+    error: Optional[str] = None  # Why a batch could not run, if one did not
+
+
+def shrink_int(value: int) -> List[int]:
+    """Candidates closer to zero than value, simplest first."""
+    candidates = []
+    for candidate in (0, int(value / 2), value - 1 if value > 0 else value + 1):
+        if abs(candidate) < abs(value) and candidate not in candidates:
+            candidates.append(candidate)
+    return candidates
+
+
+def _judge(spec: FuzzSpec, args: tuple, outcome: CaseResult, seed: Optional[int]) -> Optional[FuzzFailure]:
+    expected = spec.reference(*args)
+    if outcome.status != "ok":
+        return FuzzFailure(args, expected, None, outcome.message, seed)
+    message = spec.check(args, expected, outcome.value)
+    if message is None:
+        return None
+    return FuzzFailure(args, expected, outcome.value, message, seed)
+
+
+def _fuzz_batch(
+    code: str,
+    spec: FuzzSpec,
+    seeds: Optional[Sequence[int]],
+    inputs: Optional[Sequence[tuple]],
+    per_case_timeout: float,
+    total_timeout: float,
+    fuel: Optional[int],
+    use_alarm: bool = False,
+    cancel_token: Optional[CancelToken] = None
+) -> Tuple[int, List[FuzzFailure]]:
+    """
+    Run the submission on one batch and judge every answer.
+
+    The inputs are generated from seeds unless given. The submission gets a
+    copy of each, so one that mutates its arguments is still judged against
+    the reference on the input as generated. Returns the number of inputs
+    that ran and the failures among them, in input order.
+    """
+    if inputs is None:
+        inputs = [spec.generate(random.Random(seed)) for seed in seeds]
+        labels = list(seeds)
+    else:
+        labels = [None] * len(inputs)
+
+    results = _run_suite_local(
+        code, spec.func_name, copy.deepcopy(inputs), per_case_timeout, total_timeout, spec.namespace,
+        spec.result_converter, fuel, None, use_alarm, cancel_token=cancel_token,
+        arg_converter=spec.arg_converter
+    )
+    ran = 0
+    failures = []
+    for args, seed, outcome in zip(inputs, labels, results):
+        if outcome.status == "skipped":
+            continue
+        ran += 1
+        failure = _judge(spec, args, outcome, seed)
+        if failure is not None:
+            failures.append(failure)
+    return ran, failures
+
+
+def _run_batch(
+    code: str,
+    spec: FuzzSpec,
+    seeds: Optional[Sequence[int]],
+    inputs: Optional[Sequence[tuple]],
+    per_case_timeout: float,
+    fuel: Optional[int],
+    cancel_token: Optional[CancelToken]
+) -> Tuple[int, List[FuzzFailure]]:
+    """Run one batch on a pool worker, or in-process with the thread backend."""
+    count = len(inputs) if inputs is not None else len(seeds)
+    total_timeout = per_case_timeout * count
+    pool = _sandbox._POOL
+
+    if pool is None:
+        return _fuzz_batch(
+            code, spec, seeds, inputs, per_case_timeout, total_timeout, fuel,
+            cancel_token=cancel_token
+        )
+
+    payload = (code, spec, seeds, inputs, per_case_timeout, total_timeout, fuel)
+    return pool.run("fuzz", payload, total_timeout + 1.0, _pool_watcher(cancel_token))
+
+
+def shrink_failure(
+    code: str,
+    spec: FuzzSpec,
+    failure: FuzzFailure,
+    per_case_timeout: float = Sandbox.TEST_TIMEOUT_S,
+    fuel: Optional[int] = Sandbox.FUZZ_FUEL,
+    max_rounds: int = Sandbox.FUZZ_SHRINK_ROUNDS,
+    cancel_token: Optional[CancelToken] = None
+) -> FuzzFailure:
+    """
+    Greedily shrink a failing input.
+
+    Each round runs every candidate from spec.shrink() in one batch and
+    moves to the first that still fails, until none does.
+    """
+    for _ in range(max_rounds):
+        if cancel_token is not None and cancel_token.cancelled:
+            break
+        candidates = list(spec.shrink(failure.args))
+        if not candidates:
+            break
+        try:
+            _, failures = _run_batch(code, spec, None, candidates, per_case_timeout, fuel, cancel_token)
+        except Exception:
+            break
+        if not failures:
+            break
+        failure = failures[0]
+    return failure
+
+
+def run_fuzz(
+    code: str,
+    spec: FuzzSpec,
+    cases: int = Sandbox.FUZZ_CASES,
+    seed: Optional[int] = None,
+    batch_size: int = Sandbox.FUZZ_BATCH_SIZE,
+    per_case_timeout: float = Sandbox.TEST_TIMEOUT_S,
+    fuel: Optional[int] = Sandbox.FUZZ_FUEL,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> FuzzReport:
+    """
+    Compare a submission with spec.reference on random inputs.
+
+    With the process backend one batch runs on every worker at once; the
+    thread backend runs the batches one after another in this process.
+
+    Args:
+        code: Source of the submission
+        spec: The problem's FuzzSpec
+        cases: Number of random inputs
+        seed: Base seed; input i is generated from seed + i. Random if None.
+        batch_size: Inputs per sandbox job
+        per_case_timeout: Wall-clock limit per input
+        fuel: Executed lines allowed per input, so a loop that never ends
+            on some input is reported as a failure for that input
+        on_progress: Called as on_progress(inputs done, cases) after each
+            batch, from a background thread
+        cancel_token: Stops the run; batches that did not finish are dropped
+
+    Returns:
+        A FuzzReport with the shrunk first failure, if any. A batch whose
+        worker crashed or hung is left out of the counts and noted in error.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    start = time.perf_counter()
+    batches = [
+        range(seed + offset, seed + min(offset + batch_size, cases))
+        for offset in range(0, cases, batch_size)
+    ]
+    pool = _sandbox._POOL
+    workers = pool.size if pool is not None else 1
+
+    done = 0
+    done_lock = threading.Lock()
+    ran = 0
+    failures: List[FuzzFailure] = []
+    errors: List[str] = []
+
+    def run(batch):
+        nonlocal done
+        if cancel_token is not None and cancel_token.cancelled:
+            return 0, []
+        try:
+            result = _run_batch(code, spec, list(batch), None, per_case_timeout, fuel, cancel_token)
+        except Exception as e:
+            if cancel_token is None or not cancel_token.cancelled:
+                errors.append(f"{type(e).__name__}: {e}")
+            result = 0, []
+        with done_lock:
+            done += len(batch)
+            if on_progress is not None:
+                on_progress(done, cases)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_ran, batch_failures in executor.map(run, batches):
+            ran += batch_ran
+            failures.extend(batch_failures)
+
+    cancelled = cancel_token is not None and cancel_token.cancelled
+    first = failures[0] if failures else None
+    counterexample = None
+    if first is not None and not cancelled:
+        counterexample = shrink_failure(code, spec, first, per_case_timeout, fuel, cancel_token=cancel_token)
+    return FuzzReport(
+        seed, ran, len(failures), first, counterexample,
+        time.perf_counter() - start, cancelled, errors[0] if errors else None
+    )
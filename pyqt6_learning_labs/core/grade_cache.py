@@ -0,0 +1,176 @@
+"""
+Content-addressed on-disk cache of grading results.
+
+Entries are keyed by a hash of the submission's source, the test suite's
+version and the sandbox settings that decide a verdict, so unchanged code
+is graded once and changing any of the three simply misses. Each entry is
+one pickled file; the directory is bounded in size and the least recently
+used entries are removed first.
+
+The Code Lab caches its test-tier CaseResults and the headless grader its
+per-file records. Both look up the cache before starting the sandbox.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from pyqt6_learning_labs.core.constants import Sandbox
+
+
+def suite_version(*parts: Any) -> str:
+    """Hash of a test suite's definition, e.g. suite_version(TEST_CASES)."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def sandbox_settings() -> Dict[str, Any]:
+    """The sandbox limits a verdict depends on, for cache keys."""
+    return {
+        "test_fuel": Sandbox.TEST_FUEL,
+        "test_timeout_s": Sandbox.TEST_TIMEOUT_S,
+        "test_memory_limit_mb": Sandbox.TEST_MEMORY_LIMIT_MB,
+        "scale_budget_factor": Sandbox.SCALE_BUDGET_FACTOR,
+        "scale_min_budget_s": Sandbox.SCALE_MIN_BUDGET_S,
+        "scale_timeout_factor": Sandbox.SCALE_TIMEOUT_FACTOR,
+    }
+
+
+def cacheable(outcomes: Sequence[Any]) -> bool:
+    """
+    Whether suite results are worth caching.
+
+    Cases stopped by the clock or by a cancel may finish next time, and a
+    worker crash may not happen again, so only suites where every case
+    returned or the submission itself raised are stored.
+    """
+    return all(
+        outcome.status == "ok" or (outcome.status == "error" and not outcome.sandbox_error)
+        for outcome in outcomes
+    )
+
+
+class GradeCache:
+    """Size-bounded directory of grading results keyed by content hash."""
+
+    def __init__(self, directory: Path, max_bytes: int = Sandbox.GRADE_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # Bytes on disk, scanned on first put
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(source: str, suite: str, settings: Dict[str, Any]) -> str:
+        """Hash identifying one submission graded on one suite with one set of limits."""
+        identity = json.dumps(
+            {"source": source, "suite": suite, "settings": settings, "python": sys.version},
+            sort_keys=True
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored result, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            value = pickle.loads(data)
+        except Exception:
+            # Truncated, or written by an incompatible version
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Recently used entries are evicted last
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result, then evict the oldest entries if over max_bytes."""
+        path = self._path(key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return  # The cache is best effort; values that cannot be pickled are not stored
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            for path in self.directory.glob("*.pkl"):
+                self._remove(path)
+            self._size = 0
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.pkl"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.directory.glob("*.pkl"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        # Rescan: other processes may share the directory
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+# Shared cache for the Code Labs; None until enable_grade_cache() is called
+_GRADE_CACHE: Optional[GradeCache] = None
+
+
+def enable_grade_cache(directory: Path, max_bytes: int = Sandbox.GRADE_CACHE_MAX_MB * 1024 * 1024) -> None:
+    """Keep the Code Labs' test results on disk under directory."""
+    global _GRADE_CACHE
+    _GRADE_CACHE = GradeCache(directory, max_bytes)
+
+
+def grade_cache() -> Optional[GradeCache]:
+    """The cache set up by enable_grade_cache(), if any."""
+    return _GRADE_CACHE
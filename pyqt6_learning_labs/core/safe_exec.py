@@ -2,12 +2,27 @@
 Safe code execution module with timeout and restricted builtins.
 """
 import ast
+import asyncio
+import atexit
+import importlib
 import sys
-from typing import Dict, Any, Tuple, Optional
-from io import StringIO
+import time
+import tracemalloc
+from pathlib import Path
+from types import CodeType, ModuleType
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Tuple, Optional, Callable, List, NamedTuple, Sequence, Iterable, Deque
 import threading
 import signal
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from pyqt6_learning_labs.core.code_cache import CodeCache
+
 
 # Dangerous modules that should not be imported
 BLOCKED_MODULES = {
@@ -19,8 +34,66 @@ BLOCKED_MODULES = {
     'inspect', 'code', 'codeop', 'compile', 'exec', 'eval',
 }
 
+# Output kept per execution before the oldest output is dropped
+MAX_OUTPUT_BYTES = 64 * 1024
+
+# Standard library modules user code may import
+ALLOWED_MODULES = (
+    'collections', 'collections.abc', 'heapq', 'bisect', 'itertools',
+    'functools', 'math', 'array', 'typing',
+)
+
+# Names exposed per module when only part of it is safe to hand out
+# (typing.get_type_hints evaluates strings with real builtins)
+ALLOWED_MODULE_NAMES = {
+    'typing': {
+        'Any', 'Callable', 'Counter', 'DefaultDict', 'Deque', 'Dict',
+        'FrozenSet', 'Generator', 'Hashable', 'Iterable', 'Iterator', 'List',
+        'Mapping', 'Optional', 'OrderedDict', 'Sequence', 'Set', 'Tuple',
+        'Union',
+    },
+}
+
+
+def _module_view(name: str) -> ModuleType:
+    """Copy of a module holding only its public, non-module attributes."""
+    module = importlib.import_module(name)
+    allowed = ALLOWED_MODULE_NAMES.get(name)
+    view = ModuleType(name, module.__doc__)
+    for attr, value in vars(module).items():
+        if attr.startswith('_') or isinstance(value, ModuleType):
+            continue
+        if allowed is None or attr in allowed:
+            setattr(view, attr, value)
+    return view
+
+
+def _build_module_views() -> Dict[str, ModuleType]:
+    views = {name: _module_view(name) for name in ALLOWED_MODULES}
+    # Allowed submodules are reachable from their parent, e.g. collections.abc
+    for name, view in views.items():
+        parent, _, child = name.rpartition('.')
+        if parent in views:
+            setattr(views[parent], child, view)
+    return views
+
+
+# Imported once at startup; sandboxed imports are a dictionary lookup
+_MODULE_VIEWS = _build_module_views()
+
+
+def _safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """__import__ replacement serving allowlisted modules from _MODULE_VIEWS."""
+    if level != 0 or name not in _MODULE_VIEWS:
+        raise ImportError(f"Import of '{name}' is not allowed in the sandbox")
+    if fromlist:
+        return _MODULE_VIEWS[name]
+    return _MODULE_VIEWS[name.partition('.')[0]]
+
+
 # Safe builtins for user code
 SAFE_BUILTINS = {
+    '__import__': _safe_import,
     '__build_class__': __builtins__['__build_class__'] if isinstance(__builtins__, dict) else __builtins__.__build_class__,
     'abs': abs,
     'all': all,
@@ -84,6 +157,138 @@ class CodeTimeoutError(Exception):
     pass
 
 
+class CodeFuelExhaustedError(CodeTimeoutError):
+    """Raised when code executes more operations than its fuel budget."""
+    pass
+
+
+class CodeMemoryError(MemoryError):
+    """Raised when code allocates more memory than its limit."""
+    pass
+
+
+class CodeCancelledError(Exception):
+    """Raised when a sandbox call is cancelled through its CancelToken."""
+    pass
+
+
+class CancelToken:
+    """
+    Cancels a running sandbox call from another thread.
+
+    Pass a token to safe_exec, safe_exec_function or safe_exec_suite and
+    call cancel(): in-process code stops at its next executed line, and a
+    pool worker running the job is killed and replaced.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._leases = []  # (pool, worker, jobs the worker had finished)
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            leases, self._leases = self._leases, []
+        for pool, worker, jobs_done in leases:
+            # A worker that has moved on may be running someone else's job
+            if worker.jobs_done == jobs_done:
+                pool.cancel(worker)
+
+    def _watch(self, pool) -> Callable[[Any], None]:
+        """on_acquire callback for pool.run() that records the leased worker."""
+        def on_acquire(worker):
+            with self._lock:
+                if self.cancelled:
+                    raise CodeCancelledError("Execution cancelled")
+                self._leases.append((pool, worker, worker.jobs_done))
+        return on_acquire
+
+
+class ExecResult(tuple):
+    """
+    Result tuple of the sandbox entry points, carrying execution metrics.
+
+    Unpacks exactly like the plain tuples the functions always returned.
+
+    Attributes:
+        ops: Lines of user code executed, when fuel metering was enabled
+        peak_memory: Peak traced allocation in bytes, when a memory limit
+            was given
+    """
+
+    def __new__(cls, *values, ops: Optional[int] = None, peak_memory: Optional[int] = None):
+        self = super().__new__(cls, values)
+        self.ops = ops
+        self.peak_memory = peak_memory
+        return self
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+
+class CaseResult(NamedTuple):
+    """Outcome of one test case run by safe_exec_suite."""
+    status: str  # "ok", "error", "timeout" or "skipped"
+    value: Any = None
+    elapsed: float = 0.0  # Seconds spent in the function call
+    stdout: str = ""
+    message: str = ""
+    ops: Optional[int] = None  # Lines executed, with fuel metering
+    peak_memory: Optional[int] = None  # Bytes, with a memory limit or measure_memory
+    line_profile: Optional[Dict[int, Tuple[int, float]]] = None  # Line -> (hits, seconds), with profile
+    sandbox_error: bool = False  # The error came from the sandbox, not the submission
+
+
+class OutputCapture:
+    """
+    Per-execution stdout buffer behind the sandbox's print().
+
+    Output is kept in a ring of chunks capped at max_bytes; once the cap is
+    reached the oldest output is dropped, so print-heavy loops cannot grow
+    memory without bound. Each execution gets its own capture, which keeps
+    concurrent executions from mixing their output.
+    """
+
+    def __init__(self, max_bytes: int = MAX_OUTPUT_BYTES):
+        self.max_bytes = max_bytes
+        self._chunks: Deque[bytes] = deque()
+        self._size = 0
+        self.dropped = 0  # Bytes discarded from the front
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8", "replace")
+        if len(data) > self.max_bytes:
+            self.dropped += len(data) - self.max_bytes
+            data = data[-self.max_bytes:]
+        self._chunks.append(data)
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            oldest = self._chunks.popleft()
+            self._size -= len(oldest)
+            self.dropped += len(oldest)
+
+    def print(self, *args, sep=" ", end="\n", file=None, flush=False) -> None:
+        """Replacement for the print builtin; file and flush are ignored."""
+        sep = " " if sep is None else sep
+        end = "\n" if end is None else end
+        self.write(sep.join(str(arg) for arg in args) + end)
+
+    def getvalue(self) -> str:
+        text = b"".join(self._chunks).decode("utf-8", "ignore")
+        if self.dropped:
+            text = f"[... {self.dropped} bytes of output dropped ...]\n" + text
+        return text
+
+    def take(self) -> str:
+        """Return the captured output and start over with an empty buffer."""
+        text = self.getvalue()
+        self._chunks.clear()
+        self._size = 0
+        self.dropped = 0
+        return text
+
+
 class SafetyVisitor(ast.NodeVisitor):
     """AST visitor to check for dangerous code patterns."""
 
@@ -92,13 +297,24 @@ class SafetyVisitor(ast.NodeVisitor):
             module_name = alias.name.split('.')[0]
             if module_name in BLOCKED_MODULES:
                 raise CodeSecurityError(f"Import of '{module_name}' is not allowed")
+            if alias.name not in ALLOWED_MODULES:
+                raise CodeSecurityError(
+                    f"Import of '{alias.name}' is not available in the sandbox "
+                    f"(allowed: {', '.join(ALLOWED_MODULES)})"
+                )
         self.generic_visit(node)
 
     def visit_ImportFrom(self, node):
-        if node.module:
-            module_name = node.module.split('.')[0]
-            if module_name in BLOCKED_MODULES:
-                raise CodeSecurityError(f"Import from '{module_name}' is not allowed")
+        if node.level or not node.module:
+            raise CodeSecurityError("Relative imports are not allowed")
+        module_name = node.module.split('.')[0]
+        if module_name in BLOCKED_MODULES:
+            raise CodeSecurityError(f"Import from '{module_name}' is not allowed")
+        if node.module not in ALLOWED_MODULES:
+            raise CodeSecurityError(
+                f"Import from '{node.module}' is not available in the sandbox "
+                f"(allowed: {', '.join(ALLOWED_MODULES)})"
+            )
         self.generic_visit(node)
 
     def visit_Call(self, node):
@@ -122,24 +338,79 @@ class SafetyVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+# Filename given to compiled user code
+SANDBOX_FILENAME = "<sandbox>"
+
+# Bump when SafetyVisitor's rules change, so cached verdicts are not reused
+SAFETY_RULES_VERSION = 1
+
+# Verdicts and code objects of recently checked sources, keyed under the
+# current rules and module lists
+_CODE_CACHE = CodeCache(rules=repr((
+    SAFETY_RULES_VERSION, sorted(BLOCKED_MODULES), ALLOWED_MODULES,
+    sorted((name, sorted(names)) for name, names in ALLOWED_MODULE_NAMES.items())
+)))
+
+# The parser's recursion bookkeeping is not thread-safe on some CPython
+# versions, so concurrent parses are serialized
+_PARSE_LOCK = threading.Lock()
+
+
+def compile_checked(code: str) -> CodeType:
+    """
+    Check code for safety and compile it.
+
+    Results are cached by source hash, so unchanged code is neither parsed
+    nor walked again. Raises CodeSecurityError if dangerous patterns are found.
+    """
+    key = _CODE_CACHE.key(code)
+    entry = _CODE_CACHE.get(key)
+
+    if entry is None:
+        try:
+            with _PARSE_LOCK:
+                tree = ast.parse(code)
+                SafetyVisitor().visit(tree)
+                entry = (None, compile(tree, SANDBOX_FILENAME, "exec"))
+        except SyntaxError as e:
+            entry = (f"Syntax error: {e}", None)
+        except CodeSecurityError as e:
+            entry = (str(e), None)
+        _CODE_CACHE.put(key, entry)
+
+    error, code_object = entry
+    if error is not None:
+        raise CodeSecurityError(error)
+    return code_object
+
+
 def check_code_safety(code: str) -> None:
     """
     Check if code is safe to execute.
     Raises CodeSecurityError if dangerous patterns are found.
     """
-    try:
-        tree = ast.parse(code)
-        SafetyVisitor().visit(tree)
-    except SyntaxError as e:
-        raise CodeSecurityError(f"Syntax error: {e}")
+    compile_checked(code)
+
+
+def enable_code_disk_cache(directory: Path, sources: Iterable[str]) -> None:
+    """
+    Keep compiled code for the given sources (e.g. TEMPLATE_CODE) on disk.
+
+    Call before configure_sandbox() so forked workers share the setting.
+    """
+    _CODE_CACHE.enable_disk(directory, sources)
 
 
-def execute_with_timeout(func, timeout: float = 5.0) -> Any:
+def execute_with_timeout(func, timeout: Optional[float] = 5.0) -> Any:
     """
     Execute a function with a timeout.
-    Note: This is a simple implementation - for production use consider
-    using multiprocessing for true isolation.
+    Note: the worker thread cannot be stopped once it times out - use the
+    process backend (see configure_sandbox) for true isolation.
+    A timeout of None runs the function directly on the calling thread.
     """
+    if timeout is None:
+        return func()
+
     result = [None]
     error = [None]
 
@@ -163,31 +434,277 @@ def execute_with_timeout(func, timeout: float = 5.0) -> Any:
     return result[0]
 
 
-def safe_exec(
+# Executions currently using tracemalloc, and whether the sandbox started it
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+_tracemalloc_lock = threading.Lock()
+
+# Set in pool workers, where address-space limits only affect the sandbox
+_hard_memory_limits = False
+
+
+def _enable_hard_memory_limits() -> None:
+    """Back memory limits with RLIMIT_AS; only for dedicated worker processes."""
+    global _hard_memory_limits
+    _hard_memory_limits = resource is not None and hasattr(resource, "RLIMIT_AS")
+
+
+def _tracemalloc_acquire() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _tracemalloc_release() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+def _address_space_in_use() -> Optional[int]:
+    """Virtual memory size of this process in bytes, where /proc has it."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * resource.getpagesize()
+
+
+class _Meter:
+    """
+    Fuel and memory accounting for one execution on the current thread.
+
+    Fuel counts executed lines of sandboxed code. sys.settrace is used
+    rather than sys.monitoring because tracing is scoped to one thread, so
+    concurrent executions keep separate counts. Only frames of code compiled
+    by compile_checked are traced.
+
+    The memory limit is checked against tracemalloc's traced allocations on
+    every line and once more when the code returns. tracemalloc is process
+    wide, so concurrent in-process executions see each other's allocations;
+    pool workers run one job at a time and also get an RLIMIT_AS ceiling,
+    which stops a single huge allocation before it happens.
+
+    A cancel token is polled on every line as well.
+
+    With measure_memory and neither fuel nor a memory limit, the peak is
+    taken from tracemalloc alone and no lines are traced.
+
+    With profile, each line's hits and the time from its line event to the
+    next event in the same frame are collected in line_profile. A line's
+    time therefore includes the calls it makes, and the tracer's own cost.
+    """
+
+    def __init__(
+        self,
+        fuel: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        cancel_token: Optional[CancelToken] = None,
+        measure_memory: bool = False,
+        profile: bool = False
+    ):
+        self.fuel = fuel
+        self.memory_limit = memory_limit
+        self.cancel_token = cancel_token
+        self.measure_memory = measure_memory or memory_limit is not None
+        self.ops = 0
+        self.peak_memory = 0
+        self._baseline = 0
+        self.line_profile: Optional[Dict[int, List]] = {} if profile else None
+
+    def _trace_calls(self, frame, event, arg):
+        if frame.f_code.co_filename != SANDBOX_FILENAME:
+            return None
+        if self.line_profile is not None:
+            return self._profile_frame()
+        return self._trace_lines
+
+    def _profile_frame(self) -> Callable:
+        """Local trace function for one frame, timing the line it is on."""
+        stats = self.line_profile
+        current = None
+        started = 0.0
+
+        def trace(frame, event, arg):
+            nonlocal current, started
+            now = time.perf_counter()
+            if current is not None:
+                current[1] += now - started
+                started = now
+            if event == 'line':
+                current = stats.get(frame.f_lineno)
+                if current is None:
+                    current = stats[frame.f_lineno] = [0, 0.0]
+                current[0] += 1
+                started = now
+                self._trace_lines(frame, event, arg)
+            elif event == 'return':
+                current = None
+            return trace
+
+        return trace
+
+    def _trace_lines(self, frame, event, arg):
+        if event == 'line':
+            # Raising also removes the trace function, so code that
+            # swallows these is left to the wall-clock timeout
+            if self.fuel is not None:
+                self.ops += 1
+                if self.ops > self.fuel:
+                    raise CodeFuelExhaustedError(f"Fuel budget of {self.fuel} operations exhausted")
+            if self.memory_limit is not None:
+                self._check_memory(tracemalloc.get_traced_memory()[0])
+            self._check_cancelled()
+        return self._trace_lines
+
+    def _check_cancelled(self) -> None:
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise CodeCancelledError("Execution cancelled")
+
+    def _check_memory(self, traced: int) -> None:
+        used = traced - self._baseline
+        if used > self.peak_memory:
+            self.peak_memory = used
+        if used > self.memory_limit:
+            raise self._limit_error()
+
+    def _limit_error(self) -> CodeMemoryError:
+        return CodeMemoryError(f"Memory limit of {self.memory_limit / (1024 * 1024):g} MB exceeded")
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        if not self.measure_memory:
+            return self._run_traced(func)
+
+        _tracemalloc_acquire()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            with self._address_space_limit():
+                result = self._run_traced(func)
+        except CodeMemoryError:
+            raise
+        except MemoryError:
+            if self.memory_limit is None:
+                raise
+            raise self._limit_error() from None
+        finally:
+            self._check_peak()
+            _tracemalloc_release()
+
+        # Allocations made in a single line are only seen here
+        if self.memory_limit is not None and self.peak_memory > self.memory_limit:
+            raise self._limit_error()
+        return result
+
+    def _run_traced(self, func: Callable[[], Any]) -> Any:
+        if self.fuel is None and self.memory_limit is None and self.line_profile is None:
+            return func()
+        previous = sys.gettrace()
+        sys.settrace(self._trace_calls)
+        try:
+            return func()
+        finally:
+            sys.settrace(previous)
+
+    def _check_peak(self) -> None:
+        peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        if peak > self.peak_memory:
+            self.peak_memory = peak
+
+    @contextmanager
+    def _address_space_limit(self):
+        """Cap the address space of a pool worker while the code runs."""
+        in_use = _address_space_in_use() if _hard_memory_limits and self.memory_limit is not None else None
+        if in_use is None:
+            yield
+            return
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        # Headroom for tracemalloc's bookkeeping and allocator slack; the
+        # verdict itself comes from the traced figures
+        limit = in_use + 2 * self.memory_limit
+        for current in (soft, hard):
+            if current != resource.RLIM_INFINITY:
+                limit = min(limit, current)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        try:
+            yield
+        finally:
+            resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _run_metered(
+    func: Callable[[], Any],
+    fuel: Optional[float],
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None,
+    measure_memory: bool = False,
+    profile: bool = False
+) -> Tuple[Callable[[], Any], Optional[_Meter]]:
+    """
+    Wrap func so it runs under a meter when a budget or limit is given, or
+    its peak memory or line profile is wanted.
+
+    Unmetered runs are left untraced so they can be timed: even a trace
+    function that ignores every event slows the interpreter down. A cancel
+    token then only takes effect between runs, or by killing a pool worker.
+    """
+    if fuel is None and memory_limit is None and not measure_memory and not profile:
+        return func, None
+    meter = _Meter(fuel, memory_limit, cancel_token, measure_memory, profile)
+    return (lambda: meter.run(func)), meter
+
+
+def _metrics(meter: Optional[_Meter]) -> Dict[str, Optional[int]]:
+    """ops and peak_memory for a result, None where not measured."""
+    if meter is None:
+        return {'ops': None, 'peak_memory': None}
+    return {
+        'ops': meter.ops if meter.fuel is not None else None,
+        'peak_memory': meter.peak_memory if meter.measure_memory else None,
+    }
+
+
+def _line_profile(meter: Optional[_Meter]) -> Optional[Dict[int, Tuple[int, float]]]:
+    if meter is None or meter.line_profile is None:
+        return None
+    return {line: (hits, seconds) for line, (hits, seconds) in meter.line_profile.items()}
+
+
+def _safe_exec_local(
     code: str,
     namespace: Optional[Dict[str, Any]] = None,
-    timeout: float = 5.0
-) -> Tuple[bool, str, Dict[str, Any]]:
+    timeout: Optional[float] = 5.0,
+    capture: Optional[OutputCapture] = None,
+    fuel: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> ExecResult:
     """
-    Safely execute Python code with restrictions.
-
-    Args:
-        code: The Python code to execute
-        namespace: Additional namespace variables to make available
-        timeout: Maximum execution time in seconds
+    In-process implementation of safe_exec (thread backend and pool workers).
 
-    Returns:
-        Tuple of (success, message, namespace)
+    print() in the code (and in functions it defines) writes to capture,
+    a fresh OutputCapture unless one is given.
     """
     # First, check code safety
     try:
-        check_code_safety(code)
+        code_object = compile_checked(code)
     except CodeSecurityError as e:
-        return False, f"Security Error: {e}", {}
+        return ExecResult(False, f"Security Error: {e}", {})
+
+    if capture is None:
+        capture = OutputCapture()
 
-    # Create restricted namespace
+    # Create restricted namespace with its own print
     exec_namespace: Dict[str, Any] = {
-        '__builtins__': SAFE_BUILTINS,
+        '__builtins__': dict(SAFE_BUILTINS, print=capture.print),
         '__name__': '__main__',
     }
 
@@ -195,27 +712,359 @@ def safe_exec(
     if namespace:
         exec_namespace.update(namespace)
 
-    # Capture stdout
-    old_stdout = sys.stdout
-    captured_output = StringIO()
+    def do_exec():
+        exec(code_object, exec_namespace)
 
+    do_exec, meter = _run_metered(do_exec, fuel, memory_limit, cancel_token)
     try:
-        sys.stdout = captured_output
+        execute_with_timeout(do_exec, timeout)
 
-        def do_exec():
-            exec(code, exec_namespace)
+        output = capture.getvalue()
+        result = (True, output if output else "Code executed successfully", exec_namespace)
 
-        execute_with_timeout(do_exec, timeout)
+    except CodeTimeoutError as e:
+        result = (False, str(e), {})
+    except Exception as e:
+        result = (False, f"Execution Error: {type(e).__name__}: {e}", {})
+
+    return ExecResult(*result, **_metrics(meter))
+
+
+def _safe_exec_function_local(
+    code: str,
+    func_name: str,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    namespace: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = 5.0,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> ExecResult:
+    """In-process implementation of safe_exec_function."""
+    # First execute the code to define the function
+    success, message, exec_namespace = _safe_exec_local(
+        code, namespace, timeout, fuel=fuel, memory_limit=memory_limit, cancel_token=cancel_token
+    )
+
+    if not success:
+        return ExecResult(False, None, message)
+
+    return _call_in_namespace(
+        exec_namespace, func_name, args, kwargs, timeout, result_converter,
+        fuel, memory_limit, cancel_token
+    )
+
+
+def _call_in_namespace(
+    exec_namespace: Dict[str, Any],
+    func_name: str,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = 5.0,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> ExecResult:
+    """
+    Call a function from an already executed namespace.
+
+    ops and peak_memory cover this call only.
+    """
+    if kwargs is None:
+        kwargs = {}
 
-        output = captured_output.getvalue()
-        return True, output if output else "Code executed successfully", exec_namespace
+    # Check if the function exists
+    if func_name not in exec_namespace:
+        return ExecResult(False, None, f"Function '{func_name}' not found in code")
+
+    func = exec_namespace[func_name]
+    if not callable(func):
+        return ExecResult(False, None, f"'{func_name}' is not callable")
+
+    def do_call():
+        # The conversion walks the returned value, so it is timed and metered too
+        result = func(*args, **kwargs)
+        return result if result_converter is None else result_converter(result)
+
+    do_call, meter = _run_metered(do_call, fuel, memory_limit, cancel_token)
+
+    # Call the function with timeout
+    try:
+        result = execute_with_timeout(do_call, timeout)
+        outcome = (True, result, "Success")
 
     except CodeTimeoutError as e:
-        return False, str(e), {}
+        outcome = (False, None, str(e))
     except Exception as e:
-        return False, f"Execution Error: {type(e).__name__}: {e}", {}
-    finally:
-        sys.stdout = old_stdout
+        outcome = (False, None, f"Error calling {func_name}: {type(e).__name__}: {e}")
+
+    return ExecResult(*outcome, **_metrics(meter))
+
+
+def _raise_case_timeout(signum, frame):
+    raise CodeTimeoutError("Test case timed out")
+
+
+def _run_suite_local(
+    code: str,
+    func_name: str,
+    cases: Sequence[tuple],
+    per_case_timeout: float,
+    total_timeout: float,
+    namespace: Optional[Dict[str, Any]] = None,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    use_alarm: bool = False,
+    on_result: Optional[Callable[[int, CaseResult], None]] = None,
+    cancel_token: Optional[CancelToken] = None,
+    arg_converter: Optional[Callable[..., tuple]] = None,
+    measure_memory: bool = False,
+    profile: bool = False
+) -> List[CaseResult]:
+    """
+    In-process implementation of safe_exec_suite.
+
+    With use_alarm (pool workers, main thread only) each case is interrupted
+    by SIGALRM when it runs over; otherwise the whole suite runs on one
+    watchdog thread and an overrunning case is only stopped by total_timeout.
+    """
+    deadline = time.perf_counter() + total_timeout
+    capture = OutputCapture()
+
+    success, message, exec_namespace = _safe_exec_local(
+        code, namespace, None if use_alarm else total_timeout, capture, fuel, memory_limit, cancel_token
+    )
+    if cancel_token is not None and cancel_token.cancelled:
+        return _finish_suite([], len(cases), total_timeout, cancelled=True)
+    if not success:
+        return [CaseResult("error", message=message) for _ in cases]
+
+    func = exec_namespace.get(func_name)
+    if func is None:
+        return [CaseResult("error", message=f"Function '{func_name}' not found in code") for _ in cases]
+    if not callable(func):
+        return [CaseResult("error", message=f"'{func_name}' is not callable") for _ in cases]
+
+    results: List[CaseResult] = []
+    finished = False  # Set once the caller has stopped waiting for run_cases
+    capture.take()  # Output of the module body is not part of any case
+
+    def run_cases():
+        for args in cases:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or (cancel_token is not None and cancel_token.cancelled):
+                break
+
+            try:
+                if arg_converter is not None:
+                    args = arg_converter(*args)
+            except Exception as e:
+                result = CaseResult(
+                    "error", message=f"Could not build test input: {type(e).__name__}: {e}"
+                )
+                results.append(result)
+                if on_result is not None:
+                    on_result(len(results) - 1, result)
+                continue
+
+            def run_case(args=args):
+                # A returned value the converter cannot finish walking (a
+                # cyclic list) is charged to this case, not the whole suite
+                value = func(*args)
+                return value if result_converter is None else result_converter(value)
+
+            call, meter = _run_metered(
+                run_case, fuel, memory_limit, cancel_token, measure_memory, profile
+            )
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, min(per_case_timeout, remaining))
+            start = time.perf_counter()
+            try:
+                value = call()
+                elapsed = time.perf_counter() - start
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                if elapsed > per_case_timeout:
+                    result = CaseResult(
+                        "timeout", elapsed=elapsed,
+                        message=f"Test case timed out after {per_case_timeout} seconds"
+                    )
+                else:
+                    result = CaseResult("ok", value, elapsed)
+            except CodeCancelledError:
+                break
+            except CodeFuelExhaustedError as e:
+                result = CaseResult("timeout", elapsed=time.perf_counter() - start, message=str(e))
+            except CodeMemoryError as e:
+                result = CaseResult("error", elapsed=time.perf_counter() - start, message=str(e))
+            except CodeTimeoutError:
+                result = CaseResult(
+                    "timeout", elapsed=time.perf_counter() - start,
+                    message=f"Test case timed out after {min(per_case_timeout, remaining):.2f} seconds"
+                )
+            except Exception as e:
+                result = CaseResult(
+                    "error", elapsed=time.perf_counter() - start,
+                    message=f"Error calling {func_name}: {type(e).__name__}: {e}"
+                )
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+
+            if finished:
+                break  # Overran total_timeout; the suite has been reported
+            results.append(result._replace(
+                stdout=capture.take(), line_profile=_line_profile(meter), **_metrics(meter)
+            ))
+            if on_result is not None:
+                on_result(len(results) - 1, results[-1])
+
+    if use_alarm:
+        old_handler = signal.signal(signal.SIGALRM, _raise_case_timeout)
+        try:
+            run_cases()
+        finally:
+            signal.signal(signal.SIGALRM, old_handler)
+    else:
+        try:
+            execute_with_timeout(run_cases, max(deadline - time.perf_counter(), 0.0))
+        except CodeTimeoutError:
+            pass
+        finished = True
+
+    return _finish_suite(
+        results, len(cases), total_timeout,
+        cancelled=cancel_token is not None and cancel_token.cancelled
+    )
+
+
+def _finish_suite(
+    results: List[CaseResult],
+    total: int,
+    total_timeout: float,
+    cancelled: bool = False
+) -> List[CaseResult]:
+    """Mark the cases that never got to run once the total budget ran out."""
+    results = list(results)
+    if len(results) < total:
+        if cancelled:
+            message = "Test run cancelled"
+        else:
+            message = f"Test suite timed out after {total_timeout} seconds"
+            results.append(CaseResult("timeout", message=message))
+        results.extend(CaseResult("skipped", message=message) for _ in range(total - len(results)))
+    return results
+
+
+# Process pool backing safe_exec/safe_exec_function; None means thread backend
+_POOL = None
+
+
+def configure_sandbox(
+    backend: str = "thread",
+    pool_size: int = 2,
+    max_jobs_per_worker: int = 100,
+    warm_up: bool = True,
+    start_method: Optional[str] = None
+) -> None:
+    """
+    Select the execution backend used by safe_exec and safe_exec_function.
+
+    Args:
+        backend: "thread" runs code in-process on a watchdog thread;
+            "process" runs it in a pool of pre-forked worker processes that
+            are killed (and replaced) when a job times out
+        pool_size: Number of worker processes (process backend)
+        max_jobs_per_worker: Recycle a worker after this many jobs
+        warm_up: Start all workers now instead of on first use
+        start_method: multiprocessing start method (default: platform default)
+    """
+    global _POOL
+
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown sandbox backend: {backend!r}")
+
+    shutdown_sandbox()
+
+    if backend == "process":
+        from pyqt6_learning_labs.core.sandbox_pool import SandboxPool
+
+        _POOL = SandboxPool(
+            size=pool_size,
+            max_jobs_per_worker=max_jobs_per_worker,
+            warm_up=warm_up,
+            start_method=start_method,
+        )
+
+
+def shutdown_sandbox() -> None:
+    """Stop the worker processes of the process backend, if any."""
+    global _POOL
+
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
+
+
+def sandbox_backend() -> str:
+    """Name of the active backend, as passed to configure_sandbox."""
+    return "thread" if _POOL is None else "process"
+
+
+atexit.register(shutdown_sandbox)
+
+
+def _pool_watcher(cancel_token: Optional[CancelToken]) -> Optional[Callable[[Any], None]]:
+    """on_acquire callback letting cancel_token kill the worker of a pool job."""
+    return cancel_token._watch(_POOL) if cancel_token is not None else None
+
+
+def safe_exec(
+    code: str,
+    namespace: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> ExecResult:
+    """
+    Safely execute Python code with restrictions.
+
+    Args:
+        code: The Python code to execute
+        namespace: Additional namespace variables to make available
+        timeout: Maximum execution time in seconds
+        fuel: Optional budget of executed lines. Execution stops with
+            CodeFuelExhaustedError once it runs out, which gives verdicts
+            that do not depend on machine load; timeout still applies.
+        memory_limit: Optional ceiling in bytes on memory allocated by the
+            code, enforced with tracemalloc (and RLIMIT_AS in pool workers)
+        cancel_token: Optional CancelToken for stopping the code from
+            another thread
+
+    Returns:
+        Tuple of (success, message, namespace), with the executed line count
+        as .ops when fuel is set and the peak allocation as .peak_memory
+        when memory_limit is set. With the process backend only the
+        picklable part of the namespace is returned.
+    """
+    if _POOL is not None:
+        try:
+            return _POOL.run(
+                "exec", (code, namespace, fuel, memory_limit), timeout, _pool_watcher(cancel_token)
+            )
+        except CodeTimeoutError as e:
+            return ExecResult(False, str(e), {})
+        except Exception as e:
+            return ExecResult(False, f"Execution Error: {type(e).__name__}: {e}", {})
+
+    return _safe_exec_local(
+        code, namespace, timeout, fuel=fuel, memory_limit=memory_limit, cancel_token=cancel_token
+    )
 
 
 def safe_exec_function(
@@ -224,8 +1073,12 @@ def safe_exec_function(
     args: tuple = (),
     kwargs: Optional[Dict[str, Any]] = None,
     namespace: Optional[Dict[str, Any]] = None,
-    timeout: float = 5.0
-) -> Tuple[bool, Any, str]:
+    timeout: float = 5.0,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> ExecResult:
     """
     Safely execute code and call a specific function from it.
 
@@ -236,36 +1089,344 @@ def safe_exec_function(
         kwargs: Keyword arguments for the function
         namespace: Additional namespace variables
         timeout: Maximum execution time
+        result_converter: Applied to the result inside the sandbox, e.g. to
+            turn user-defined objects into plain data. Must be a module-level
+            function when the process backend is active.
+        fuel: Optional budget of executed lines, applied to the module body
+            and to the call separately
+        memory_limit: Optional ceiling in bytes on memory allocated, applied
+            to the module body and to the call separately
+        cancel_token: Optional CancelToken for stopping the code from
+            another thread
 
     Returns:
-        Tuple of (success, result, message)
+        Tuple of (success, result, message), with the line count of the
+        call as .ops when fuel is set and its peak allocation in bytes as
+        .peak_memory when memory_limit is set
     """
-    if kwargs is None:
-        kwargs = {}
+    if _POOL is not None:
+        try:
+            return _POOL.run(
+                "function",
+                (code, func_name, args, kwargs, namespace, result_converter, fuel, memory_limit),
+                timeout,
+                _pool_watcher(cancel_token),
+            )
+        except CodeTimeoutError as e:
+            return ExecResult(False, None, str(e))
+        except Exception as e:
+            return ExecResult(False, None, f"Error calling {func_name}: {type(e).__name__}: {e}")
 
-    # First execute the code to define the function
-    success, message, exec_namespace = safe_exec(code, namespace, timeout)
+    return _safe_exec_function_local(
+        code, func_name, args, kwargs, namespace, timeout, result_converter,
+        fuel, memory_limit, cancel_token
+    )
 
-    if not success:
-        return False, None, message
 
-    # Check if the function exists
-    if func_name not in exec_namespace:
-        return False, None, f"Function '{func_name}' not found in code"
+class SandboxedModule:
+    """
+    A submission that has been checked, compiled and executed once.
 
-    func = exec_namespace[func_name]
-    if not callable(func):
-        return False, None, f"'{func_name}' is not callable"
+    Functions defined by the code can then be called many times against the
+    same namespace without repeating the parse, safety walk and module exec.
+    Create instances with safe_exec_module(). With the process backend the
+    handle holds on to one worker until close() is called; if a call times
+    out the code is reloaded on a fresh worker for the next call.
 
-    # Call the function with timeout
+    Attributes:
+        success: Whether the code loaded without errors
+        message: Output of the module exec, or the error that stopped it
+    """
+
+    def __init__(
+        self,
+        code: str,
+        namespace: Optional[Dict[str, Any]] = None,
+        timeout: float = 5.0,
+        fuel: Optional[int] = None,
+        memory_limit: Optional[int] = None
+    ):
+        self.code = code
+        self._namespace = namespace
+        self._timeout = timeout
+        self._fuel = fuel
+        self._memory_limit = memory_limit
+        self._pool = _POOL
+        self._worker = None
+        self._exec_namespace: Dict[str, Any] = {}
+        self.success, self.message = self._load()
+
+    def _load(self) -> Tuple[bool, str]:
+        if self._pool is None:
+            success, message, self._exec_namespace = _safe_exec_local(
+                self.code, self._namespace, self._timeout,
+                fuel=self._fuel, memory_limit=self._memory_limit
+            )
+            return success, message
+
+        try:
+            self._worker = self._pool.acquire()
+            return self._pool.run_on(
+                self._worker, "load",
+                (self.code, self._namespace, self._fuel, self._memory_limit),
+                self._timeout
+            )
+        except CodeTimeoutError as e:
+            self._worker = None
+            return False, str(e)
+        except Exception as e:
+            self._worker = None
+            return False, f"Execution Error: {type(e).__name__}: {e}"
+
+    def call(
+        self,
+        func_name: str,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: float = 5.0,
+        result_converter: Optional[Callable[[Any], Any]] = None,
+        fuel: Optional[int] = None,
+        memory_limit: Optional[int] = None
+    ) -> ExecResult:
+        """
+        Call a function defined by the loaded code.
+
+        Returns:
+            Tuple of (success, result, message), as for safe_exec_function
+        """
+        if self._pool is None:
+            if not self.success:
+                return ExecResult(False, None, self.message)
+            return _call_in_namespace(
+                self._exec_namespace, func_name, args, kwargs, timeout, result_converter,
+                fuel, memory_limit
+            )
+
+        if self._worker is None:
+            # The previous worker was killed; reload on a fresh one
+            self.success, self.message = self._load()
+        if not self.success:
+            return ExecResult(False, None, self.message)
+
+        try:
+            return self._pool.run_on(
+                self._worker,
+                "call",
+                (func_name, args, kwargs, result_converter, fuel, memory_limit),
+                timeout,
+            )
+        except CodeTimeoutError as e:
+            self._worker = None
+            return ExecResult(False, None, str(e))
+        except Exception as e:
+            if self._worker.discarded:
+                self._worker = None
+            return ExecResult(False, None, f"Error calling {func_name}: {type(e).__name__}: {e}")
+
+    def close(self) -> None:
+        """Release the namespace (and worker, with the process backend)."""
+        self._exec_namespace = {}
+        if self._worker is not None:
+            self._pool.release(self._worker, unload=True)
+            self._worker = None
+
+    def __enter__(self) -> "SandboxedModule":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def safe_exec_module(
+    code: str,
+    namespace: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None
+) -> SandboxedModule:
+    """
+    Check, compile and execute code once, returning a handle for repeated calls.
+
+    Args:
+        code: The Python code containing the function definitions
+        namespace: Additional namespace variables
+        timeout: Maximum time for executing the module body
+        fuel: Optional budget of executed lines for the module body
+        memory_limit: Optional ceiling in bytes for the module body
+
+    Returns:
+        A SandboxedModule; use it as a context manager or call close()
+    """
+    return SandboxedModule(code, namespace, timeout, fuel, memory_limit)
+
+
+def safe_exec_suite(
+    code: str,
+    func_name: str,
+    cases: Sequence[tuple],
+    per_case_timeout: float = 2.0,
+    total_timeout: float = 10.0,
+    namespace: Optional[Dict[str, Any]] = None,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None,
+    on_result: Optional[Callable[[int, CaseResult], None]] = None,
+    cancel_token: Optional[CancelToken] = None,
+    arg_converter: Optional[Callable[..., tuple]] = None,
+    measure_memory: bool = False,
+    profile: bool = False
+) -> List[CaseResult]:
+    """
+    Run a function from code against a whole list of test cases at once.
+
+    The code is checked and executed once, and all cases are shipped to the
+    sandbox in a single round-trip; results stream back as cases finish.
+
+    Args:
+        code: The Python code containing the function definition
+        func_name: Name of the function to call
+        cases: One tuple of positional arguments per test case
+        per_case_timeout: Maximum time for a single call
+        total_timeout: Maximum time for the whole suite, module exec included
+        namespace: Additional namespace variables
+        result_converter: Applied to each result inside the sandbox
+        fuel: Optional budget of executed lines per case (and for the module
+            body); each CaseResult then reports its line count as ops
+        memory_limit: Optional ceiling in bytes per case (and for the module
+            body); each CaseResult then reports its peak as peak_memory
+        on_result: Called with (index, CaseResult) as each case finishes, on
+            a sandbox thread with the thread backend
+        cancel_token: Optional CancelToken; cases that have not finished
+            when it is cancelled are reported as "skipped"
+        arg_converter: Called inside the sandbox with each case's tuple and
+            returning the actual arguments, e.g. to generate a large input
+            from (n, seed) rather than shipping it to a worker. Not timed.
+            Must be a module-level function when the process backend is active.
+        measure_memory: Report each case's peak allocation as peak_memory
+            without a memory limit. Only tracemalloc is used, so no lines
+            are traced, but allocation-heavy code still runs slower.
+        profile: Trace every line of the submission and report per-line hit
+            counts and time as line_profile, also for cases that stopped
+            early (e.g. out of fuel). Profiled code runs many times slower.
+
+    Returns:
+        One CaseResult per case, in order. Cases that could not run before
+        total_timeout expired are reported as "timeout" then "skipped".
+    """
+    cases = list(cases)
+
+    if _POOL is not None:
+        payload = (
+            code, func_name, cases, per_case_timeout, total_timeout,
+            namespace, result_converter, fuel, memory_limit, arg_converter, measure_memory, profile
+        )
+        received: List[CaseResult] = []
+
+        def on_progress(item):
+            index, result = item
+            received.append(result)
+            if on_result is not None:
+                on_result(index, result)
+
+        try:
+            # The worker enforces both limits itself; the grace period only
+            # matters for code that swallows the timeout exception. Its reply
+            # holds the results of the cases it never streamed.
+            received.extend(_POOL.run(
+                "suite", payload, total_timeout + 1.0, _pool_watcher(cancel_token), on_progress
+            ))
+        except CodeTimeoutError:
+            pass
+        except Exception as e:
+            if cancel_token is None or not cancel_token.cancelled:
+                message = f"Execution Error: {type(e).__name__}: {e}"
+                received.extend(
+                    CaseResult("error", message=message, sandbox_error=True) for _ in cases[len(received):]
+                )
+        return _finish_suite(
+            received, len(cases), total_timeout,
+            cancelled=cancel_token is not None and cancel_token.cancelled
+        )
+
+    return _run_suite_local(
+        code, func_name, cases, per_case_timeout, total_timeout, namespace, result_converter,
+        fuel, memory_limit, on_result=on_result, cancel_token=cancel_token,
+        arg_converter=arg_converter, measure_memory=measure_memory, profile=profile
+    )
+
+
+async def _run_cancellable(call: Callable[[CancelToken], Any]) -> Any:
+    """
+    Run a blocking sandbox call on the event loop's executor.
+
+    call receives a CancelToken that is cancelled along with the awaiting
+    task: a pool worker running the job is killed, and metered in-process
+    code stops at its next line. Unmetered in-process code cannot be
+    stopped and runs on until its timeout; only the await returns early.
+    """
+    loop = asyncio.get_running_loop()
+    token = CancelToken()
     try:
-        def do_call():
-            return func(*args, **kwargs)
+        return await loop.run_in_executor(None, call, token)
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
 
-        result = execute_with_timeout(do_call, timeout)
-        return True, result, "Success"
 
-    except CodeTimeoutError as e:
-        return False, None, str(e)
-    except Exception as e:
-        return False, None, f"Error calling {func_name}: {type(e).__name__}: {e}"
+async def safe_exec_async(
+    code: str,
+    namespace: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None
+) -> ExecResult:
+    """
+    Coroutine version of safe_exec.
+
+    The calling event loop stays free while the code runs, so many
+    executions can be awaited concurrently. Cancelling the task stops the
+    code (see _run_cancellable).
+    """
+    return await _run_cancellable(
+        lambda token: safe_exec(code, namespace, timeout, fuel, memory_limit, token)
+    )
+
+
+async def safe_exec_function_async(
+    code: str,
+    func_name: str,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    namespace: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None
+) -> ExecResult:
+    """Coroutine version of safe_exec_function; see safe_exec_async."""
+    return await _run_cancellable(
+        lambda token: safe_exec_function(
+            code, func_name, args, kwargs, namespace, timeout, result_converter,
+            fuel, memory_limit, token
+        )
+    )
+
+
+async def safe_exec_suite_async(
+    code: str,
+    func_name: str,
+    cases: Sequence[tuple],
+    per_case_timeout: float = 2.0,
+    total_timeout: float = 10.0,
+    namespace: Optional[Dict[str, Any]] = None,
+    result_converter: Optional[Callable[[Any], Any]] = None,
+    fuel: Optional[int] = None,
+    memory_limit: Optional[int] = None
+) -> List[CaseResult]:
+    """Coroutine version of safe_exec_suite; see safe_exec_async."""
+    return await _run_cancellable(
+        lambda token: safe_exec_suite(
+            code, func_name, cases, per_case_timeout, total_timeout,
+            namespace, result_converter, fuel, memory_limit, cancel_token=token
+        )
+    )
@@ -0,0 +1,403 @@
+"""
+Pool of pre-forked worker processes backing the sandbox.
+
+Each worker runs one job at a time. A job that exceeds its timeout has its
+worker killed outright - unlike the thread backend, a runaway loop does not
+keep burning a core - and a replacement worker is started in the background.
+"""
+import multiprocessing
+import pickle
+import queue
+import signal
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from pyqt6_learning_labs.core.safe_exec import (
+    CaseResult,
+    CodeTimeoutError,
+    ExecResult,
+    _call_in_namespace,
+    _enable_hard_memory_limits,
+    _run_suite_local,
+    _safe_exec_local,
+    _safe_exec_function_local,
+)
+from pyqt6_learning_labs.core.fuzz import _fuzz_batch
+
+
+# How often a caller waiting for a worker re-checks the pool's state
+_ACQUIRE_POLL_S = 0.1
+
+
+class WorkerCrashedError(Exception):
+    """Raised when a worker process dies while running a job."""
+    pass
+
+
+class _Progress(NamedTuple):
+    """Intermediate message sent by a worker before a job's reply."""
+    item: Any
+
+
+# The worker's end of its pipe, for jobs that stream progress
+_parent_conn = None
+
+
+def _send_progress(item) -> None:
+    _parent_conn.send(_Progress(item))
+
+
+def _picklable_namespace(namespace):
+    """Keep only the namespace entries that can be sent back to the parent."""
+    result = {}
+    for key, value in namespace.items():
+        if key == '__builtins__':
+            continue
+        try:
+            pickle.dumps(value)
+        except Exception:
+            continue
+        result[key] = value
+    return result
+
+
+def _run_exec_job(code, namespace, fuel, memory_limit):
+    result = _safe_exec_local(code, namespace, None, fuel=fuel, memory_limit=memory_limit)
+    success, message, exec_namespace = result
+    return ExecResult(
+        success, message, _picklable_namespace(exec_namespace),
+        ops=result.ops, peak_memory=result.peak_memory
+    )
+
+
+def _run_function_job(code, func_name, args, kwargs, namespace, result_converter, fuel, memory_limit):
+    return _safe_exec_function_local(
+        code, func_name, args, kwargs, namespace, None, result_converter, fuel, memory_limit
+    )
+
+
+def _run_suite_job(
+    code, func_name, cases, per_case_timeout, total_timeout, namespace, result_converter,
+    fuel, memory_limit, arg_converter, measure_memory, profile
+):
+    streamed = 0
+
+    def on_result(index, result):
+        nonlocal streamed
+        try:
+            _send_progress((index, result))
+        except Exception as e:
+            # The value itself could not be pickled
+            _send_progress((index, CaseResult(
+                "error", elapsed=result.elapsed, stdout=result.stdout,
+                message=f"Result could not be returned from the sandbox: {type(e).__name__}: {e}",
+                sandbox_error=True
+            )))
+        streamed += 1
+
+    # Workers run jobs on their main thread, so SIGALRM can stop a single case
+    use_alarm = hasattr(signal, "setitimer")
+    results = _run_suite_local(
+        code, func_name, cases, per_case_timeout, total_timeout, namespace, result_converter,
+        fuel, memory_limit, use_alarm, on_result, arg_converter=arg_converter,
+        measure_memory=measure_memory, profile=profile
+    )
+    # Cases that ran were streamed; the reply holds the ones that did not
+    return results[streamed:]
+
+
+def _run_fuzz_job(code, spec, seeds, inputs, per_case_timeout, total_timeout, fuel):
+    use_alarm = hasattr(signal, "setitimer")
+    return _fuzz_batch(code, spec, seeds, inputs, per_case_timeout, total_timeout, fuel, use_alarm)
+
+
+# Namespace of the code loaded by a SandboxedModule leasing this worker
+_loaded_namespace = {}
+
+
+def _run_load_job(code, namespace, fuel, memory_limit):
+    global _loaded_namespace
+    success, message, _loaded_namespace = _safe_exec_local(
+        code, namespace, None, fuel=fuel, memory_limit=memory_limit
+    )
+    return success, message
+
+
+def _run_call_job(func_name, args, kwargs, result_converter, fuel, memory_limit):
+    return _call_in_namespace(
+        _loaded_namespace, func_name, args, kwargs, None, result_converter, fuel, memory_limit
+    )
+
+
+def _run_unload_job():
+    global _loaded_namespace
+    _loaded_namespace = {}
+
+
+_JOB_HANDLERS = {
+    "exec": _run_exec_job,
+    "function": _run_function_job,
+    "suite": _run_suite_job,
+    "fuzz": _run_fuzz_job,
+    "load": _run_load_job,
+    "call": _run_call_job,
+    "unload": _run_unload_job,
+}
+
+
+def _worker_main(conn) -> None:
+    """Worker process loop: receive a job, run it, send back the reply."""
+    global _parent_conn
+    _parent_conn = conn
+    # Ctrl+C belongs to the parent; it shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Nothing else runs in this process, so memory limits can be hard limits
+    _enable_hard_memory_limits()
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        kind, payload = job
+        try:
+            reply = _JOB_HANDLERS[kind](*payload)
+        except BaseException as e:
+            reply = WorkerCrashedError(f"{type(e).__name__}: {e}")
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The result itself could not be pickled
+            conn.send(WorkerCrashedError(
+                f"Result could not be returned from the sandbox: {type(e).__name__}: {e}"
+            ))
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+        self.discarded = False  # Set once the pool has given up on this worker
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+
+class SandboxPool:
+    """
+    Warm pool of worker processes that run sandboxed jobs.
+
+    Args:
+        size: Number of worker processes
+        max_jobs_per_worker: Recycle a worker after this many jobs
+        warm_up: Start every worker immediately rather than on first use
+        start_method: multiprocessing start method, None for the default
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 100,
+        warm_up: bool = True,
+        start_method: Optional[str] = None
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._live = 0  # Started or starting workers, idle or busy
+        self._closed = False
+
+        if warm_up:
+            for _ in range(size):
+                self._live += 1
+                self._idle.put(_Worker(self._context))
+
+    def acquire(self) -> _Worker:
+        """
+        Take an idle worker, starting a new one if the pool is not full.
+
+        While waiting it keeps checking the pool, so a shutdown raises and a
+        replacement that failed to start is retried here instead of leaving
+        the caller blocked.
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Sandbox pool has been shut down")
+                spawn = self._idle.empty() and self._live < self.size
+                if spawn:
+                    self._live += 1
+
+            if spawn:
+                try:
+                    return _Worker(self._context)
+                except Exception:
+                    with self._lock:
+                        self._live -= 1
+                    raise
+
+            try:
+                worker = self._idle.get(timeout=_ACQUIRE_POLL_S)
+            except queue.Empty:
+                continue
+            if self._closed:
+                worker.stop()
+                raise RuntimeError("Sandbox pool has been shut down")
+            if not worker.discarded:  # Skip workers cancelled while idle
+                return worker
+
+    def release(self, worker: _Worker, unload: bool = False) -> None:
+        """
+        Return a worker to the pool, recycling it if it has done enough jobs.
+
+        Args:
+            worker: A worker obtained from acquire()
+            unload: Drop the namespace loaded by a SandboxedModule first
+        """
+        if unload and not self._closed:
+            try:
+                self.run_on(worker, "unload", (), 1.0)
+            except Exception:
+                if worker.discarded:
+                    return
+        if self._closed:
+            worker.stop()
+        elif worker.jobs_done >= self.max_jobs_per_worker:
+            self._replace_in_background(worker, graceful=True)
+        else:
+            self._idle.put(worker)
+
+    def _replace_in_background(self, worker: _Worker, graceful: bool = False) -> None:
+        """Dispose of a worker and start its replacement off the caller's thread."""
+        with self._lock:
+            if worker.discarded:
+                return  # Already being replaced
+            worker.discarded = True
+
+        def replace():
+            if graceful:
+                worker.stop()
+            else:
+                worker.kill()
+            if self._closed:
+                with self._lock:
+                    self._live -= 1
+                return
+            try:
+                self._idle.put(_Worker(self._context))
+            except Exception:
+                with self._lock:
+                    self._live -= 1
+
+        threading.Thread(target=replace, daemon=True).start()
+
+    def run_on(
+        self,
+        worker: _Worker,
+        kind: str,
+        payload: Tuple,
+        timeout: Optional[float],
+        on_progress: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Run one job on an acquired worker and return its reply.
+
+        The worker stays acquired unless it had to be discarded. Progress
+        items the job sends before its reply are passed to on_progress.
+
+        Raises:
+            CodeTimeoutError: The job did not finish in time; its worker is killed
+            WorkerCrashedError: The worker died or could not return the result
+        """
+        # Pickling happens before anything is written, so a failure here
+        # leaves the worker usable
+        worker.conn.send((kind, payload))
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                finished = worker.conn.poll(remaining)
+                reply = worker.conn.recv() if finished else None
+            except (EOFError, OSError):
+                self._replace_in_background(worker)
+                raise WorkerCrashedError("Sandbox worker exited unexpectedly")
+            if not isinstance(reply, _Progress):
+                break
+            if on_progress is not None:
+                on_progress(reply.item)
+
+        if not finished:
+            self._replace_in_background(worker)
+            raise CodeTimeoutError(f"Code execution timed out after {timeout} seconds")
+
+        worker.jobs_done += 1
+
+        if isinstance(reply, WorkerCrashedError):
+            raise reply
+        return reply
+
+    def cancel(self, worker: _Worker) -> None:
+        """Kill a worker in the middle of its job and start a replacement."""
+        self._replace_in_background(worker)
+
+    def run(
+        self,
+        kind: str,
+        payload: Tuple,
+        timeout: Optional[float],
+        on_acquire: Optional[Callable[[_Worker], None]] = None,
+        on_progress: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Run one job on any idle worker; see run_on().
+
+        on_acquire is called with the worker before the job is sent, so the
+        caller can cancel() it from another thread.
+        """
+        worker = self.acquire()
+        try:
+            if on_acquire is not None:
+                on_acquire(worker)
+            return self.run_on(worker, kind, payload, timeout, on_progress)
+        finally:
+            if not worker.discarded:
+                self.release(worker)
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy workers are stopped when released."""
+        with self._lock:
+            self._closed = True
+
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
@@ -0,0 +1,187 @@
+"""
+Structured trace events for the playgrounds.
+
+The logic modules yield each step of an algorithm from a generator as a
+compact TraceEvent holding only what changed at that step, never a copy of
+the algorithm's state, and the key of the flowchart node it belongs to. A
+TraceStream pulls those events as the playground steps forward, keeping a
+bounded look-ahead and a bounded history, so stepping through a huge input
+starts at once and uses constant memory for the trace. Text is rendered
+by the problem's describe function the first time a step is shown.
+
+Every Playground.KEYFRAME_INTERVAL steps the stream also records a
+keyframe: the small state the problem's generator needs to resume from
+that step. Seeking to any step already passed restarts the generator from
+the keyframe before it and replays at most an interval of events (the
+deltas), so a seek takes bounded time however far back it goes.
+"""
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyqt6_learning_labs.core.constants import Playground
+
+
+class TraceEvent(NamedTuple):
+    """One step of an algorithm trace."""
+    kind: str  # Step type, e.g. "visit" or "store"; the describe function switches on it
+    index: Optional[int] = None  # Loop position, if the step has one
+    value: Any = None  # The element or values the step works on
+    delta: Any = None  # What the step changed or found, e.g. the needed complement
+    node: Optional[str] = None  # FLOWCHART_NODES key the playground highlights for the step
+
+
+def preview_list(values: Sequence[Any], limit: int = Playground.PREVIEW_ITEMS) -> str:
+    """repr of a list, shortened to its first items when long."""
+    if len(values) <= limit:
+        return repr(list(values))
+    head = ", ".join(repr(value) for value in values[:limit])
+    return f"[{head}, ... ({len(values):,} items)]"
+
+
+class TraceStream:
+    """
+    Steps of a trace generator, produced on demand.
+
+    Steps are numbered from 0. Up to lookahead steps are produced ahead of
+    the latest step asked for, and steps more than history behind it are
+    dropped. total is None until the generator is first exhausted.
+
+    To seek back past the kept steps the stream needs resume and keyframe:
+    keyframe(event) returns the state to resume from after that event, or
+    None if the generator cannot resume there; resume(state) returns a
+    generator of the steps after it, and resume(None) the whole trace.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[TraceEvent],
+        describe: Callable[[TraceEvent], str],
+        expected: int = 0,
+        lookahead: int = Playground.TRACE_LOOKAHEAD,
+        history: int = Playground.TRACE_HISTORY,
+        resume: Optional[Callable[[Any], Iterable[TraceEvent]]] = None,
+        keyframe: Optional[Callable[[TraceEvent], Any]] = None,
+        keyframe_interval: int = Playground.KEYFRAME_INTERVAL
+    ):
+        self._events = iter(events)
+        self._describe = describe
+        self.expected = expected  # Estimate of the step count, for progress bars
+        self.lookahead = lookahead
+        self.history = history
+        self._resume = resume
+        self._keyframe = keyframe if resume is not None else None
+        self.keyframe_interval = keyframe_interval
+        self._keyframe_steps: List[int] = [0]  # Sorted; parallel to _keyframe_states
+        self._keyframe_states: List[Any] = [None]
+        self._steps: Deque[List[Any]] = deque()  # [event, text or None]
+        self._first = 0  # Step number of _steps[0]
+        self.exhausted = False  # Whether the current generator has run out
+        self.reached = 0  # Furthest step count produced
+        self.final: Optional[TraceEvent] = None  # Last event, once known
+
+    @property
+    def first_kept(self) -> int:
+        """Earliest step still in memory."""
+        return self._first
+
+    @property
+    def produced(self) -> int:
+        """Number of steps produced so far."""
+        return self._first + len(self._steps)
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.reached if self.final is not None else None
+
+    @property
+    def estimate(self) -> int:
+        """The step count if known, otherwise the best guess so far."""
+        return self.reached if self.final is not None else max(self.expected, self.reached)
+
+    @property
+    def keyframes(self) -> List[Tuple[int, Any]]:
+        """(step, state) pairs recorded so far; step 0 always resumes from None."""
+        return list(zip(self._keyframe_steps, self._keyframe_states))
+
+    def available(self, step: int) -> bool:
+        """Whether the trace has a step number step, producing steps up to it."""
+        self._produce(step + 1 + self.lookahead)
+        # Past the end, keep the history before the last step rather than dropping it
+        self._trim(min(step, self.produced))
+        return step < self.produced
+
+    def kept(self, step: int) -> bool:
+        return self._first <= step < self.produced
+
+    def seek(self, step: int) -> bool:
+        """
+        Make step available, replaying from the nearest keyframe if it was dropped.
+
+        Returns whether the trace has that step. Without resume, steps
+        before first_kept cannot be reached again.
+        """
+        if step < 0:
+            return False
+        if self.kept(step):
+            return self.available(step)
+        index = bisect_right(self._keyframe_steps, step) - 1
+        ahead = step >= self.produced and self._keyframe_steps[index] <= self.produced
+        if self._resume is None or ahead:
+            # Producing forward is no slower than replaying from a keyframe
+            return step >= self._first and self.available(step)
+
+        self._events = iter(self._resume(self._keyframe_states[index]))
+        self._steps.clear()
+        self._first = self._keyframe_steps[index]
+        self.exhausted = False
+        return self.available(step)
+
+    def event(self, step: int) -> TraceEvent:
+        return self._entry(step)[0]
+
+    def text(self, step: int) -> str:
+        entry = self._entry(step)
+        if entry[1] is None:
+            entry[1] = self._describe(entry[0])
+        return entry[1]
+
+    def texts(self, start: int, stop: int) -> List[str]:
+        return [self.text(step) for step in range(start, stop)]
+
+    def run_to_end(self) -> int:
+        """Produce every remaining step, keeping only the last history; returns the total."""
+        while not self.exhausted:
+            self._produce(self.produced + self.lookahead)
+            self._trim(self.produced)
+        return self.produced
+
+    def _entry(self, step: int) -> List[Any]:
+        if not self.kept(step):
+            raise IndexError(f"step {step} is not in memory")
+        return self._steps[step - self._first]
+
+    def _produce(self, stop: int) -> None:
+        while not self.exhausted and self.produced < stop:
+            try:
+                event = next(self._events)
+            except StopIteration:
+                self.exhausted = True
+                if self.final is None and self._steps:
+                    self.final = self._steps[-1][0]
+                break
+            self._steps.append([event, None])
+            produced = self.produced
+            if produced > self.reached:
+                self.reached = produced
+                due = produced >= self._keyframe_steps[-1] + self.keyframe_interval
+                if self._keyframe is not None and due:
+                    state = self._keyframe(event)
+                    if state is not None:
+                        self._keyframe_steps.append(produced)
+                        self._keyframe_states.append(state)
+
+    def _trim(self, step: int) -> None:
+        while self._steps and self._first < step - self.history:
+            self._steps.popleft()
+            self._first += 1
@@ -0,0 +1,258 @@
+"""
+Trace files: playground traces saved to disk and replayed.
+
+write_trace() streams events from a trace generator to a file one at a
+time, so a million-step trace never has to be held in memory or built into
+one string. The format follows the file name:
+
+- .jsonl: a header line, then one JSON object per event
+- .trace: MAGIC, the number of events (a little-endian uint64, written
+  once the trace has been streamed; 0 when compressed), then
+  length-prefixed records (a little-endian uint32 byte count and a compact
+  JSON array); the first record is the header
+- either with .gz appended: the same, gzip-compressed
+
+TraceReader opens any of them for replay. An uncompressed .trace file is
+memory-mapped and can resume at any record: the byte offset after an event
+serves as its keyframe, so a TraceStream over it seeks in bounded time.
+The other formats can only be replayed from the start. A truncated last
+record ends the trace; a corrupt record raises ValueError when reached.
+"""
+import gzip
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from pyqt6_learning_labs.core.safe_exec import CancelToken
+from pyqt6_learning_labs.core.trace import TraceEvent
+
+FORMAT_NAME = "pyqt6-learning-labs-trace"
+FORMAT_VERSION = 1
+MAGIC = b"LLTRACE\x01"
+_COUNT = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+_GZIP_MAGIC = b"\x1f\x8b"
+PROGRESS_INTERVAL = 10_000  # Events written between write_trace() progress calls
+# json.dumps builds a new encoder per call when given options; records reuse one
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# File dialog filters for saving, with the suffix each one adds
+SAVE_FILTERS = {
+    "Binary trace (*.trace)": ".trace",
+    "Binary trace, gzip (*.trace.gz)": ".trace.gz",
+    "JSON Lines (*.jsonl)": ".jsonl",
+    "JSON Lines, gzip (*.jsonl.gz)": ".jsonl.gz",
+}
+OPEN_FILTER = "Trace files (*.trace *.trace.gz *.jsonl *.jsonl.gz)"
+
+
+def trace_file_format(path: str) -> Tuple[bool, bool]:
+    """(binary, compressed) for a trace file name; ValueError for other extensions."""
+    name = Path(path).name.lower()
+    compressed = name.endswith(".gz")
+    if compressed:
+        name = name[:-3]
+    if name.endswith(".trace"):
+        return True, compressed
+    if name.endswith(".jsonl"):
+        return False, compressed
+    raise ValueError(f"Trace files end in .trace or .jsonl (optionally .gz): {path}")
+
+
+def write_trace(
+    path: str,
+    events: Iterable[TraceEvent],
+    problem: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> int:
+    """
+    Stream events to path in the format its name asks for.
+
+    Args:
+        path: Output file; see trace_file_format()
+        events: The trace, typically a fresh generator from the logic module
+        problem: Which lab the trace is from, e.g. "two_sum"
+        on_progress: Called with the number of events written every
+            PROGRESS_INTERVAL events
+        cancel_token: Stops the write; the partial file is removed
+
+    Returns:
+        The number of events written
+    """
+    binary, compressed = trace_file_format(path)
+    header = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "problem": problem}
+    count = 0
+    with (gzip.open(path, "wb") if compressed else open(path, "wb")) as f:
+        if binary:
+            f.write(MAGIC)
+            f.write(_COUNT.pack(0))
+            _write_record(f, header)
+        else:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+
+        for event in events:
+            if binary:
+                _write_record(f, event)
+            else:
+                record = {field: item for field, item in zip(TraceEvent._fields, event) if item is not None}
+                f.write(json.dumps(record).encode("utf-8") + b"\n")
+            count += 1
+            if count % PROGRESS_INTERVAL == 0:
+                if cancel_token is not None and cancel_token.cancelled:
+                    break
+                if on_progress is not None:
+                    on_progress(count)
+
+        if binary and not compressed:
+            f.seek(len(MAGIC))
+            f.write(_COUNT.pack(count))
+
+    if cancel_token is not None and cancel_token.cancelled:
+        os.remove(path)
+    return count
+
+
+def _write_record(f: BinaryIO, record: Any) -> None:
+    payload = _ENCODER.encode(record).encode("utf-8")
+    f.write(_LENGTH.pack(len(payload)))
+    f.write(payload)
+
+
+def _tuples(item: Any) -> Any:
+    # JSON has no tuples; the describe functions only unpack and index them
+    return tuple(item) if isinstance(item, list) else item
+
+
+class TraceReader:
+    """
+    A trace file opened for replay.
+
+    events() yields its TraceEvents, and steps is their number if the file
+    records it. events and keyframe serve as a TraceStream's resume and
+    keyframe: when seekable, events(offset) starts at a byte offset from
+    keyframe(); otherwise keyframe() gives None, so every seek back replays
+    from the start. Raises ValueError if the file is not a trace.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._raw = open(path, "rb")
+        self._map: Optional[mmap.mmap] = None
+        try:
+            compressed = self._raw.read(len(_GZIP_MAGIC)) == _GZIP_MAGIC
+            self._raw.seek(0)
+            self._file = gzip.GzipFile(fileobj=self._raw) if compressed else self._raw
+            self.binary = self._file.read(len(MAGIC)) == MAGIC
+            steps = 0
+
+            if self.binary and not compressed:
+                self._map = mmap.mmap(self._raw.fileno(), 0, access=mmap.ACCESS_READ)
+                (steps,) = _COUNT.unpack_from(self._map, len(MAGIC))
+                header, self._start = self._map_record(len(MAGIC) + _COUNT.size)
+            elif self.binary:
+                self._file.read(_COUNT.size)
+                header = self._stream_record()
+                self._start = self._file.tell()
+            else:
+                self._file.seek(0)
+                header = json.loads(self._file.readline() or b"null")
+                self._start = self._file.tell()
+        except (OSError, EOFError, ValueError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Not a trace file: {path} ({e})") from None
+
+        if not isinstance(header, dict) or header.get("format") != FORMAT_NAME:
+            self.close()
+            raise ValueError(f"Not a trace file: {path}")
+        self.header: Dict[str, Any] = header
+        self.problem: Optional[str] = header.get("problem")
+        self.steps: Optional[int] = steps or None
+        self.offset = self._start  # Byte offset after the last event yielded
+
+    @property
+    def seekable(self) -> bool:
+        """Whether events() can start at a keyframe offset."""
+        return self._map is not None
+
+    def events(self, offset: Optional[int] = None) -> Iterator[TraceEvent]:
+        """
+        Yield the events from the start, or from a keyframe offset if seekable.
+
+        Raises ValueError at a record that cannot be decoded, and OSError if
+        the file cannot be read.
+        """
+        if offset is not None and not self.seekable:
+            raise ValueError("Only uncompressed .trace files can resume at an offset")
+        try:
+            yield from self._events(offset)
+        except EOFError:
+            return  # A truncated gzip stream, like a truncated last record
+        except (ValueError, TypeError, AttributeError, struct.error, zlib.error) as e:
+            raise ValueError(f"Corrupt trace file: {self.path} ({e})") from None
+
+    def keyframe(self, event: TraceEvent) -> Optional[int]:
+        """Offset to resume after event; TraceStream calls this right after the event is yielded."""
+        return self.offset if self.seekable else None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._raw.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _events(self, offset: Optional[int]) -> Iterator[TraceEvent]:
+        if self._map is not None:
+            yield from self._map_events(self._start if offset is None else offset)
+            return
+
+        self._file.seek(self._start)
+        if self.binary:
+            while True:
+                record = self._stream_record()
+                if record is None:
+                    return
+                yield TraceEvent(*map(_tuples, record))
+        else:
+            for line in self._file:
+                if line.strip():
+                    record = json.loads(line)
+                    yield TraceEvent(*(_tuples(record.get(field)) for field in TraceEvent._fields))
+
+    def _map_events(self, position: int) -> Iterator[TraceEvent]:
+        while True:
+            record, position = self._map_record(position)
+            if record is None:
+                return
+            self.offset = position
+            yield TraceEvent(*map(_tuples, record))
+
+    def _map_record(self, position: int) -> Tuple[Any, int]:
+        # A truncated last record (an interrupted export) ends the trace
+        end = position + _LENGTH.size
+        if end > len(self._map):
+            return None, position
+        (length,) = _LENGTH.unpack_from(self._map, position)
+        if end + length > len(self._map):
+            return None, position
+        return json.loads(self._map[end:end + length].decode("utf-8")), end + length
+
+    def _stream_record(self) -> Any:
+        prefix = self._file.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return None
+        (length,) = _LENGTH.unpack(prefix)
+        payload = self._file.read(length)
+        if len(payload) < length:
+            return None
+        return json.loads(payload.decode("utf-8"))
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Tuple, Optional
 import re
@@ -185,3 +186,9 @@ def get_base_dir() -> Path:
 def get_lessons_dir() -> Path:
     """Get the lessons directory (parent of pyqt6_learning_labs)."""
     return get_base_dir().parent
+
+
+def get_cache_dir() -> Path:
+    """Get the per-user cache directory for compiled code and grading results."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pyqt6_learning_labs"
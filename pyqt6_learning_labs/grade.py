@@ -0,0 +1,333 @@
+"""
+Headless grader for Code Lab submissions.
+
+Usage:
+    python -m pyqt6_learning_labs.grade --problem two_sum --workers 4 two-sum/python/practice/*.py
+
+Every file runs the problem's test cases in the sandbox's process pool, and
+then its scale tier once all of them pass, with up to --workers files graded
+at once. One JSON object per file is written as a line to stdout (or
+--output), in the order the files were given. The exit status is 0 when
+every file passes and 1 otherwise.
+
+Records are kept in the on-disk grading cache (core/grade_cache.py), so a
+file graded before with the same suite and limits is answered from disk,
+and the sandbox is not started at all when every file is.
+
+A file may define the lab's function (two_sum, add_two_numbers) or a
+LeetCode-style Solution class; its first public method is then called.
+Nothing here imports PyQt6.
+"""
+import argparse
+import ast
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pyqt6_learning_labs.core.benchmark import ScaleCase, prepare_scale_cases, scale_timeout, scale_verdict
+from pyqt6_learning_labs.core.constants import Sandbox
+from pyqt6_learning_labs.core.grade_cache import GradeCache, sandbox_settings, suite_version
+from pyqt6_learning_labs.core.safe_exec import (
+    CaseResult, configure_sandbox, safe_exec_suite, shutdown_sandbox
+)
+from pyqt6_learning_labs.core.utils import get_cache_dir
+
+
+class GradeProblem(NamedTuple):
+    """What the grader needs to know about one Code Lab problem."""
+    func_name: str
+    suite: str  # suite_version() of the test and scale cases, for the grading cache
+    cases: List[tuple]  # Call arguments per test case
+    expected: List[Any]
+    scale_cases: List[tuple]  # (n, seed) inputs for the scale tier
+    generate: Callable[[int, int], tuple]
+    reference: Callable[..., Any]
+    to_expected: Optional[Callable[[Any], Any]] = None
+    namespace: Optional[Dict[str, Any]] = None
+    result_converter: Optional[Callable[[Any], Any]] = None
+
+
+def _two_sum() -> GradeProblem:
+    from pyqt6_learning_labs.apps.two_sum.config import SCALE_CASES, TEST_CASES
+    from pyqt6_learning_labs.apps.two_sum.logic import generate_two_sum_case, two_sum_reference
+
+    return GradeProblem(
+        "two_sum",
+        suite_version(TEST_CASES, SCALE_CASES),
+        [(list(nums), target) for nums, target, _ in TEST_CASES],
+        [expected for *_, expected in TEST_CASES],
+        SCALE_CASES,
+        generate_two_sum_case,
+        two_sum_reference
+    )
+
+
+def _add_two_numbers() -> GradeProblem:
+    from pyqt6_learning_labs.apps.add_two_nums.config import SCALE_CASES, TEST_CASES
+    from pyqt6_learning_labs.apps.add_two_nums.logic import (
+        ListNode, add_two_numbers_reference, generate_add_two_nums_case, list_to_nodes, nodes_to_list
+    )
+
+    return GradeProblem(
+        "add_two_numbers",
+        suite_version(TEST_CASES, SCALE_CASES),
+        [(list_to_nodes(l1), list_to_nodes(l2)) for l1, l2, _ in TEST_CASES],
+        [expected for *_, expected in TEST_CASES],
+        SCALE_CASES,
+        generate_add_two_nums_case,
+        add_two_numbers_reference,
+        to_expected=nodes_to_list,
+        namespace={"ListNode": ListNode},
+        result_converter=nodes_to_list
+    )
+
+
+PROBLEMS: Dict[str, Callable[[], GradeProblem]] = {
+    "two_sum": _two_sum,
+    "add_two_numbers": _add_two_numbers,
+}
+
+
+def with_entry_point(code: str, func_name: str) -> str:
+    """
+    Give a LeetCode-style submission a top-level func_name to call.
+
+    Code that already defines func_name, or that does not parse (the sandbox
+    reports that), is returned unchanged.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == func_name:
+            return code
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Solution":
+            methods = [
+                item.name for item in node.body
+                if isinstance(item, ast.FunctionDef) and not item.name.startswith("_")
+            ]
+            if methods:
+                return f"{code}\n\ndef {func_name}(*args):\n    return Solution().{methods[0]}(*args)\n"
+    return code
+
+
+def _case_record(outcome: CaseResult, verdict: str) -> Dict[str, Any]:
+    record = {
+        "verdict": verdict,
+        "elapsed": outcome.elapsed,
+        "ops": outcome.ops,
+        "peak_memory": outcome.peak_memory,
+        "message": outcome.message or None,
+    }
+    if outcome.sandbox_error:
+        record["sandbox_error"] = True
+    return record
+
+
+def _cacheable(record: Dict[str, Any]) -> bool:
+    # A slow or timed-out scale case was judged against this machine's clock
+    if any(case["verdict"] != "pass" for case in record.get("scale", [])):
+        return False
+    return all(
+        case["verdict"] in ("pass", "fail", "error") and not case.get("sandbox_error")
+        for case in record["tests"]
+    )
+
+
+def _test_verdict(outcome: CaseResult, expected: Any) -> str:
+    if outcome.status == "ok":
+        return "pass" if outcome.value == expected else "fail"
+    return outcome.status  # "timeout", "error" or "skipped"
+
+
+def _read_source(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(source, None), or (None, why the file could not be read)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read(), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"Could not read file: {e}"
+
+
+def grade_source(
+    code: str,
+    problem: GradeProblem,
+    scale: Optional[Sequence[ScaleCase]] = None
+) -> Dict[str, Any]:
+    """
+    Grade one submission in the sandbox.
+
+    Args:
+        code: Source of the submission
+        problem: What to run it on
+        scale: Prepared scale-tier cases; the tier is skipped if None
+
+    Returns:
+        A JSON-ready record. Its verdict is "pass", "slow" (every answer
+        right but a scale input missed its budget) or "fail".
+    """
+    record: Dict[str, Any] = {"verdict": "fail", "function": problem.func_name}
+    code = with_entry_point(code, problem.func_name)
+
+    outcomes = safe_exec_suite(
+        code,
+        problem.func_name,
+        problem.cases,
+        per_case_timeout=Sandbox.TEST_TIMEOUT_S,
+        total_timeout=Sandbox.TEST_TIMEOUT_S * len(problem.cases),
+        namespace=problem.namespace,
+        result_converter=problem.result_converter,
+        fuel=Sandbox.TEST_FUEL,
+        memory_limit=Sandbox.TEST_MEMORY_LIMIT_MB * 1024 * 1024
+    )
+    verdicts = [_test_verdict(outcome, expected) for outcome, expected in zip(outcomes, problem.expected)]
+    record["passed"] = verdicts.count("pass")
+    record["total"] = len(verdicts)
+    record["tests"] = [_case_record(outcome, verdict) for outcome, verdict in zip(outcomes, verdicts)]
+    record["elapsed"] = sum(outcome.elapsed for outcome in outcomes)
+    peaks = [outcome.peak_memory for outcome in outcomes if outcome.peak_memory is not None]
+    record["peak_memory"] = max(peaks) if peaks else None
+
+    if record["passed"] < record["total"]:
+        return record
+    if scale is None:
+        record["verdict"] = "pass"
+        return record
+
+    timeout = scale_timeout(scale)
+    outcomes = safe_exec_suite(
+        code,
+        problem.func_name,
+        problem.scale_cases,
+        per_case_timeout=timeout,
+        total_timeout=timeout * len(scale),
+        namespace=problem.namespace,
+        result_converter=problem.result_converter,
+        arg_converter=problem.generate
+    )
+    verdicts = [scale_verdict(case, outcome)[0] for case, outcome in zip(scale, outcomes)]
+    record["scale"] = [
+        dict(_case_record(outcome, verdict), n=case.n, budget=case.budget_s)
+        for case, outcome, verdict in zip(scale, outcomes, verdicts)
+    ]
+    if all(verdict == "pass" for verdict in verdicts):
+        record["verdict"] = "pass"
+    elif all(verdict in ("pass", "slow") for verdict in verdicts):
+        record["verdict"] = "slow"
+    return record
+
+
+def grade_files(
+    paths: Sequence[str],
+    problem: GradeProblem,
+    workers: int = Sandbox.POOL_SIZE,
+    scale: bool = True,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cache: Optional[GradeCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Grade several files on a pool of sandbox worker processes.
+
+    Every record has the file's path and whether it came from cache. A file
+    that could not be read gets verdict "error". on_record is called with
+    each record in path order, as soon as the records before it are done.
+    """
+    sources = [_read_source(path) for path in paths]
+    settings = dict(sandbox_settings(), scale=scale)
+    keys = [
+        cache.key(code, problem.suite, settings) if cache is not None and code is not None else None
+        for code, _ in sources
+    ]
+    cached = [cache.get(key) if key is not None else None for key in keys]
+    scale_cases = None  # Prepared only if some file needs the sandbox
+
+    def grade(index):
+        path = paths[index]
+        code, error = sources[index]
+        if error is not None:
+            return {"file": path, "verdict": "error", "function": problem.func_name, "message": error}
+        if cached[index] is not None:
+            return dict({"file": path}, **cached[index], cached=True)
+
+        record = grade_source(code, problem, scale_cases)
+        # Cases stopped by the clock may finish next time, scale cases that
+        # missed their budget may not on a quieter machine, and a crashed
+        # worker may not crash again
+        if cache is not None and _cacheable(record):
+            cache.put(keys[index], record)
+        return dict({"file": path}, **record, cached=False)
+
+    records = []
+    if all(error is not None or hit is not None for (_, error), hit in zip(sources, cached)):
+        for index in range(len(paths)):
+            records.append(grade(index))
+            if on_record is not None:
+                on_record(records[-1])
+        return records
+
+    # Budgets come from timing the reference here, before the workers are busy
+    if scale:
+        scale_cases = prepare_scale_cases(
+            problem.scale_cases, problem.generate, problem.reference, problem.to_expected
+        )
+
+    configure_sandbox(
+        "process", pool_size=workers, max_jobs_per_worker=Sandbox.MAX_JOBS_PER_WORKER
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for record in executor.map(grade, range(len(paths))):
+                records.append(record)
+                if on_record is not None:
+                    on_record(record)
+    finally:
+        shutdown_sandbox()
+    return records
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pyqt6_learning_labs.grade",
+        description="Grade Code Lab submissions in the sandbox and print one JSON line per file."
+    )
+    parser.add_argument("files", nargs="+", help="Solution files to grade")
+    parser.add_argument("--problem", "-p", required=True, choices=sorted(PROBLEMS))
+    parser.add_argument(
+        "--workers", "-w", type=int, default=Sandbox.POOL_SIZE,
+        help=f"Sandbox worker processes (default: {Sandbox.POOL_SIZE})"
+    )
+    parser.add_argument("--no-scale", action="store_true", help="Skip the scale tier")
+    parser.add_argument("--output", "-o", help="Write the JSON lines here instead of stdout")
+    parser.add_argument(
+        "--cache-dir", type=Path, default=get_cache_dir() / "grades",
+        help="Grading cache directory (default: %(default)s)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Grade every file in the sandbox")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    def write(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    cache = None if args.no_cache else GradeCache(args.cache_dir)
+    try:
+        records = grade_files(
+            args.files, PROBLEMS[args.problem](), args.workers, not args.no_scale, write, cache
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0 if all(record["verdict"] == "pass" for record in records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,9 +8,14 @@ from PyQt6.QtGui import QAction, QIcon, QFont, QColor, QPalette, QShortcut, QKey
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QPoint, QParallelAnimationGroup, QTimer, QRect
 
 from pyqt6_learning_labs.core.theme import set_futuristic_style
-from pyqt6_learning_labs.core.constants import Dimensions, Colors, Timing, Shortcuts
+from pyqt6_learning_labs.core.constants import Dimensions, Colors, Timing, Shortcuts, Sandbox
+from pyqt6_learning_labs.core.safe_exec import configure_sandbox, enable_code_disk_cache
+from pyqt6_learning_labs.core.grade_cache import enable_grade_cache
+from pyqt6_learning_labs.core.utils import get_cache_dir
 from pyqt6_learning_labs.apps.two_sum import TwoSumWidget
 from pyqt6_learning_labs.apps.add_two_nums import AddTwoNumbersWidget
+from pyqt6_learning_labs.apps.two_sum.config import TEMPLATE_CODE as TWO_SUM_TEMPLATE
+from pyqt6_learning_labs.apps.add_two_nums.config import TEMPLATE_CODE as ADD_TWO_NUMS_TEMPLATE
 
 
 class CustomTitleBar(QWidget):
@@ -593,6 +598,17 @@ class MainWindow(ResizableFramelessWindow):
 
 
 def main():
+    enable_code_disk_cache(get_cache_dir() / "code", [TWO_SUM_TEMPLATE, ADD_TWO_NUMS_TEMPLATE])
+    enable_grade_cache(get_cache_dir() / "grades")
+
+    # Fork the sandbox workers before Qt starts any threads of its own
+    configure_sandbox(
+        backend=Sandbox.BACKEND,
+        pool_size=Sandbox.POOL_SIZE,
+        max_jobs_per_worker=Sandbox.MAX_JOBS_PER_WORKER,
+        warm_up=Sandbox.WARM_UP,
+    )
+
     app = QApplication(sys.argv)
     set_futuristic_style(app)
 
@@ -0,0 +1,66 @@
+"""
+Tests for the shared Code Lab tab.
+Run with: python -m pytest pyqt6_learning_labs/tests/test_code_lab.py -v
+"""
+import sys
+import time
+import pytest
+
+# Skip if PyQt6 not available
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtWidgets import QApplication
+
+from pyqt6_learning_labs.apps.add_two_nums.ui import ADD_TWO_NUMS_CODE_LAB
+from pyqt6_learning_labs.apps.two_sum.ui import TWO_SUM_CODE_LAB
+from pyqt6_learning_labs.core.safe_exec import CaseResult
+from pyqt6_learning_labs.widgets.code_lab import CodeLab
+
+# Create QApplication if needed
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def wait_for(lab, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while lab._runner is not None and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()
+
+
+class TestCodeLab:
+    """Test the Code Lab with each problem's configuration."""
+
+    def test_header_and_template_come_from_the_problem(self):
+        lab = CodeLab(ADD_TWO_NUMS_CODE_LAB)
+        lab.editor.set_code("")
+        lab.reset_code()
+        assert lab.editor.get_code() == ADD_TWO_NUMS_CODE_LAB.template
+
+    def test_outcomes_use_the_problem_formatting(self):
+        two_sum = CodeLab(TWO_SUM_CODE_LAB)
+        nums, target, expected = TWO_SUM_CODE_LAB.test_cases[0]
+        assert two_sum._format_outcome(0, CaseResult("ok", expected, ops=3, peak_memory=100)).startswith(
+            f"PASS: {nums}, {target} -> {expected}"
+        )
+
+        add_two = CodeLab(ADD_TWO_NUMS_CODE_LAB)
+        l1, l2, _ = ADD_TWO_NUMS_CODE_LAB.test_cases[0]
+        assert add_two._format_outcome(0, CaseResult("error", message="boom")) == f"ERROR: {l1} + {l2} -> boom"
+
+    def test_test_inputs_are_copied(self):
+        lab = CodeLab(TWO_SUM_CODE_LAB)
+        nums, target, _ = TWO_SUM_CODE_LAB.test_cases[0]
+        args = lab._call_args((nums, target))
+        assert args == (nums, target) and args[0] is not nums
+
+    def test_wrong_submission_fails_the_tests(self):
+        lab = CodeLab(TWO_SUM_CODE_LAB)
+        lab.editor.set_code("def two_sum(nums, target):\n    return []\n")
+        lab.run_tests()
+        wait_for(lab)
+        lines = lab.feedback.toPlainText().splitlines()
+        assert len(lines) == len(TWO_SUM_CODE_LAB.test_cases)
+        assert all(line.startswith(("PASS", "FAIL")) for line in lines)
+        assert lines[0].startswith("FAIL: [2, 7, 11, 15], 9 -> Expected [0, 1], Got []")
+        assert lab.test_btn.isEnabled()
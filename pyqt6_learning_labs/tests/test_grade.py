@@ -0,0 +1,157 @@
+"""
+Tests for the headless grader.
+Run with: python -m pytest pyqt6_learning_labs/tests/test_grade.py -v
+"""
+import json
+import subprocess
+import sys
+
+from pyqt6_learning_labs.core.grade_cache import GradeCache
+from pyqt6_learning_labs.grade import PROBLEMS, grade_files, main, with_entry_point
+
+
+LEETCODE_STYLE = """
+class Solution(object):
+    def _helper(self):
+        pass
+
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, value in enumerate(nums):
+            if target - value in seen:
+                return [seen[target - value], i]
+            seen[value] = i
+        return []
+"""
+
+FIRST_PAIR_ONLY = """
+def two_sum(nums, target):
+    return [0, 1]
+"""
+
+
+def test_import_does_not_load_pyqt():
+    code = "import sys, pyqt6_learning_labs.grade; print(any(m.startswith('PyQt6') for m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_solution_class_gets_entry_point():
+    code = with_entry_point(LEETCODE_STYLE, "two_sum")
+    assert code.endswith("def two_sum(*args):\n    return Solution().twoSum(*args)\n")
+    assert with_entry_point(FIRST_PAIR_ONLY, "two_sum") == FIRST_PAIR_ONLY
+
+
+def test_grade_files_in_order(tmp_path):
+    paths = []
+    for name, code in (("leetcode.py", LEETCODE_STYLE), ("wrong.py", FIRST_PAIR_ONLY)):
+        paths.append(str(tmp_path / name))
+        (tmp_path / name).write_text(code)
+    paths.append(str(tmp_path / "missing.py"))
+
+    streamed = []
+    records = grade_files(paths, PROBLEMS["two_sum"](), workers=2, scale=False, on_record=streamed.append)
+    assert streamed == records
+    assert [record["file"] for record in records] == paths
+    assert [record["verdict"] for record in records] == ["pass", "fail", "error"]
+    assert records[0]["passed"] == records[0]["total"] == len(records[0]["tests"])
+    assert records[0]["peak_memory"] > 0
+    assert 0 < records[1]["passed"] < records[1]["total"]
+
+
+def test_main_writes_json_lines(tmp_path):
+    source = tmp_path / "solution.py"
+    source.write_text(LEETCODE_STYLE)
+    output = tmp_path / "grades.jsonl"
+    argv = ["--problem", "two_sum", "--workers", "1", "--output", str(output), "--no-cache", str(source)]
+    status = main(argv)
+    lines = output.read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    # Scale budgets are timings, so a loaded machine may call a case slow
+    assert record["verdict"] in ("pass", "slow")
+    assert status == (0 if record["verdict"] == "pass" else 1)
+    assert len(record["scale"]) == len(PROBLEMS["two_sum"]().scale_cases)
+
+
+def test_cached_files_skip_the_sandbox(tmp_path, monkeypatch):
+    import pyqt6_learning_labs.grade as grade
+
+    source = tmp_path / "solution.py"
+    source.write_text(FIRST_PAIR_ONLY)
+    cache = GradeCache(tmp_path / "cache")
+    problem = PROBLEMS["two_sum"]()
+    first = grade_files([str(source)], problem, workers=1, scale=False, cache=cache)[0]
+    assert not first["cached"] and len(cache) == 1
+
+    def no_sandbox(*args, **kwargs):
+        raise AssertionError("the sandbox was started")
+
+    monkeypatch.setattr(grade, "configure_sandbox", no_sandbox)
+    second = grade_files([str(source)], problem, workers=1, scale=False, cache=cache)[0]
+    assert second == dict(first, cached=True)
+
+    # A different suite is a different entry
+    monkeypatch.undo()
+    grade_files([str(source)], problem._replace(suite="other"), workers=1, scale=False, cache=cache)
+    assert len(cache) == 2
+
+
+class TestGradeCache:
+    """Test the on-disk grading cache."""
+
+    def test_key_covers_source_suite_and_settings(self):
+        key = GradeCache.key("code", "suite", {"fuel": 1})
+        assert key == GradeCache.key("code", "suite", {"fuel": 1})
+        assert len({key, GradeCache.key("code2", "suite", {"fuel": 1}),
+                    GradeCache.key("code", "suite2", {"fuel": 1}),
+                    GradeCache.key("code", "suite", {"fuel": 2})}) == 4
+
+    def test_round_trip_and_corrupt_entry(self, tmp_path):
+        from pyqt6_learning_labs.core.safe_exec import CaseResult
+
+        cache = GradeCache(tmp_path)
+        outcomes = [CaseResult("ok", (0, 1), 0.5, ops=10, peak_memory=100)]
+        cache.put("a", outcomes)
+        assert cache.get("a") == outcomes
+        assert type(cache.get("a")[0].value) is tuple
+        assert cache.get("missing") is None
+
+        (tmp_path / "a.pkl").write_bytes(b"not a pickle")
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_sandbox_errors_are_not_cacheable(self):
+        from pyqt6_learning_labs.core.grade_cache import cacheable
+        from pyqt6_learning_labs.core.safe_exec import CaseResult
+
+        raised = CaseResult("error", message="Error calling two_sum: ValueError: x")
+        crashed = CaseResult("error", message="Execution Error: WorkerCrashedError", sandbox_error=True)
+        assert cacheable([CaseResult("ok", 1), raised])
+        assert not cacheable([CaseResult("ok", 1), crashed])
+        assert not cacheable([CaseResult("timeout")])
+
+    def test_clock_dependent_scale_verdicts_are_not_cached(self):
+        from pyqt6_learning_labs.grade import _cacheable
+
+        record = {"tests": [{"verdict": "pass"}], "scale": [{"verdict": "pass"}, {"verdict": "pass"}]}
+        assert _cacheable(record)
+        assert _cacheable({"tests": record["tests"]})
+        for verdict in ("slow", "timeout", "skipped"):
+            assert not _cacheable(dict(record, scale=[{"verdict": "pass"}, {"verdict": verdict}]))
+
+    def test_unpicklable_value_is_skipped(self, tmp_path):
+        cache = GradeCache(tmp_path)
+        cache.put("a", lambda: None)
+        assert cache.get("a") is None and len(cache) == 0
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        import os
+
+        cache = GradeCache(tmp_path, max_bytes=3000)
+        for index, key in enumerate("abc"):
+            cache.put(key, b"x" * 900)
+            os.utime(tmp_path / f"{key}.pkl", (index, index))
+        assert cache.get("a") is not None  # Now the most recently used
+        cache.put("d", b"x" * 900)
+        assert [cache.get(key) is not None for key in "abcd"] == [True, False, True, True]
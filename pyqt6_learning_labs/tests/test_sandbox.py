@@ -0,0 +1,748 @@
+"""
+Tests for the sandbox execution backends.
+Run with: python -m pytest pyqt6_learning_labs/tests/test_sandbox.py -v
+"""
+import asyncio
+import importlib
+import math
+from multiprocessing.connection import wait
+
+import pytest
+
+from pyqt6_learning_labs.core.code_cache import CodeCache
+from pyqt6_learning_labs.core.sandbox_pool import SandboxPool
+
+# The module, not the safe_exec function re-exported by core
+se = importlib.import_module("pyqt6_learning_labs.core.safe_exec")
+
+
+ADD_CODE = """
+def add(a, b):
+    return a + b
+"""
+
+CYCLE_CODE = """
+class Node:
+    def __init__(self, val):
+        self.val = val
+        self.next = None
+
+def chain(cyclic):
+    head = Node(1)
+    head.next = Node(2)
+    if cyclic:
+        head.next.next = head
+    return head
+"""
+
+LOOP_CODE = """
+def spin():
+    while True:
+        pass
+"""
+
+
+def pair(value):
+    """arg_converter for tests; module-level so it pickles."""
+    return value, value
+
+
+def exited(worker, timeout=2.0):
+    """Wait for a worker process to die without reaping it (the pool does that)."""
+    return bool(wait([worker.process.sentinel], timeout))
+
+
+@pytest.fixture
+def process_backend():
+    se.configure_sandbox("process", pool_size=1, max_jobs_per_worker=3)
+    yield se._POOL
+    se.shutdown_sandbox()
+
+
+class TestProcessBackend:
+    """Test the pre-forked worker pool behind safe_exec."""
+
+    def test_function_result(self, process_backend):
+        success, result, message = se.safe_exec_function(ADD_CODE, "add", args=(2, 3))
+        assert success, message
+        assert result == 5
+
+    def test_exec_returns_picklable_namespace(self, process_backend):
+        success, message, namespace = se.safe_exec("result = 6 * 7\ndouble = lambda x: 2 * x")
+        assert success, message
+        assert namespace["result"] == 42
+        assert "double" not in namespace
+
+    def test_timeout_kills_and_replaces_worker(self, process_backend):
+        worker = process_backend._idle.queue[0]
+        success, _, message = se.safe_exec_function(LOOP_CODE, "spin", timeout=0.5)
+        assert not success
+        assert "timed out" in message
+
+        assert exited(worker)
+
+        # The replacement worker picks up the next job
+        success, result, _ = se.safe_exec_function(ADD_CODE, "add", args=(1, 1), timeout=5.0)
+        assert success and result == 2
+
+    def test_result_converter_runs_in_worker(self, process_backend):
+        code = "class Box:\n    pass\n\ndef make():\n    return Box()\n"
+        success, _, message = se.safe_exec_function(code, "make")
+        assert not success  # User-defined objects cannot leave the worker
+        assert "could not be returned" in message
+
+        success, result, message = se.safe_exec_function(code, "make", result_converter=repr)
+        assert success, message
+        assert "Box object" in result
+
+
+def test_worker_recycled_after_max_jobs():
+    pool = SandboxPool(size=1, max_jobs_per_worker=2)
+    try:
+        first = pool._idle.queue[0]
+        for _ in range(2):
+            pool.run("function", (ADD_CODE, "add", (1, 2), None, None, None, None, None), 5.0)
+        assert exited(first)
+        assert pool.run("function", (ADD_CODE, "add", (1, 2), None, None, None, None, None), 5.0)[1] == 3
+    finally:
+        pool.shutdown()
+
+
+def test_waiting_acquire_sees_shutdown_and_failed_replacements():
+    import threading
+
+    pool = SandboxPool(size=1)
+    try:
+        busy = pool.acquire()
+        outcome = []
+        waiter = threading.Thread(target=lambda: outcome.append(pool.acquire()), daemon=True)
+        waiter.start()
+        # As when the replacement for a killed worker could not be started
+        busy.kill()
+        with pool._lock:
+            pool._live -= 1
+        waiter.join(5.0)
+        assert not waiter.is_alive() and outcome[0].process.is_alive()
+        pool.release(outcome[0])
+
+        held = pool.acquire()
+        errors = []
+
+        def wait_for_worker():
+            try:
+                pool.acquire()
+            except RuntimeError as e:
+                errors.append(e)
+
+        waiter = threading.Thread(target=wait_for_worker, daemon=True)
+        waiter.start()
+        pool.shutdown()
+        waiter.join(5.0)
+        assert not waiter.is_alive() and "shut down" in str(errors[0])
+        pool.release(held)
+    finally:
+        pool.shutdown()
+
+
+COUNTER_CODE = """
+calls = []
+
+def count(x):
+    calls.append(x)
+    return len(calls)
+"""
+
+
+class TestSandboxedModule:
+    """Test the compile-once module handle."""
+
+    def test_calls_share_one_namespace(self):
+        with se.safe_exec_module(COUNTER_CODE) as module:
+            assert module.success, module.message
+            results = [module.call("count", args=(i,))[1] for i in range(3)]
+        assert results == [1, 2, 3]
+
+    def test_load_error_reported_by_every_call(self):
+        with se.safe_exec_module("import os") as module:
+            assert not module.success
+            success, _, message = module.call("anything")
+        assert not success
+        assert "Security Error" in message
+
+    def test_process_backend_reloads_after_timeout(self, process_backend):
+        with se.safe_exec_module(COUNTER_CODE + LOOP_CODE) as module:
+            assert module.call("count", args=(1,))[1] == 1
+            success, _, message = module.call("spin", timeout=0.5)
+            assert not success and "timed out" in message
+            # Fresh worker, fresh namespace
+            success, result, message = module.call("count", args=(1,), timeout=5.0)
+            assert success, message
+            assert result == 1
+
+
+SUITE_CODE = """
+def slow_double(x):
+    print("doubling", x)
+    if x < 0:
+        while True:
+            pass
+    if x == 0:
+        raise ValueError("zero")
+    return 2 * x
+"""
+
+
+class TestSafeExecSuite:
+    """Test batched test-suite execution."""
+
+    def test_structured_results(self):
+        results = se.safe_exec_suite(SUITE_CODE, "slow_double", [(1,), (0,), (3,)])
+        assert [r.status for r in results] == ["ok", "error", "ok"]
+        assert results[0].value == 2 and results[2].value == 6
+        assert results[0].stdout == "doubling 1\n"
+        assert "ValueError" in results[1].message
+
+    def test_process_backend_stops_one_case(self, process_backend):
+        results = se.safe_exec_suite(
+            SUITE_CODE, "slow_double", [(1,), (-1,), (2,)],
+            per_case_timeout=0.3, total_timeout=5.0
+        )
+        assert [r.status for r in results] == ["ok", "timeout", "ok"]
+        assert results[2].value == 4
+
+    def test_total_timeout_skips_remaining_cases(self):
+        results = se.safe_exec_suite(
+            SUITE_CODE, "slow_double", [(1,), (-1,), (2,), (3,)],
+            per_case_timeout=5.0, total_timeout=0.3
+        )
+        assert [r.status for r in results] == ["ok", "timeout", "skipped", "skipped"]
+
+
+class TestSuiteStreaming:
+    """Test streamed per-case results and cancellation of a suite."""
+
+    @pytest.fixture(params=["thread", "process"])
+    def backend(self, request):
+        se.configure_sandbox(request.param, pool_size=1)
+        yield request.param
+        se.shutdown_sandbox()
+
+    def test_results_stream_in_order(self, backend):
+        streamed = []
+        results = se.safe_exec_suite(
+            SUITE_CODE, "slow_double", [(1,), (0,), (3,)],
+            on_result=lambda index, result: streamed.append((index, result))
+        )
+        assert streamed == list(enumerate(results))
+
+    def test_cancel_skips_remaining_cases(self, backend):
+        import threading
+
+        token = se.CancelToken()
+        threading.Timer(0.3, token.cancel).start()
+        results = se.safe_exec_suite(
+            SUITE_CODE, "slow_double", [(1,), (-1,), (2,)],
+            per_case_timeout=10.0, total_timeout=20.0, fuel=10**9, cancel_token=token
+        )
+        assert [r.status for r in results] == ["ok", "skipped", "skipped"]
+        assert results[1].message == "Test run cancelled"
+
+    def test_arg_converter_builds_inputs_in_sandbox(self, backend):
+        results = se.safe_exec_suite(ADD_CODE, "add", [(2,), ("x",)], arg_converter=pair)
+        assert [r.value for r in results] == [4, "xx"]
+
+    def test_cyclic_result_fails_only_its_case(self, backend):
+        from pyqt6_learning_labs.apps.add_two_nums.logic import nodes_to_list
+
+        results = se.safe_exec_suite(
+            CYCLE_CODE, "chain", [(False,), (True,), (False,)], result_converter=nodes_to_list,
+            per_case_timeout=1.0, total_timeout=10.0
+        )
+        assert [r.status for r in results] == ["ok", "error", "ok"]
+        assert results[0].value == [1, 2]
+        assert "cycle" in results[1].message
+
+
+class TestScaleTier:
+    """Test the generated large inputs and their time budgets."""
+
+    def test_generated_two_sum_case_has_one_answer(self):
+        from pyqt6_learning_labs.apps.two_sum.logic import generate_two_sum_case, two_sum_reference
+
+        nums, target = generate_two_sum_case(1000, 7)
+        assert (nums, target) == generate_two_sum_case(1000, 7)
+        i, j = two_sum_reference(nums, target)
+        pairs = [(a, b) for a in range(len(nums)) for b in range(a + 1, len(nums)) if nums[a] + nums[b] == target]
+        assert pairs == [(i, j)]
+
+    def test_quadratic_submission_is_slow(self):
+        from pyqt6_learning_labs.apps.two_sum.logic import generate_two_sum_case, two_sum_reference
+        from pyqt6_learning_labs.core.benchmark import prepare_scale_cases, scale_timeout, scale_verdict
+
+        quadratic = (
+            "def two_sum(nums, target):\n"
+            "    for i in range(len(nums)):\n"
+            "        for j in range(i + 1, len(nums)):\n"
+            "            if nums[i] + nums[j] == target:\n"
+            "                return [i, j]\n"
+            "    return []\n"
+        )
+        cases = [(20_000, 1)]
+        prepared = prepare_scale_cases(cases, generate_two_sum_case, two_sum_reference)
+        timeout = scale_timeout(prepared)
+        outcome = se.safe_exec_suite(
+            quadratic, "two_sum", cases,
+            per_case_timeout=timeout, total_timeout=timeout + 1.0,
+            arg_converter=generate_two_sum_case
+        )[0]
+        verdict, line = scale_verdict(prepared[0], outcome)
+        assert verdict == "slow"
+        assert line.startswith("SCALE SLOW: n=20,000")
+
+
+class TestComplexityFit:
+    """Test fitting growth models to measured run times."""
+
+    SIZES = [250 * 2 ** k for k in range(8)]
+
+    @pytest.mark.parametrize("label, model", [
+        ("O(1)", lambda n: 1),
+        ("O(log n)", lambda n: n.bit_length()),
+        ("O(n)", lambda n: n),
+        ("O(n log n)", lambda n: n * math.log2(n)),
+        ("O(n²)", lambda n: n * n),
+    ])
+    def test_recovers_model_despite_noise(self, label, model):
+        from pyqt6_learning_labs.core.benchmark import fit_complexity
+
+        # Fixed +-4% jitter plus a constant call overhead
+        jitter = [1.04, 0.97, 1.01, 0.96, 1.03, 0.99, 1.02, 0.98]
+        top = model(self.SIZES[-1])
+        times = [(2e-6 + 1e-2 * model(n) / top) * j for n, j in zip(self.SIZES, jitter)]
+        fit = fit_complexity(self.SIZES, times)
+        assert fit.label == label
+        assert 0.0 <= fit.confidence <= 1.0
+
+    def test_cache_effects_do_not_read_as_n_log_n(self):
+        from pyqt6_learning_labs.core.benchmark import fit_complexity
+
+        # Linear, but each element gets slower as the input outgrows the caches
+        slowdown = [1.0, 1.01, 1.03, 1.06, 1.1, 1.15, 1.2, 1.3]
+        times = [1e-7 * n * s for n, s in zip(self.SIZES, slowdown)]
+        assert fit_complexity(self.SIZES, times).label == "O(n)"
+
+    def test_best_times_stop_at_first_unfinished_size(self):
+        from pyqt6_learning_labs.core.benchmark import best_times, complexity_cases, fit_complexity
+
+        sizes = [10, 20, 30]
+        cases = complexity_cases(sizes, warmup=1, repeats=2)
+        assert cases[:3] == [(10, 0), (10, 0), (10, 0)]
+
+        outcomes = [se.CaseResult("ok", elapsed=t) for t in (9.0, 2.0, 1.0, 9.0, 3.0, 4.0)]
+        outcomes += [se.CaseResult("timeout", elapsed=2.0), se.CaseResult("skipped")]
+        assert best_times(sizes, outcomes, warmup=1, repeats=2) == ([10, 20], [1.0, 3.0])
+        assert fit_complexity([10, 20], [1.0, 3.0]) is None
+
+
+class TestBenchmarkReport:
+    """Test the reference-vs-submission timing report."""
+
+    def test_timing_stats(self):
+        from pyqt6_learning_labs.core.benchmark import timing_stats
+
+        stats = timing_stats([float(t) for t in range(20, 0, -1)])
+        assert (stats.min, stats.median, stats.p95, stats.runs) == (1.0, 10.5, 19.0, 20)
+        assert timing_stats([3.0]) == (3.0, 3.0, 3.0, 1)
+
+    def test_report_rows_and_export(self, tmp_path):
+        import json
+        from pyqt6_learning_labs.core.benchmark import (
+            benchmark_report, benchmark_rows, complexity_cases, export_report, time_runs
+        )
+
+        sizes = [10, 20]
+        cases = complexity_cases(sizes, warmup=1, repeats=2)
+        reference = time_runs(lambda a, b: a + b, cases, lambda n, seed: (n, seed))
+        assert len(reference) == len(cases)
+
+        outcomes = [se.CaseResult("ok", elapsed=t) for t in (1.0, 0.2, 0.4)]
+        outcomes += [se.CaseResult("timeout", elapsed=2.0)] + [se.CaseResult("skipped")] * 2
+        reference = [9.0, 0.1, 0.1, 9.0, 0.5, 0.5]
+        rows = benchmark_rows(sizes, reference, outcomes, warmup=1, repeats=2)
+        assert rows[0].ratio == pytest.approx(3.0)
+        assert rows[1].submission is None and rows[1].ratio is None
+
+        path = tmp_path / "report.json"
+        export_report(benchmark_report("add", rows, se.sandbox_backend()), str(path))
+        saved = json.loads(path.read_text())
+        assert saved["backend"] == "thread"
+        assert saved["rows"][0]["reference"]["median"] == pytest.approx(0.1)
+        assert saved["rows"][1]["submission"] is None
+
+
+REUSES_INDEX = """
+def two_sum(nums, target):
+    for i in range(len(nums)):
+        for j in range(len(nums)):
+            if nums[i] + nums[j] == target:
+                return [i, j]
+    return []
+"""
+
+DROPS_CARRY = """
+def add_two_numbers(l1, l2):
+    dummy = tail = ListNode()
+    carry = 0
+    while l1 or l2:
+        total = (l1.val if l1 else 0) + (l2.val if l2 else 0) + carry
+        carry, digit = divmod(total, 10)
+        tail.next = tail = ListNode(digit)
+        l1 = l1.next if l1 else None
+        l2 = l2.next if l2 else None
+    return dummy.next
+"""
+
+
+class TestFuzz:
+    """Test randomized differential testing and shrinking."""
+
+    @pytest.fixture(params=["thread", "process"])
+    def backend(self, request):
+        se.configure_sandbox(request.param, pool_size=2)
+        yield request.param
+        se.shutdown_sandbox()
+
+    def test_correct_submission_passes(self, backend):
+        from pyqt6_learning_labs.apps.two_sum.config import TEMPLATE_CODE
+        from pyqt6_learning_labs.apps.two_sum.logic import TWO_SUM_FUZZ
+        from pyqt6_learning_labs.core.fuzz import run_fuzz
+
+        report = run_fuzz(TEMPLATE_CODE, TWO_SUM_FUZZ, cases=500, seed=7, batch_size=100)
+        assert (report.cases, report.failures, report.counterexample) == (500, 0, None)
+
+    def test_two_sum_failure_is_shrunk(self, backend):
+        from pyqt6_learning_labs.apps.two_sum.logic import TWO_SUM_FUZZ
+        from pyqt6_learning_labs.core.fuzz import run_fuzz
+
+        report = run_fuzz(REUSES_INDEX, TWO_SUM_FUZZ, cases=500, seed=7, batch_size=100)
+        assert report.failures > 0 and report.first_failure.seed is not None
+        nums, target = report.counterexample.args
+        assert len(nums) == 2 and "used twice" in report.counterexample.message
+        assert TWO_SUM_FUZZ.check((nums, target), report.counterexample.expected,
+                                  report.counterexample.actual) is not None
+
+    def test_add_two_numbers_failure_is_shrunk(self, backend):
+        from pyqt6_learning_labs.apps.add_two_nums.logic import ADD_TWO_NUMS_FUZZ
+        from pyqt6_learning_labs.core.fuzz import run_fuzz
+
+        report = run_fuzz(DROPS_CARRY, ADD_TWO_NUMS_FUZZ, cases=500, seed=7, batch_size=100)
+        assert report.counterexample.args in [([1], [9]), ([9], [1])]
+        assert report.counterexample.expected == [0, 1]
+
+    @pytest.mark.parametrize("body", [
+        "    nums.clear()\n    return []\n",
+        "    nums[0] = target - nums[1]\n    return [0, 1]\n",
+    ])
+    def test_mutating_submission_is_judged_on_original_input(self, backend, body):
+        from pyqt6_learning_labs.apps.two_sum.logic import TWO_SUM_FUZZ
+        from pyqt6_learning_labs.core.fuzz import run_fuzz
+
+        report = run_fuzz("def two_sum(nums, target):\n" + body, TWO_SUM_FUZZ,
+                          cases=200, seed=7, batch_size=50)
+        assert report.failures > 0
+        nums, target = report.first_failure.args
+        assert len(nums) >= 2 and report.first_failure.expected is not None
+
+    def test_runaway_input_is_a_failure(self):
+        from pyqt6_learning_labs.apps.two_sum.logic import TWO_SUM_FUZZ
+        from pyqt6_learning_labs.core.fuzz import run_fuzz
+
+        code = (
+            "def two_sum(nums, target):\n"
+            "    while len(nums) > 2:\n"
+            "        pass\n"
+            "    return [0, 1] if nums[0] + nums[1] == target else []\n"
+        )
+        report = run_fuzz(code, TWO_SUM_FUZZ, cases=50, seed=3, batch_size=25)
+        assert report.cases == 50
+        assert "fuel" in report.counterexample.message.lower()
+        assert len(report.counterexample.args[0]) == 3
+
+    def test_shrink_int(self):
+        from pyqt6_learning_labs.core.fuzz import shrink_int
+
+        assert shrink_int(10) == [0, 5, 9]
+        assert shrink_int(-3) == [0, -1, -2]
+        assert shrink_int(1) == [0]
+        assert shrink_int(0) == []
+
+
+class TestCodeCache:
+    """Test the source-hash cache of verdicts and compiled code."""
+
+    def test_unchanged_code_is_not_parsed_again(self, monkeypatch):
+        code = "def cached_fn():\n    return 'cached'\n"
+        first = se.compile_checked(code)
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("source was parsed again")
+
+        monkeypatch.setattr(se.ast, "parse", fail_parse)
+        assert se.compile_checked(code) is first
+
+    def test_rejected_code_stays_rejected(self):
+        for _ in range(2):
+            with pytest.raises(se.CodeSecurityError, match="not allowed"):
+                se.check_code_safety("import subprocess")
+
+    def test_lru_bound(self):
+        cache = CodeCache(max_entries=2)
+        for source in ("a = 1", "b = 2", "c = 3"):
+            cache.put(cache.key(source), (None, compile(source, "<test>", "exec")))
+        assert len(cache) == 2
+        assert cache.get(cache.key("a = 1")) is None
+
+    def test_key_covers_the_safety_rules(self, tmp_path):
+        source = "x = 1"
+        old, new = CodeCache(rules="v1"), CodeCache(rules="v2")
+        assert old.key(source) != new.key(source)
+        assert old.key(source) == CodeCache(rules="v1").key(source)
+
+        old.enable_disk(tmp_path, [source])
+        new.enable_disk(tmp_path, [source])
+        old.put(old.key(source), (None, compile(source, "<test>", "exec")))
+        assert new.get(new.key(source)) is None
+
+    def test_disk_cache_for_registered_sources(self, tmp_path):
+        template, other = "x = 40 + 2", "y = 1"
+        writer = CodeCache()
+        writer.enable_disk(tmp_path, [template])
+        for source in (template, other):
+            writer.put(writer.key(source), (None, compile(source, "<test>", "exec")))
+        assert len(list(tmp_path.iterdir())) == 1
+
+        reader = CodeCache()
+        reader.enable_disk(tmp_path, [template])
+        namespace = {}
+        exec(reader.get(reader.key(template))[1], namespace)
+        assert namespace["x"] == 42
+        assert reader.get(reader.key(other)) is None
+
+
+class TestOutputCapture:
+    """Test per-execution output capture."""
+
+    def test_ring_buffer_keeps_newest_output(self):
+        capture = se.OutputCapture(max_bytes=10)
+        for i in range(10):
+            capture.print(i)
+        text = capture.getvalue()
+        assert text.endswith("5\n6\n7\n8\n9\n")
+        assert "10 bytes of output dropped" in text
+
+    def test_print_loop_is_capped(self):
+        success, message, _ = se.safe_exec("for i in range(100000):\n    print('x' * 50)")
+        assert success
+        assert len(message) < se.MAX_OUTPUT_BYTES + 100
+
+    def test_concurrent_executions_keep_their_own_output(self):
+        import threading
+
+        outputs = {}
+
+        def run(tag):
+            code = f"for i in range(2000):\n    print('{tag}')"
+            outputs[tag] = se.safe_exec(code)[1]
+
+        threads = [threading.Thread(target=run, args=(tag,)) for tag in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for tag, output in outputs.items():
+            assert set(output.split()) == {tag}
+
+
+class TestFuelMetering:
+    """Test deterministic fuel metering."""
+
+    LOOP_N = "def loop(n):\n    total = 0\n    for i in range(n):\n        total += i\n    return total\n"
+
+    def test_ops_are_deterministic(self):
+        counts = {se.safe_exec_function(self.LOOP_N, "loop", args=(100,), fuel=10**6).ops for _ in range(3)}
+        assert len(counts) == 1
+        assert counts.pop() > 200
+
+    def test_budget_aborts_infinite_loop(self):
+        result = se.safe_exec_function(LOOP_CODE, "spin", fuel=10_000, timeout=5.0)
+        success, _, message = result
+        assert not success
+        assert "Fuel budget" in message
+        assert result.ops == 10_001
+
+    def test_suite_reports_ops_per_case(self, process_backend):
+        results = se.safe_exec_suite(self.LOOP_N, "loop", [(10,), (1000,)], fuel=10**6)
+        assert [r.status for r in results] == ["ok", "ok"]
+        assert results[0].ops < results[1].ops
+
+    def test_unmetered_results_have_no_ops(self):
+        assert se.safe_exec_function(ADD_CODE, "add", args=(1, 2)).ops is None
+
+
+class TestAllowedImports:
+    """Test the allowlisted, pre-imported modules."""
+
+    HEAP_CODE = """
+import heapq
+from collections import deque
+from bisect import bisect_left
+from typing import List
+
+def smallest(nums: List[int]):
+    heap = list(nums)
+    heapq.heapify(heap)
+    return heapq.heappop(heap), bisect_left(sorted(nums), 3), len(deque(nums))
+"""
+
+    def test_allowed_modules_import(self):
+        success, result, message = se.safe_exec_function(self.HEAP_CODE, "smallest", args=([5, 1, 3],))
+        assert success, message
+        assert result == (1, 1, 3)
+
+    def test_modules_are_served_from_cache(self, monkeypatch):
+        def fail_import(*args, **kwargs):
+            raise AssertionError("module was imported again")
+
+        monkeypatch.setattr(se.importlib, "import_module", fail_import)
+        assert se.safe_exec("import math\nx = math.isqrt(17)")[2]["x"] == 4
+
+    def test_unlisted_module_rejected(self):
+        with pytest.raises(se.CodeSecurityError, match="not available"):
+            se.check_code_safety("import string")
+
+    def test_private_attributes_hidden(self):
+        success, message, _ = se.safe_exec("from collections import _sys")
+        assert not success
+        assert "ImportError" in message
+
+
+class TestMemoryLimit:
+    """Test the per-execution memory ceiling."""
+
+    MB = 1024 * 1024
+    GROW_CODE = "def grow(n):\n    rows = []\n    for i in range(n):\n        rows.append([0] * 100)\n    return len(rows)\n"
+
+    def test_peak_memory_reported(self):
+        result = se.safe_exec_function(self.GROW_CODE, "grow", args=(1000,), memory_limit=64 * self.MB)
+        assert result[0], result[2]
+        assert 800 * 1000 < result.peak_memory < 64 * self.MB
+
+    def test_gradual_growth_stopped(self):
+        success, _, message = se.safe_exec_function(
+            self.GROW_CODE, "grow", args=(10**6,), memory_limit=8 * self.MB, timeout=20.0
+        )
+        assert not success
+        assert "Memory limit of 8 MB exceeded" in message
+
+    def test_single_allocation_stopped_in_worker(self, process_backend):
+        success, _, message = se.safe_exec_function(
+            "def big(n):\n    return len([0] * n)\n", "big", args=(10**9,), memory_limit=32 * self.MB
+        )
+        assert not success
+        assert "Memory limit" in message
+        # The worker's limit is lifted again after the job
+        assert se.safe_exec_function(ADD_CODE, "add", args=(1, 2))[1] == 3
+
+    def test_suite_reports_peak_per_case(self):
+        results = se.safe_exec_suite(
+            self.GROW_CODE, "grow", [(10,), (1000,), (10**6,)], memory_limit=8 * self.MB
+        )
+        assert [r.status for r in results] == ["ok", "ok", "error"]
+        assert results[0].peak_memory < results[1].peak_memory
+
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_measure_memory_without_limit(self, backend, monkeypatch):
+        se.configure_sandbox(backend, pool_size=1)
+        try:
+            def no_tracing(*args):
+                raise AssertionError("lines were traced")
+
+            monkeypatch.setattr(se._Meter, "_trace_calls", no_tracing)
+            results = se.safe_exec_suite(self.GROW_CODE, "grow", [(100,), (10**4,)], measure_memory=True)
+        finally:
+            se.shutdown_sandbox()
+        assert [r.status for r in results] == ["ok", "ok"]
+        assert results[0].ops is None
+        assert 80 * 100 < results[0].peak_memory < results[1].peak_memory
+        assert results[1].peak_memory > 800 * 10**4
+
+    def test_format_bytes(self):
+        from pyqt6_learning_labs.core.benchmark import format_bytes
+
+        assert [format_bytes(size) for size in (512, 1536, 3 * self.MB)] == ["512 B", "1.5 KB", "3.0 MB"]
+
+
+class TestLineProfile:
+    """Test per-line hit counts and timings from safe_exec_suite(profile=True)."""
+
+    PAIRS_CODE = "def pairs(n):\n    count = 0\n    for i in range(n):\n        for j in range(n):\n            count += 1\n    return count\n"
+
+    @pytest.mark.parametrize("backend", ["thread", "process"])
+    def test_hit_counts_per_line(self, backend):
+        se.configure_sandbox(backend, pool_size=1)
+        try:
+            results = se.safe_exec_suite(self.PAIRS_CODE, "pairs", [(10,), (20,)], profile=True)
+        finally:
+            se.shutdown_sandbox()
+        assert [r.value for r in results] == [100, 400]
+        profile = results[0].line_profile
+        assert {line: hits for line, (hits, _) in profile.items()} == {2: 1, 3: 11, 4: 110, 5: 100, 6: 1}
+        assert all(seconds >= 0 for _, seconds in profile.values())
+
+    def test_profile_kept_when_fuel_runs_out(self):
+        result = se.safe_exec_suite(self.PAIRS_CODE, "pairs", [(1000,)], fuel=5000, profile=True)[0]
+        assert result.status == "timeout"
+        assert result.line_profile[5][0] > 1000
+
+    def test_unprofiled_results_have_no_profile(self):
+        assert se.safe_exec_suite(self.PAIRS_CODE, "pairs", [(3,)])[0].line_profile is None
+
+    def test_merge_and_rank(self):
+        from pyqt6_learning_labs.core.benchmark import hot_lines, merge_line_profiles
+
+        merged = merge_line_profiles([{2: (1, 0.5), 3: (4, 0.25)}, None, {3: (2, 1.0)}])
+        assert merged == {2: (1, 0.5), 3: (6, 1.25)}
+        assert hot_lines(merged) == [(3, 6, 1.25), (2, 1, 0.5)]
+        assert hot_lines(merged, count=1) == [(3, 6, 1.25)]
+
+
+class TestAsyncApi:
+    """Test the coroutine versions of the sandbox entry points."""
+
+    def test_concurrent_calls(self, process_backend):
+        async def main():
+            return await asyncio.gather(*(
+                se.safe_exec_function_async(ADD_CODE, "add", args=(i, i)) for i in range(4)
+            ))
+
+        results = asyncio.run(main())
+        assert [result[1] for result in results] == [0, 2, 4, 6]
+
+    def test_cancel_kills_worker(self, process_backend):
+        worker = process_backend._idle.queue[0]
+
+        async def main():
+            task = asyncio.ensure_future(se.safe_exec_function_async(LOOP_CODE, "spin", timeout=30.0))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert exited(worker)
+        assert se.safe_exec_function(ADD_CODE, "add", args=(1, 2))[1] == 3
+
+    def test_thread_backend(self):
+        results = asyncio.run(se.safe_exec_suite_async(SUITE_CODE, "slow_double", [(1,), (2,)]))
+        assert [r.value for r in results] == [2, 4]
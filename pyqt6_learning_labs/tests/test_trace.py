@@ -0,0 +1,260 @@
+"""
+Tests for the playground trace events.
+Run with: python -m pytest pyqt6_learning_labs/tests/test_trace.py -v
+"""
+import gzip
+import random
+import pytest
+from functools import partial
+from itertools import islice
+
+from pyqt6_learning_labs.apps.add_two_nums.config import FLOWCHART_NODES as ADD_TWO_NODES
+from pyqt6_learning_labs.apps.add_two_nums.logic import (
+    add_two_numbers_logic, add_two_nums_keyframe, add_two_nums_trace, describe_add_two_nums_event
+)
+from pyqt6_learning_labs.apps.two_sum.config import FLOWCHART_NODES as TWO_SUM_NODES
+from pyqt6_learning_labs.apps.two_sum.logic import (
+    describe_two_sum_event, two_sum_keyframe, two_sum_logic, two_sum_trace, two_sum_trace_length
+)
+from pyqt6_learning_labs.core.trace import TraceEvent, TraceStream, preview_list
+from pyqt6_learning_labs.core.safe_exec import CancelToken
+from pyqt6_learning_labs.core.trace_file import PROGRESS_INTERVAL, TraceReader, trace_file_format, write_trace
+
+
+class TestTraceEvents:
+    """Test the events emitted by the logic functions and their text."""
+
+    def test_two_sum_steps(self):
+        indices, events = two_sum_logic([2, 7, 11, 15], 9)
+        assert indices == [0, 1]
+        assert [describe_two_sum_event(event) for event in events] == [
+            "Target: 9",
+            "Input: [2, 7, 11, 15]",
+            "Index 0: value=2, need=7",
+            "Store 2 -> 0 in dictionary (1 entry)",
+            "Index 1: value=7, need=2",
+            "Found complement! seen[2]=0 so return [0, 1]",
+        ]
+        assert describe_two_sum_event(two_sum_logic([1, 2], 10)[1][-1]) == "No pair found that sums to the target."
+
+    def test_add_two_numbers_steps(self):
+        result, events = add_two_numbers_logic([9, 9], [1])
+        assert result == [0, 0, 1]
+        assert events[3] == TraceEvent("add", 0, (9, 1, 0), (0, 1), "read")
+        assert describe_add_two_nums_event(events[3]) == (
+            "Step 0: v1=9, v2=1, carry in=0, total=10, write digit=0, carry out=1"
+        )
+        assert describe_add_two_nums_event(events[-1]) == "Result digits (reverse order): [0, 0, 1]"
+
+    def test_events_carry_flowchart_nodes(self):
+        _, events = two_sum_logic([3, 2, 4], 6)
+        assert [event.node for event in events] == [
+            "start", "start", "loop", "store", "loop", "store", "loop", "return"
+        ]
+        assert two_sum_logic([1, 2], 10)[1][-1].node == "check"
+        assert all(event.node in TWO_SUM_NODES for event in events)
+
+        _, events = add_two_numbers_logic([9, 9], [1])
+        assert [event.node for event in events] == ["start", "start", "start", "read", "read", "read", "done"]
+        assert all(event.node in ADD_TWO_NODES for event in events)
+
+    def test_events_do_not_copy_state(self):
+        # Every step is a small tuple, whatever the size of the seen map
+        _, events = two_sum_logic(list(range(0, 20_000, 2)), -1)
+        assert all(not isinstance(field, (dict, list)) for event in events[2:] for field in event)
+
+
+    def test_generators_start_without_walking_the_input(self):
+        nums = list(range(1_000_000))
+        first = list(islice(two_sum_trace(nums, -1), 4))
+        assert [event.kind for event in first] == ["target", "input", "visit", "store"]
+        assert describe_two_sum_event(first[1]).endswith("... (1,000,000 items)]")
+        assert [event.kind for event in islice(add_two_nums_trace(nums, nums), 4)] == [
+            "input_a", "input_b", "base", "add"
+        ]
+
+    def test_trace_length_estimate(self):
+        nums = [1, 2, 3]
+        assert len(list(two_sum_trace(nums, -1))) == two_sum_trace_length(nums)
+
+    def test_resuming_from_keyframes_matches_the_full_trace(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            nums = [rng.randint(-5, 5) for _ in range(rng.randint(0, 20))]
+            target = rng.randint(-6, 6)
+            events = list(two_sum_trace(nums, target))
+            for step, event in enumerate(events):
+                state = two_sum_keyframe(event)
+                if state is not None:
+                    assert list(two_sum_trace(nums, target, state)) == events[step + 1:]
+
+            l1 = [rng.randint(0, 9) for _ in range(rng.randint(0, 8))]
+            l2 = [rng.randint(0, 9) for _ in range(rng.randint(0, 8))]
+            events = list(add_two_nums_trace(l1, l2))
+            for step, event in enumerate(events):
+                state = add_two_nums_keyframe(event)
+                if state is not None:
+                    assert list(add_two_nums_trace(l1, l2, 10, state)) == events[step + 1:]
+
+    def test_preview_list(self):
+        assert preview_list([1, 2]) == "[1, 2]"
+        assert preview_list(list(range(5)), limit=2) == "[0, 1, ... (5 items)]"
+
+
+class TestTraceStream:
+    """Test producing and rendering steps on demand."""
+
+    @staticmethod
+    def _stream(count, rendered=None, **kwargs):
+        def describe(event):
+            if rendered is not None:
+                rendered.append(event.index)
+            return f"step {event.index}"
+
+        events = (TraceEvent("visit", index) for index in range(count))
+        return TraceStream(events, describe, expected=count, **kwargs)
+
+    def test_produces_up_to_the_lookahead(self):
+        rendered = []
+        trace = self._stream(1000, rendered, lookahead=5)
+        assert trace.produced == 0 and trace.total is None and trace.estimate == 1000
+        assert trace.available(0)
+        assert trace.produced == 6
+        assert trace.texts(0, 3) == ["step 0", "step 1", "step 2"]
+        assert trace.text(0) == "step 0"
+        assert rendered == [0, 1, 2]
+
+    def test_history_is_bounded(self):
+        trace = self._stream(1000, lookahead=5, history=10)
+        assert trace.available(100)
+        assert trace.first_kept == 90
+        assert trace.kept(90) and not trace.kept(89)
+        assert trace.event(100).index == 100
+
+    def test_seek_replays_from_a_keyframe(self):
+        nums = list(range(0, 40_000, 2))
+        resume = partial(two_sum_trace, nums, -1)
+        trace = TraceStream(
+            resume(None), describe_two_sum_event, lookahead=5, history=100,
+            resume=resume, keyframe=two_sum_keyframe, keyframe_interval=1000
+        )
+        assert trace.run_to_end() == 40_003
+        assert trace.final.kind == "not_found" and trace.total == 40_003
+        assert 30 <= len(trace.keyframes) <= 41
+
+        assert trace.seek(25_001)
+        assert trace.text(25_001) == "Store 24998 -> 12499 in dictionary (12500 entries)"
+        assert 24_000 < trace.first_kept <= 25_001
+        assert trace.seek(3) and trace.text(3) == "Store 0 -> 0 in dictionary (1 entry)"
+        assert trace.seek(0) and trace.text(0) == "Target: -1"
+        assert not trace.seek(40_003)
+        assert trace.total == 40_003
+
+    def test_seek_without_resume_stays_in_the_kept_steps(self):
+        trace = self._stream(1000, lookahead=5, history=10)
+        assert trace.seek(500)
+        assert not trace.seek(100)
+        assert trace.seek(990)
+
+    def test_seek_past_end_keeps_the_last_steps(self):
+        trace = self._stream(1000, lookahead=5, history=10)
+        assert trace.seek(5)
+        assert not trace.seek(5000)
+        assert trace.produced == 1000 and trace.first_kept == 990
+        assert trace.text(999) == "step 999"
+
+    def test_run_to_end(self):
+        trace = self._stream(1000, lookahead=5, history=10)
+        assert trace.run_to_end() == 1000
+        assert trace.exhausted and trace.total == 1000
+        assert trace.first_kept == 990
+        assert not trace.available(1000)
+        assert trace.text(999) == "step 999"
+
+
+class TestTraceFile:
+    """Test saving traces to disk and replaying them."""
+
+    @pytest.mark.parametrize("name", ["t.trace", "t.trace.gz", "t.jsonl", "t.jsonl.gz"])
+    def test_round_trip(self, tmp_path, name):
+        path = tmp_path / name
+        nums = list(range(0, 4000, 4)) + [1, 5]
+        events = list(two_sum_trace(nums, 6))
+        assert write_trace(str(path), two_sum_trace(nums, 6), "two_sum") == len(events)
+
+        with TraceReader(str(path)) as reader:
+            assert reader.problem == "two_sum"
+            assert reader.seekable == (name == "t.trace")
+            assert reader.steps == (len(events) if name == "t.trace" else None)
+            loaded = list(reader.events())
+            assert [describe_two_sum_event(event) for event in loaded] == [
+                describe_two_sum_event(event) for event in events
+            ]
+            assert loaded[-1] == TraceEvent("found", 1001, 5, (1, 1000), "return")
+            assert list(reader.events()) == loaded  # Replays from the start again
+
+    def test_mapped_file_seeks_from_offsets(self, tmp_path):
+        path = str(tmp_path / "t.trace")
+        nums = list(range(0, 20_000, 2))
+        write_trace(path, two_sum_trace(nums, -1), "two_sum")
+        expected = [describe_two_sum_event(event) for event in two_sum_trace(nums, -1)]
+
+        with TraceReader(path) as reader:
+            trace = TraceStream(
+                reader.events(), describe_two_sum_event, lookahead=5, history=100,
+                resume=reader.events, keyframe=reader.keyframe, keyframe_interval=1000
+            )
+            assert trace.run_to_end() == len(expected)
+            assert len(trace.keyframes) > 10
+            for step in (15_001, 7, 0, len(expected) - 1):
+                assert trace.seek(step)
+                assert trace.text(step) == expected[step]
+
+    def test_truncated_binary_file_ends_early(self, tmp_path):
+        path = tmp_path / "t.trace"
+        write_trace(str(path), two_sum_trace([1, 2, 3], 100), "two_sum")
+        path.write_bytes(path.read_bytes()[:-3])
+        with TraceReader(str(path)) as reader:
+            assert [event.kind for event in reader.events()][-1] == "store"
+
+    @pytest.mark.parametrize("name", ["t.trace", "t.trace.gz", "t.jsonl"])
+    def test_corrupt_record_raises_value_error(self, tmp_path, name):
+        path = tmp_path / name
+        write_trace(str(path), two_sum_trace(list(range(50)), -1), "two_sum")
+        if name == "t.jsonl":
+            lines = path.read_bytes().splitlines(keepends=True)
+            lines[10] = b"not json\n"
+            path.write_bytes(b"".join(lines))
+        else:
+            raw = gzip.decompress(path.read_bytes()) if name.endswith(".gz") else path.read_bytes()
+            middle = raw.index(b'["', len(raw) // 2)
+            raw = raw[:middle] + b"X" + raw[middle + 1:]
+            path.write_bytes(gzip.compress(raw) if name.endswith(".gz") else raw)
+
+        with TraceReader(str(path)) as reader:
+            events = reader.events()
+            assert next(events).kind == "target"
+            with pytest.raises(ValueError, match="Corrupt trace file"):
+                list(events)
+
+    def test_write_reports_progress_and_cancels(self, tmp_path):
+        nums = list(range(0, 4 * PROGRESS_INTERVAL, 2))
+        path = tmp_path / "t.trace"
+        progress = []
+        count = write_trace(str(path), two_sum_trace(nums, -1), "two_sum", on_progress=progress.append)
+        assert progress == list(range(PROGRESS_INTERVAL, count + 1, PROGRESS_INTERVAL))
+
+        token = CancelToken()
+        token.cancel()
+        path = tmp_path / "cancelled.jsonl"
+        assert write_trace(str(path), two_sum_trace(nums, -1), "two_sum", cancel_token=token) == PROGRESS_INTERVAL
+        assert not path.exists()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "notes.jsonl"
+        path.write_text('{"hello": 1}\n')
+        with pytest.raises(ValueError):
+            TraceReader(str(path))
+        with pytest.raises(ValueError):
+            trace_file_format("trace.txt")
+        assert trace_file_format("T.JSONL.GZ") == (False, True)
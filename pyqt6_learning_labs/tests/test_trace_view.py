@@ -0,0 +1,77 @@
+"""
+Tests for the playground trace box.
+Run with: python -m pytest pyqt6_learning_labs/tests/test_trace_view.py -v
+"""
+import sys
+import pytest
+
+# Skip if PyQt6 not available
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtWidgets import QApplication
+
+from pyqt6_learning_labs.core.constants import Playground
+from pyqt6_learning_labs.core.trace import TraceEvent, TraceStream
+from pyqt6_learning_labs.widgets.trace_view import TraceView
+
+# Create QApplication if needed
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def make_trace(count, rendered=None):
+    def describe(event):
+        if rendered is not None:
+            rendered.append(event.index)
+        return f"step {event.index}"
+
+    trace = TraceStream((TraceEvent("visit", index) for index in range(count)), describe)
+    trace.run_to_end()
+    return trace
+
+
+class TestTraceView:
+    """Test incremental updates and the switch to a list view."""
+
+    def test_steps_append_and_remove_the_last_line(self):
+        view = TraceView()
+        trace = make_trace(10)
+        view.show_steps(trace, 0, 2)
+        document = view.text_view.document()
+        first_block = document.firstBlock()
+
+        view.show_steps(trace, 0, 3)
+        assert view.toPlainText() == "step 0\nstep 1\nstep 2"
+        assert document.firstBlock() == first_block  # Appended, not rebuilt
+
+        view.show_steps(trace, 0, 2)
+        assert view.toPlainText() == "step 0\nstep 1"
+        view.show_steps(trace, 0, 5)  # Several steps in one auto-play frame
+        assert view.toPlainText() == "step 0\nstep 1\nstep 2\nstep 3\nstep 4"
+        assert document.firstBlock() == first_block
+        view.show_steps(trace, 0, 2)
+        assert view.toPlainText() == "step 0\nstep 1"
+        view.show_steps(trace, 0, 1)
+        view.show_steps(trace, 0, 0)
+        assert view.toPlainText() == ""
+        assert not view.virtualized
+
+    def test_long_traces_only_render_visible_rows(self):
+        rendered = []
+        count = Playground.TRACE_TEXT_LINES * 5
+        trace = make_trace(count, rendered)
+        view = TraceView()
+        view.resize(400, 300)
+        view.show()
+        view.show_steps(trace, 0, count)
+        app.processEvents()
+
+        assert view.virtualized
+        assert view.model.rowCount() == count
+        assert 0 < len(rendered) < 200
+
+        view.show_steps(trace, 0, count - 1)
+        assert view.model.rowCount() == count - 1
+        assert view.virtualized  # Stays a list until cleared
+
+        view.clear()
+        assert not view.virtualized and view.model.rowCount() == 0
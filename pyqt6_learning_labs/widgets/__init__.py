@@ -2,19 +2,31 @@
 Reusable widget components for PyQt6 Learning Labs.
 """
 
+from pyqt6_learning_labs.widgets.benchmark_panel import BenchmarkPanel
 from pyqt6_learning_labs.widgets.code_editor import CodeEditor, PythonHighlighter
-from pyqt6_learning_labs.widgets.complexity import ComplexityWidget, SimplePlotWidget
+from pyqt6_learning_labs.widgets.code_lab import CodeLab, CodeLabProblem
+from pyqt6_learning_labs.widgets.complexity import ComplexityWidget, SimplePlotWidget, MemoryCurveWidget
 from pyqt6_learning_labs.widgets.flowchart import FlowchartWidget, FlowchartNode
 from pyqt6_learning_labs.widgets.lesson import LessonWidget
+from pyqt6_learning_labs.widgets.test_runner import SuiteRunner, FuzzRunner, TraceWriter
+from pyqt6_learning_labs.widgets.trace_view import TraceView, TraceModel
 
 __all__ = [
+    # Benchmark
+    'BenchmarkPanel',
+
     # Code Editor
     'CodeEditor',
     'PythonHighlighter',
 
+    # Code Lab
+    'CodeLab',
+    'CodeLabProblem',
+
     # Complexity
     'ComplexityWidget',
     'SimplePlotWidget',
+    'MemoryCurveWidget',
 
     # Flowchart
     'FlowchartWidget',
@@ -22,4 +34,13 @@ __all__ = [
 
     # Lesson
     'LessonWidget',
+
+    # Test runner
+    'SuiteRunner',
+    'FuzzRunner',
+    'TraceWriter',
+
+    # Trace view
+    'TraceView',
+    'TraceModel',
 ]
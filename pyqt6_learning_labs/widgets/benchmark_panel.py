@@ -0,0 +1,118 @@
+from typing import Any, Dict, Optional
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+
+from pyqt6_learning_labs.core.benchmark import export_report, format_seconds
+from pyqt6_learning_labs.core.constants import Colors
+
+
+class BenchmarkPanel(QWidget):
+    """
+    Table of reference vs submission timings per input size.
+
+    Shows a report from core.benchmark.benchmark_report() and exports it
+    as JSON. Hidden until the first report arrives.
+    """
+
+    COLUMNS = [
+        "n", "Reference min", "Reference median", "Reference p95",
+        "Yours min", "Yours median", "Yours p95", "Ratio",
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.report: Optional[Dict[str, Any]] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        header_layout = QHBoxLayout()
+        self.summary = QLabel()
+        self.summary.setWordWrap(True)
+        self.summary.setStyleSheet(f"color: {Colors.TEXT_SECONDARY};")
+        header_layout.addWidget(self.summary, 1)
+
+        self.export_btn = QPushButton("Export JSON")
+        self.export_btn.clicked.connect(self.export_json)
+        self.export_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.export_btn.setAccessibleName("Save the benchmark report as JSON")
+        header_layout.addWidget(self.export_btn)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setMaximumHeight(150)
+        self.table.setStyleSheet(f"""
+            QTableWidget {{
+                background-color: {Colors.BG_MEDIUM};
+                color: {Colors.TEXT_PRIMARY};
+                gridline-color: {Colors.ACCENT_TERTIARY};
+                border: 1px solid {Colors.ACCENT_TERTIARY};
+                font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {Colors.BG_CARD};
+                color: {Colors.TEXT_SECONDARY};
+                border: none;
+                padding: 4px;
+                font-size: 11px;
+            }}
+        """)
+        layout.addWidget(self.table)
+
+        self.hide()
+
+    def show_report(self, report: Dict[str, Any]):
+        self.report = report
+        rows = report["rows"]
+        self.table.setRowCount(len(rows))
+
+        for index, row in enumerate(rows):
+            reference, submission = row["reference"], row["submission"]
+            cells = [f"{row['n']:,}"]
+            cells += [format_seconds(reference[key]) for key in ("min", "median", "p95")]
+            if submission is None:
+                cells += ["did not finish"] * 3 + ["-"]
+            else:
+                cells += [format_seconds(submission[key]) for key in ("min", "median", "p95")]
+                cells.append(f"{row['ratio']:.2f}x")
+
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.table.setItem(index, column, item)
+
+            if row["ratio"] is not None:
+                color = Colors.SUCCESS if row["ratio"] <= 1.5 else Colors.WARNING
+                self.table.item(index, len(cells) - 1).setForeground(QColor(color))
+
+        finished = [row for row in rows if row["ratio"] is not None]
+        if finished:
+            largest = finished[-1]
+            self.summary.setText(
+                f"At n={largest['n']:,} your median time is {largest['ratio']:.2f}x the reference's "
+                f"({report['backend']} backend, Python {report['python']})."
+            )
+        else:
+            self.summary.setText("Your code did not finish any size within the time limit.")
+        self.show()
+
+    def export_json(self):
+        if self.report is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Benchmark Report",
+            f"{self.report['problem']}-benchmark.json",
+            "JSON files (*.json)"
+        )
+        if path:
+            export_report(self.report, path)
@@ -1,10 +1,12 @@
-from PyQt6.QtCore import Qt, QRegularExpression, QSize, QEvent, QTimer, QRect
+from typing import Dict, Optional, Tuple
+from PyQt6.QtCore import Qt, QRegularExpression, QSize, QEvent, QTimer, QRect, QPoint
 from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QPainter, QTextCursor, QShortcut, QKeySequence
 from PyQt6.QtWidgets import (
     QPlainTextEdit, QTextEdit, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QCompleter, QPushButton, QApplication
+    QLabel, QCompleter, QPushButton, QApplication, QToolTip
 )
 
+from pyqt6_learning_labs.core.benchmark import format_seconds
 from pyqt6_learning_labs.core.constants import Colors, Timing
 
 
@@ -83,14 +85,33 @@ class LineNumberArea(QWidget):
     def paintEvent(self, event):
         self.code_editor.lineNumberAreaPaintEvent(event)
 
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            text = self.code_editor.line_profile_tooltip(event.pos().y())
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+
 
 class CodeEditor(QWidget):
     """
     A reusable code editor widget with syntax highlighting, real-time linting,
     line numbers, auto-completion, and copy functionality.
+
+    set_line_profile() paints a heat strip beside the line numbers.
     """
+    HEAT_GUTTER_WIDTH = 6
+
     def __init__(self, initial_text: str = ""):
         super().__init__()
+        self._line_profile: Dict[int, Tuple[int, float]] = {}
+        self._hottest = 0.0
+        self._profile_total = 0.0
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(8)
@@ -214,6 +235,8 @@ class CodeEditor(QWidget):
 
         self.editor.textChanged.connect(self._schedule_lint)
         self.editor.textChanged.connect(self._schedule_completion)
+        # Line numbers shift as the code is edited
+        self.editor.textChanged.connect(self.clear_line_profile)
 
         # Initial lint
         self._do_lint()
@@ -298,6 +321,8 @@ class CodeEditor(QWidget):
             max_value //= 10
             digits += 1
         space = 3 + self.editor.fontMetrics().horizontalAdvance('9') * digits
+        if self._line_profile:
+            space += self.HEAT_GUTTER_WIDTH + 2
         return space
 
     def update_line_number_area_width(self, _):
@@ -326,6 +351,8 @@ class CodeEditor(QWidget):
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
+                if self._line_profile:
+                    self._paint_heat(painter, block_number + 1, top, bottom - top)
                 number = str(block_number + 1)
                 painter.setPen(QColor(Colors.TEXT_MUTED))
                 painter.drawText(0, top, self.line_number_area.width() - 2, self.editor.fontMetrics().height(),
@@ -335,6 +362,46 @@ class CodeEditor(QWidget):
             bottom = top + round(self.editor.blockBoundingRect(block).height())
             block_number += 1
 
+    def _paint_heat(self, painter: QPainter, line: int, top: int, height: int):
+        stats = self._line_profile.get(line)
+        if stats is None:
+            return
+        heat = stats[1] / self._hottest if self._hottest > 0 else 0.0
+        color = QColor(Colors.ERROR)
+        color.setAlphaF(0.2 + 0.8 * heat)
+        painter.fillRect(0, top, self.HEAT_GUTTER_WIDTH, height, color)
+
+    # --- Line Profile ---
+    def set_line_profile(self, profile: Dict[int, Tuple[int, float]]):
+        """
+        Show per-line (hits, seconds) as a heat strip; hovering it shows the
+        figures. Cleared as soon as the code is edited.
+        """
+        self._line_profile = dict(profile)
+        self._hottest = max((seconds for _, seconds in self._line_profile.values()), default=0.0)
+        self._profile_total = sum(seconds for _, seconds in self._line_profile.values())
+        self.update_line_number_area_width(0)
+        self.line_number_area.update()
+
+    def clear_line_profile(self):
+        if not self._line_profile:
+            return
+        self._line_profile = {}
+        self.update_line_number_area_width(0)
+        self.line_number_area.update()
+
+    def line_profile_tooltip(self, y: int) -> Optional[str]:
+        """Profile figures of the line at height y of the line number area."""
+        if not self._line_profile:
+            return None
+        line = self.editor.cursorForPosition(QPoint(0, y)).blockNumber() + 1
+        stats = self._line_profile.get(line)
+        if stats is None:
+            return f"Line {line}: not run"
+        hits, seconds = stats
+        share = seconds / self._profile_total if self._profile_total > 0 else 0.0
+        return f"Line {line}: {hits:,} hits, {format_seconds(seconds)} ({share:.0%} of the time)"
+
     def highlight_current_line(self):
         extra_selections = []
         if not self.editor.isReadOnly():
@@ -0,0 +1,615 @@
+"""
+The Code Lab tab shared by the problem apps.
+
+A CodeLab runs a submission in the sandbox: the test cases and then the
+scale tier with its memory pass, complexity measurement, the benchmark
+against the reference, fuzzing and line profiling. Everything that differs
+between problems comes from a CodeLabProblem.
+"""
+import copy
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QTextEdit, QHBoxLayout, QProgressBar
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from pyqt6_learning_labs.widgets.benchmark_panel import BenchmarkPanel
+from pyqt6_learning_labs.widgets.code_editor import CodeEditor
+from pyqt6_learning_labs.widgets.complexity import MemoryCurveWidget
+from pyqt6_learning_labs.widgets.test_runner import SuiteRunner, FuzzRunner
+from pyqt6_learning_labs.core.benchmark import (
+    prepare_scale_cases, scale_timeout, scale_verdict, COMPLEXITY_MIN_CONFIDENCE,
+    complexity_cases, best_times, fit_complexity, format_seconds, format_bytes, time_runs, benchmark_rows, benchmark_report, merge_line_profiles, hot_lines
+)
+from pyqt6_learning_labs.core.constants import Colors, Sandbox
+from pyqt6_learning_labs.core.fuzz import FuzzSpec
+from pyqt6_learning_labs.core.grade_cache import cacheable, grade_cache, sandbox_settings, suite_version
+from pyqt6_learning_labs.core.safe_exec import sandbox_backend
+
+
+class CodeLabProblem(NamedTuple):
+    """What the Code Lab needs to know about one problem."""
+    func_name: str
+    signature: str  # For the header, e.g. "two_sum(nums, target)"
+    instructions: str
+    template: str
+    test_cases: List[tuple]  # (*inputs, expected)
+    case_separator: str  # Between a test's inputs in the results, e.g. ", "
+    arg_names: Tuple[str, ...]  # Names of a fuzzing input's parts
+    scale_cases: List[Tuple[int, int]]  # (n, seed) inputs for the scale tier
+    complexity_sizes: List[int]
+    expected_complexity: str  # ComplexityFit label of the intended solution
+    benchmark_sizes: List[int]
+    profile_cases: List[Tuple[int, int]]  # (n, seed) inputs for the line profiler
+    generate: Callable[[int, int], tuple]  # (n, seed) -> call arguments
+    reference: Callable[..., Any]
+    fuzz: FuzzSpec
+    report_name: str  # Problem name in benchmark reports, e.g. "two-sum"
+    to_args: Optional[Callable[..., tuple]] = None  # A test's inputs -> call arguments; a copy if None
+    to_expected: Optional[Callable[[Any], Any]] = None  # Reference answer -> comparable value
+    namespace: Optional[Dict[str, Any]] = None
+    result_converter: Optional[Callable[[Any], Any]] = None
+
+
+class CodeLab(QWidget):
+    """Editor and sandbox runs for one CodeLabProblem."""
+
+    complexity_measured = pyqtSignal(object, object, object)  # Sizes, times (s), ComplexityFit or None
+
+    def __init__(self, problem: CodeLabProblem, parent=None):
+        super().__init__(parent)
+        self.problem = problem
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        # Instructions
+        header = QLabel(f"Code Lab - Implement {problem.signature}")
+        header.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {Colors.ACCENT_PRIMARY};")
+        layout.addWidget(header)
+
+        instructions = QLabel(problem.instructions)
+        instructions.setWordWrap(True)
+        instructions.setStyleSheet(f"color: {Colors.TEXT_SECONDARY};")
+        layout.addWidget(instructions)
+
+        self.editor = CodeEditor(problem.template)
+        layout.addWidget(self.editor)
+
+        # Button row
+        btn_layout = QHBoxLayout()
+
+        self.test_btn = QPushButton("Run Tests")
+        self.test_btn.clicked.connect(self.run_tests)
+        self.test_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.test_btn.setAccessibleName("Run test cases against your code")
+        btn_layout.addWidget(self.test_btn)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_tests)
+        self.cancel_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cancel_btn.setAccessibleName("Stop the running tests")
+        self.cancel_btn.setEnabled(False)
+        btn_layout.addWidget(self.cancel_btn)
+
+        self.measure_btn = QPushButton("Measure Complexity")
+        self.measure_btn.clicked.connect(self.measure_complexity)
+        self.measure_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.measure_btn.setAccessibleName("Time your code across input sizes and fit its growth")
+        btn_layout.addWidget(self.measure_btn)
+
+        self.benchmark_btn = QPushButton("Benchmark")
+        self.benchmark_btn.clicked.connect(self.run_benchmark)
+        self.benchmark_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.benchmark_btn.setAccessibleName("Compare your code's speed with the reference solution")
+        btn_layout.addWidget(self.benchmark_btn)
+
+        self.fuzz_btn = QPushButton("Fuzz")
+        self.fuzz_btn.clicked.connect(self.fuzz_code)
+        self.fuzz_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.fuzz_btn.setAccessibleName("Compare your code with the reference on thousands of random inputs")
+        btn_layout.addWidget(self.fuzz_btn)
+
+        self.profile_btn = QPushButton("Profile")
+        self.profile_btn.clicked.connect(self.profile_code)
+        self.profile_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.profile_btn.setAccessibleName("Time each line of your code and shade the hot lines")
+        btn_layout.addWidget(self.profile_btn)
+
+        reset_btn = QPushButton("Reset Code")
+        reset_btn.clicked.connect(self.reset_code)
+        reset_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        reset_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: transparent;
+                color: {Colors.TEXT_SECONDARY};
+                border: 1px solid {Colors.ACCENT_TERTIARY};
+            }}
+            QPushButton:hover {{
+                color: {Colors.ERROR};
+                border-color: {Colors.ERROR};
+            }}
+        """)
+        btn_layout.addWidget(reset_btn)
+
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+        # Progress through the test cases
+        self.test_progress = QProgressBar()
+        self.test_progress.setRange(0, len(problem.test_cases) + len(problem.scale_cases))
+        self.test_progress.setValue(0)
+        self.test_progress.setFormat("Test %v of %m")
+        self.test_progress.setFixedHeight(20)
+        self.test_progress.setStyleSheet(f"""
+            QProgressBar {{
+                background-color: {Colors.BG_CARD};
+                border: 1px solid {Colors.ACCENT_TERTIARY};
+                border-radius: 3px;
+                text-align: center;
+                color: {Colors.TEXT_PRIMARY};
+                font-size: 11px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {Colors.ACCENT_SECONDARY};
+                border-radius: 2px;
+            }}
+        """)
+        self.test_progress.hide()
+        layout.addWidget(self.test_progress)
+
+        # Results
+        self.feedback = QTextEdit()
+        self.feedback.setReadOnly(True)
+        self.feedback.setMaximumHeight(180)
+        self.feedback.setPlaceholderText("Test results will appear here...")
+        layout.addWidget(self.feedback)
+
+        # Peak memory of the scale inputs
+        self.memory_curve = MemoryCurveWidget()
+        layout.addWidget(self.memory_curve)
+
+        # Reference vs submission timings
+        self.benchmark_panel = BenchmarkPanel()
+        layout.addWidget(self.benchmark_panel)
+
+        self._runner: Optional[SuiteRunner] = None
+        self._shown = 0  # Cases already written to feedback
+        self._code = ""
+        self._cache_key: Optional[str] = None  # Grading cache entry for the current test run
+        self._scale_cases = []  # ScaleCases of the current run
+        self._memory_cases = []  # (n, seed) of the scale inputs in the memory pass
+        self._reference_times = []  # Reference timings of the current benchmark
+
+    def reset_code(self):
+        """Reset code to template."""
+        self.editor.set_code(self.problem.template)
+        self.feedback.clear()
+
+    def run_tests(self):
+        """Run the test cases on a background thread, streaming results into feedback."""
+        if self._runner is not None:
+            return
+
+        problem = self.problem
+        code = self._code = self.editor.get_code()
+        self.feedback.clear()
+        self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+        self.memory_curve.hide()
+        self._shown = 0
+        steps = len(problem.test_cases) + len(problem.scale_cases)
+
+        # Unchanged code on an unchanged suite needs no sandbox run
+        cache = grade_cache()
+        self._cache_key = None
+        if cache is not None:
+            key = cache.key(code, suite_version(problem.test_cases), sandbox_settings())
+            outcomes = cache.get(key)
+            if outcomes is not None:
+                self.feedback.append("Test results for this code from the grading cache:")
+                self._start_run(steps, "Test %v of %m")
+                self._on_suite_finished(outcomes)
+                return
+            self._cache_key = key
+
+        # Ship every case to the sandbox in one round-trip. With a
+        # result_converter the answers are read back inside the sandbox, since
+        # classes defined by the submission cannot leave a worker process.
+        cases = [self._call_args(case[:-1]) for case in problem.test_cases]
+        self._runner = self._suite_runner(
+            code,
+            cases,
+            per_case_timeout=Sandbox.TEST_TIMEOUT_S,
+            total_timeout=Sandbox.TEST_TIMEOUT_S * len(cases),
+            fuel=Sandbox.TEST_FUEL,
+            memory_limit=Sandbox.TEST_MEMORY_LIMIT_MB * 1024 * 1024
+        )
+        self._runner.case_finished.connect(self._on_case_finished)
+        self._runner.suite_finished.connect(self._on_suite_finished)
+        self._start_run(steps, "Test %v of %m")
+
+    def measure_complexity(self):
+        """Time the code over the problem's complexity sizes and fit a growth model to it."""
+        if self._runner is not None:
+            return
+
+        sizes = self.problem.complexity_sizes
+        self.feedback.clear()
+        self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+        self.feedback.append(
+            f"Measuring {self.problem.func_name}() from n={sizes[0]:,} to n={sizes[-1]:,}..."
+        )
+
+        # Unmetered, so the timings are not inflated by fuel or memory tracing
+        cases = complexity_cases(sizes)
+        self._runner = self._suite_runner(
+            self.editor.get_code(),
+            cases,
+            per_case_timeout=Sandbox.COMPLEXITY_TIMEOUT_S,
+            total_timeout=Sandbox.COMPLEXITY_TIMEOUT_S * len(cases),
+            arg_converter=self.problem.generate
+        )
+        self._runner.case_finished.connect(self._on_measure_case_finished)
+        self._runner.suite_finished.connect(self._on_measure_finished)
+        self._start_run(len(cases), "Run %v of %m")
+
+    def _on_measure_case_finished(self, index: int, outcome):
+        self.test_progress.setValue(index + 1)
+        if outcome.status != "ok" and self._runner is not None:
+            # Larger sizes would only fail the same way, more slowly
+            self._runner.cancel()
+
+    def _on_measure_finished(self, outcomes):
+        sizes, times = best_times(self.problem.complexity_sizes, outcomes)
+        for n, seconds in zip(sizes, times):
+            self.feedback.append(f"n={n:,}: {format_seconds(seconds)}")
+
+        stopped = next((outcome for outcome in outcomes if outcome.status != "ok"), None)
+        if stopped is not None and stopped.status != "skipped":
+            self.feedback.append(f"Stopped measuring: {stopped.message}")
+
+        expected = self.problem.expected_complexity
+        fit = fit_complexity(sizes, times)
+        if fit is None:
+            self.feedback.append("\nToo few sizes finished to fit a growth model (need 3).")
+            self.feedback.setStyleSheet(f"color: {Colors.WARNING};")
+        else:
+            self.feedback.append(
+                f"\nBest fit: {fit.label} (confidence {fit.confidence:.0%}); "
+                f"expected {expected}. See the Complexity tab."
+            )
+            if fit.label == expected:
+                color = Colors.SUCCESS
+            elif fit.confidence >= COMPLEXITY_MIN_CONFIDENCE:
+                color = Colors.WARNING
+            else:
+                color = Colors.TEXT_PRIMARY
+                self.feedback.append("The timings are too close to call between models on this machine.")
+            self.feedback.setStyleSheet(f"color: {color};")
+        self.complexity_measured.emit(sizes, times, fit)
+
+        self._runner = None
+        self._finish_run()
+
+    def run_benchmark(self):
+        """Time the reference and the code on the same inputs and tabulate both."""
+        if self._runner is not None:
+            return
+
+        self.feedback.clear()
+        self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+        self.feedback.append("Benchmarking against the reference solution...")
+
+        cases = complexity_cases(self.problem.benchmark_sizes, repeats=Sandbox.BENCHMARK_REPEATS)
+        self._runner = self._suite_runner(
+            self.editor.get_code(),
+            cases,
+            prepare=lambda: self._time_reference(cases),
+            per_case_timeout=Sandbox.COMPLEXITY_TIMEOUT_S,
+            total_timeout=Sandbox.COMPLEXITY_TIMEOUT_S * len(cases),
+            arg_converter=self.problem.generate
+        )
+        self._runner.case_finished.connect(self._on_measure_case_finished)
+        self._runner.suite_finished.connect(self._on_benchmark_finished)
+        self._start_run(len(cases), "Run %v of %m")
+
+    def _time_reference(self, cases):
+        # Runs on the runner thread, before the submission
+        self._reference_times = time_runs(self.problem.reference, cases, self.problem.generate)
+        return {}
+
+    def _on_benchmark_finished(self, outcomes):
+        rows = benchmark_rows(
+            self.problem.benchmark_sizes, self._reference_times, outcomes, repeats=Sandbox.BENCHMARK_REPEATS
+        )
+        self.benchmark_panel.show_report(benchmark_report(self.problem.report_name, rows, sandbox_backend()))
+
+        stopped = next((outcome for outcome in outcomes if outcome.status != "ok"), None)
+        if stopped is not None and stopped.status != "skipped":
+            self.feedback.append(f"Stopped benchmarking: {stopped.message}")
+        self.feedback.append("Benchmark finished; timings are in the table below.")
+
+        self._runner = None
+        self._finish_run()
+
+    def fuzz_code(self):
+        """Compare the code with the reference on random inputs, shrinking any failure."""
+        if self._runner is not None:
+            return
+
+        self.feedback.clear()
+        self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+        self.feedback.append(
+            f"Fuzzing {self.problem.func_name}() against the reference solution "
+            f"on {Sandbox.FUZZ_CASES:,} random inputs..."
+        )
+
+        self._runner = FuzzRunner(self.editor.get_code(), self.problem.fuzz, parent=self)
+        self._runner.progress.connect(self._on_fuzz_progress)
+        self._runner.fuzz_finished.connect(self._on_fuzz_finished)
+        self._runner.finished.connect(self._runner.deleteLater)
+        self._start_run(Sandbox.FUZZ_CASES, "Input %v of %m")
+
+    def _on_fuzz_progress(self, done: int, total: int):
+        self.test_progress.setValue(done)
+
+    def _on_fuzz_finished(self, report):
+        self.feedback.append(
+            f"Ran {report.cases:,} random inputs in {format_seconds(report.elapsed)} (seed {report.seed})."
+        )
+        if report.cancelled:
+            self.feedback.append("Fuzzing cancelled.")
+        if report.error is not None:
+            self.feedback.append(f"Some inputs could not be run: {report.error}")
+
+        failure = report.counterexample or report.first_failure
+        if failure is not None:
+            self.feedback.append(f"\n{report.failures:,} inputs failed. Smallest failing input found:")
+            inputs = ", ".join(f"{name}={value}" for name, value in zip(self.problem.arg_names, failure.args))
+            self.feedback.append(f"  {inputs}")
+            if failure.actual is None:
+                self.feedback.append(f"  Expected {failure.expected}: {failure.message}")
+            else:
+                self.feedback.append(f"  Expected {failure.expected}, Got {failure.actual}")
+                self.feedback.append(f"  {failure.message}")
+            self.feedback.setStyleSheet(f"color: {Colors.ERROR};")
+        elif not report.cancelled and report.error is None:
+            self.feedback.append("Every answer agreed with the reference.")
+            self.feedback.setStyleSheet(f"color: {Colors.SUCCESS};")
+        else:
+            self.feedback.setStyleSheet(f"color: {Colors.WARNING};")
+
+        self._runner = None
+        self._finish_run()
+
+    def profile_code(self):
+        """Run the code under the line profiler on the profile cases and shade the editor gutter."""
+        if self._runner is not None:
+            return
+
+        cases = self.problem.profile_cases
+        code = self._code = self.editor.get_code()
+        self.feedback.clear()
+        self.feedback.setStyleSheet(f"color: {Colors.TEXT_PRIMARY};")
+        self.feedback.append(f"Profiling {self.problem.func_name}() on n={cases[0][0]:,}...")
+
+        self._runner = self._suite_runner(
+            code,
+            cases,
+            per_case_timeout=Sandbox.TEST_TIMEOUT_S,
+            total_timeout=Sandbox.TEST_TIMEOUT_S * len(cases),
+            fuel=Sandbox.TEST_FUEL,
+            arg_converter=self.problem.generate,
+            profile=True
+        )
+        self._runner.suite_finished.connect(self._on_profile_finished)
+        self._start_run(len(cases), "Run %v of %m")
+
+    def _on_profile_finished(self, outcomes):
+        self.test_progress.setValue(len(outcomes))
+        stopped = next((outcome for outcome in outcomes if outcome.status != "ok"), None)
+        if stopped is not None:
+            self.feedback.append(f"Stopped early: {stopped.message}")
+
+        profile = merge_line_profiles(outcome.line_profile for outcome in outcomes)
+        if not profile:
+            self.feedback.append("None of your code's lines ran.")
+        elif self.editor.get_code() != self._code:
+            self.feedback.append("The code changed while it was profiled; profile again to see the heat.")
+        else:
+            self.editor.set_line_profile(profile)
+            total = sum(seconds for _, seconds in profile.values()) or 1.0
+            source = self._code.splitlines()
+            self.feedback.append("Hottest lines:")
+            for line, hits, seconds in hot_lines(profile):
+                text = source[line - 1].strip() if line <= len(source) else ""
+                self.feedback.append(
+                    f"  Line {line}: {seconds / total:.0%} of the time, {hits:,} hits | {text}"
+                )
+            self.feedback.append("The strip beside the line numbers shows the heat; hover it for details.")
+
+        self._runner = None
+        self._finish_run()
+
+    def cancel_tests(self):
+        """Stop the running tests; cases that did not finish are skipped."""
+        if self._runner is not None:
+            self.cancel_btn.setEnabled(False)
+            self._runner.cancel()
+
+    def _call_args(self, inputs: tuple) -> tuple:
+        # The thread backend calls the submission on these objects directly
+        if self.problem.to_args is not None:
+            return self.problem.to_args(*inputs)
+        return copy.deepcopy(tuple(inputs))
+
+    def _suite_runner(self, code: str, cases: Sequence[tuple], **kwargs: Any) -> SuiteRunner:
+        """A SuiteRunner for the problem's function, deleted once it finishes."""
+        runner = SuiteRunner(
+            code,
+            self.problem.func_name,
+            cases,
+            parent=self,
+            namespace=self.problem.namespace,
+            result_converter=self.problem.result_converter,
+            **kwargs
+        )
+        runner.finished.connect(runner.deleteLater)
+        return runner
+
+    def _format_outcome(self, index: int, outcome) -> str:
+        *inputs, expected = self.problem.test_cases[index]
+        case = self.problem.case_separator.join(str(value) for value in inputs)
+        result = outcome.value
+
+        if outcome.status == "skipped":
+            return f"SKIPPED: {case} -> {outcome.message}"
+        if outcome.status != "ok":
+            return f"ERROR: {case} -> {outcome.message}"
+        if result == expected:
+            return f"PASS: {case} -> {result} ({self._usage(outcome)})"
+        return f"FAIL: {case} -> Expected {expected}, Got {result} ({self._usage(outcome)})"
+
+    @staticmethod
+    def _usage(outcome) -> str:
+        return f"{outcome.ops} ops, {format_bytes(outcome.peak_memory)} peak"
+
+    def _on_case_finished(self, index: int, outcome):
+        self.feedback.append(self._format_outcome(index, outcome))
+        self._shown = index + 1
+        self.test_progress.setValue(self._shown)
+
+    def _on_suite_finished(self, outcomes):
+        # Cases the sandbox never ran (timeouts, skips, load errors)
+        for index in range(self._shown, len(outcomes)):
+            self.feedback.append(self._format_outcome(index, outcomes[index]))
+        self.test_progress.setValue(len(outcomes))
+
+        cache = grade_cache()
+        if cache is not None and self._cache_key is not None and cacheable(outcomes):
+            cache.put(self._cache_key, outcomes)
+        self._cache_key = None
+
+        tests_run = len(outcomes)
+        all_passed = all(
+            outcome.status == "ok" and outcome.value == expected
+            for outcome, (*_, expected) in zip(outcomes, self.problem.test_cases)
+        )
+        self._runner = None
+        if all_passed and tests_run > 0:
+            self.feedback.append(f"\nAll {tests_run} Tests Passed! Great Job!")
+            self.feedback.setStyleSheet(f"color: {Colors.SUCCESS};")
+            self._start_scale_tier()
+        else:
+            self._finish_run()
+
+    def _start_scale_tier(self):
+        """Run the large generated inputs, each against a time budget."""
+        self.feedback.append("\nScale tier: timing the reference solution...")
+        self._shown = 0
+        self._runner = self._suite_runner(
+            self._code,
+            self.problem.scale_cases,
+            prepare=self._prepare_scale_tier,
+            arg_converter=self.problem.generate
+        )
+        self._runner.case_finished.connect(self._on_scale_case_finished)
+        self._runner.suite_finished.connect(self._on_scale_finished)
+        self._runner.start()
+
+    def _prepare_scale_tier(self):
+        # Runs on the runner thread
+        problem = self.problem
+        self._scale_cases = prepare_scale_cases(
+            problem.scale_cases, problem.generate, problem.reference, to_expected=problem.to_expected
+        )
+        timeout = scale_timeout(self._scale_cases)
+        return {"per_case_timeout": timeout, "total_timeout": timeout * len(problem.scale_cases)}
+
+    def _on_scale_case_finished(self, index: int, outcome):
+        self.feedback.append(scale_verdict(self._scale_cases[index], outcome)[1])
+        self._shown = index + 1
+        self.test_progress.setValue(len(self.problem.test_cases) + self._shown)
+
+    def _on_scale_finished(self, outcomes):
+        verdicts = []
+        for index, outcome in enumerate(outcomes):
+            verdict, line = scale_verdict(self._scale_cases[index], outcome)
+            verdicts.append(verdict)
+            if index >= self._shown:
+                self.feedback.append(line)
+
+        if all(verdict == "pass" for verdict in verdicts):
+            self.feedback.append("Every scale input finished within its budget.")
+        else:
+            slow = verdicts.count("slow")
+            if slow:
+                self.feedback.append(
+                    f"{slow} of {len(verdicts)} scale inputs missed the time budget: the answers "
+                    "are right, but the algorithm does not scale. Look for a faster approach."
+                )
+            self.feedback.setStyleSheet(f"color: {Colors.WARNING};")
+
+        self._runner = None
+        finished = [
+            (case.n, case.seed) for case, outcome in zip(self._scale_cases, outcomes)
+            if outcome.status == "ok"
+        ]
+        if finished:
+            self._start_memory_pass(finished)
+        else:
+            self._finish_run()
+
+    def _start_memory_pass(self, cases):
+        """Rerun the scale inputs that finished, measuring peak memory rather than time."""
+        self.feedback.append("\nMeasuring peak memory on the scale inputs...")
+        self._memory_cases = cases
+        # tracemalloc slows allocation down, so these runs are not timed
+        timeout = scale_timeout(self._scale_cases) * Sandbox.SCALE_MEMORY_TIMEOUT_FACTOR
+        self._runner = self._suite_runner(
+            self._code,
+            cases,
+            per_case_timeout=timeout,
+            total_timeout=timeout * len(cases),
+            arg_converter=self.problem.generate,
+            measure_memory=True
+        )
+        self._runner.suite_finished.connect(self._on_memory_finished)
+        self._runner.start()
+
+    def _on_memory_finished(self, outcomes):
+        sizes, peaks = [], []
+        for (n, _), outcome in zip(self._memory_cases, outcomes):
+            if outcome.status == "ok":
+                sizes.append(n)
+                peaks.append(outcome.peak_memory)
+                self.feedback.append(
+                    f"n={n:,}: {format_bytes(outcome.peak_memory)} peak "
+                    f"({outcome.peak_memory / n:.0f} bytes per element)"
+                )
+        if sizes:
+            self.memory_curve.set_points(sizes, peaks)
+
+        self._runner = None
+        self._finish_run()
+
+    def _start_run(self, steps: int, progress_format: str):
+        self.test_btn.setEnabled(False)
+        self.measure_btn.setEnabled(False)
+        self.benchmark_btn.setEnabled(False)
+        self.fuzz_btn.setEnabled(False)
+        self.profile_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.test_progress.setRange(0, steps)
+        self.test_progress.setFormat(progress_format)
+        self.test_progress.setValue(0)
+        self.test_progress.show()
+        if self._runner is not None:  # None when the results came from the grading cache
+            self._runner.start()
+
+    def _finish_run(self):
+        self.test_btn.setEnabled(True)
+        self.measure_btn.setEnabled(True)
+        self.benchmark_btn.setEnabled(True)
+        self.fuzz_btn.setEnabled(True)
+        self.profile_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.test_progress.hide()
@@ -1,4 +1,4 @@
-from typing import Callable, List
+from typing import Callable, List, Sequence
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSlider, QFrame
 from PyQt6.QtCore import Qt, QRect
 from PyQt6.QtGui import QPainter, QPen, QColor, QFont
@@ -19,6 +19,8 @@ class SimplePlotWidget(QFrame):
         self.setStyleSheet("background-color: #090d1a; border: 1px solid #2d1b4e; border-radius: 6px;")
         self.x_data = []
         self.y_data = []
+        self.x_points = []
+        self.y_points = []
         self.title = ""
         self.x_label = ""
         self.y_label = ""
@@ -35,6 +37,12 @@ class SimplePlotWidget(QFrame):
         self.y_data = y
         self.update()
 
+    def setPoints(self, x, y):
+        """Scatter points drawn over the line, on the same axes."""
+        self.x_points = x
+        self.y_points = y
+        self.update()
+
     def paintEvent(self, event):
         super().paintEvent(event)
         painter = QPainter(self)
@@ -62,8 +70,8 @@ class SimplePlotWidget(QFrame):
             painter.setPen(pen)
 
             # Simple line plot
-            max_x = max(self.x_data) if self.x_data else 1
-            max_y = max(self.y_data) if self.y_data else 1
+            max_x = max(list(self.x_data) + list(self.x_points)) or 1
+            max_y = max(list(self.y_data) + list(self.y_points)) or 1
 
             points = []
             for x, y in zip(self.x_data, self.y_data):
@@ -76,13 +84,27 @@ class SimplePlotWidget(QFrame):
                 painter.drawLine(int(points[i][0]), int(points[i][1]),
                                int(points[i+1][0]), int(points[i+1][1]))
 
+            # Measured points
+            painter.setPen(QPen(QColor("#a678ff"), 2))
+            painter.setBrush(QColor("#a678ff"))
+            for x, y in zip(self.x_points, self.y_points):
+                px = plot_rect.left() + (x / max_x) * plot_rect.width()
+                py = plot_rect.bottom() - (y / max_y) * plot_rect.height()
+                painter.drawEllipse(int(px) - 4, int(py) - 4, 8, 8)
+
 class ComplexityWidget(QWidget):
     """
     A widget to visualize time complexity using PyQtGraph or fallback.
+
+    set_measurements() overlays timings of a submission on the theoretical
+    curve, which is then scaled to the measured times.
     """
     def __init__(self, title: str, x_label: str, y_label: str, complexity_func: Callable[[int], List[int]]):
         super().__init__()
         self.complexity_func = complexity_func
+        self.y_label = y_label
+        self.measured_sizes: List[int] = []
+        self.measured_times: List[float] = []
 
         layout = QVBoxLayout(self)
 
@@ -109,6 +131,12 @@ class ComplexityWidget(QWidget):
 
         layout.addWidget(self.plot_widget)
 
+        # Best fit of the measured points
+        self.fit_label = QLabel()
+        self.fit_label.setStyleSheet("color: #a678ff; margin-top: 6px;")
+        self.fit_label.hide()
+        layout.addWidget(self.fit_label)
+
         # Slider
         slider_label = QLabel("Adjust input size:")
         slider_label.setStyleSheet("color: #e5f4ff; margin-top: 10px;")
@@ -117,7 +145,7 @@ class ComplexityWidget(QWidget):
         self.slider = QSlider(Qt.Orientation.Horizontal)
         self.slider.setRange(5, 200)
         self.slider.setValue(30)
-        self.slider.valueChanged.connect(self.update_plot)
+        self.slider.valueChanged.connect(self._on_slider_moved)
         self.slider.setStyleSheet("""
             QSlider::groove:horizontal {
                 background: #1d1142;
@@ -140,12 +168,119 @@ class ComplexityWidget(QWidget):
         # Initial plot
         self.update_plot(self.slider.value())
 
+    def _on_slider_moved(self, n: int):
+        # Back to the theoretical curve alone
+        self.clear_measurements()
+        self.update_plot(n)
+
+    def set_measurements(self, sizes: Sequence[int], times: Sequence[float], fit=None):
+        """
+        Plot measured run times against the theoretical curve.
+
+        Args:
+            sizes: Input sizes, ascending
+            times: Seconds taken at each size
+            fit: Optional ComplexityFit from core.benchmark, shown as text
+        """
+        self.measured_sizes = list(sizes)
+        self.measured_times = list(times)
+        if fit is not None:
+            self.fit_label.setText(
+                f"Measured: {fit.label} (confidence {fit.confidence:.0%}), points in purple"
+            )
+            self.fit_label.show()
+        else:
+            self.fit_label.hide()
+        self.update_plot(self.slider.value())
+
+    def clear_measurements(self):
+        self.measured_sizes = []
+        self.measured_times = []
+        self.fit_label.hide()
+
     def update_plot(self, n: int):
+        if self.measured_sizes:
+            self._plot_measurements()
+            return
+
         x = list(range(1, n + 1))
         y = self.complexity_func(n)
 
         if HAS_PYQTGRAPH:
+            self.plot_widget.setLabel("left", self.y_label, color="#e5f4ff")
             self.plot_widget.clear()
             self.plot_widget.plot(x, y, pen=self.pen)
         else:
+            self.plot_widget.setPoints([], [])
             self.plot_widget.setData(x, y)
+
+    def _plot_measurements(self):
+        sizes = self.measured_sizes
+        times_ms = [t * 1000 for t in self.measured_times]
+
+        # Theoretical curve over the measured range, through the largest point
+        max_n = sizes[-1]
+        theory = self.complexity_func(max_n)
+        step = max(1, max_n // 200)
+        x = list(range(1, max_n + 1, step))
+        if x[-1] != max_n:
+            x.append(max_n)
+        scale = times_ms[-1] / theory[max_n - 1] if theory[max_n - 1] else 0.0
+        y = [theory[i - 1] * scale for i in x]
+
+        if HAS_PYQTGRAPH:
+            self.plot_widget.setLabel("left", "Time (ms)", color="#e5f4ff")
+            self.plot_widget.clear()
+            self.plot_widget.plot(x, y, pen=self.pen)
+            self.plot_widget.plot(
+                sizes, times_ms, pen=None, symbol="o", symbolSize=8,
+                symbolBrush="#a678ff", symbolPen="#a678ff"
+            )
+        else:
+            self.plot_widget.setData(x, y)
+            self.plot_widget.setPoints(sizes, times_ms)
+
+
+class MemoryCurveWidget(QWidget):
+    """
+    Peak memory of a submission against input size, from the scale tier.
+
+    Hidden until set_points() is called.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title = "Peak memory (KB) vs input size"
+        if HAS_PYQTGRAPH:
+            self.plot_widget = pg.PlotWidget()
+            self.plot_widget.setBackground("#090d1a")
+            self.plot_widget.setTitle(title, color="#e5f4ff", size="10pt")
+            self.plot_widget.setLabel("left", "Peak memory (KB)", color="#e5f4ff")
+            self.plot_widget.setLabel("bottom", "Input Size (n)", color="#e5f4ff")
+            self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
+        else:
+            self.plot_widget = SimplePlotWidget()
+            self.plot_widget.setTitle(title)
+            self.plot_widget.setLabels("Input Size (n)", "Peak memory (KB)")
+        self.plot_widget.setMinimumHeight(180)
+        self.plot_widget.setMaximumHeight(220)
+        layout.addWidget(self.plot_widget)
+
+        self.hide()
+
+    def set_points(self, sizes: Sequence[int], peaks: Sequence[int]):
+        """Plot peak allocations in bytes at each input size, ascending."""
+        sizes = list(sizes)
+        peaks_kb = [peak / 1024 for peak in peaks]
+        if HAS_PYQTGRAPH:
+            self.plot_widget.clear()
+            self.plot_widget.plot(
+                sizes, peaks_kb, pen=pg.mkPen(color="#00ffae", width=2), symbol="o",
+                symbolSize=8, symbolBrush="#a678ff", symbolPen="#a678ff"
+            )
+        else:
+            self.plot_widget.setData(sizes, peaks_kb)
+            self.plot_widget.setPoints(sizes, peaks_kb)
+        self.show()
@@ -216,7 +216,8 @@ class FlowchartWidget(QWidget):
 
     def highlight_node(self, key: str):
         """Programmatically highlight a node (e.g. from trace execution)."""
-        if key in self.nodes:
+        # Consecutive steps often stay on one node; skip the re-select and scroll
+        if key in self.nodes and self.nodes[key] is not self.selected_node:
             self._on_node_click(self.nodes[key])
             self.view.ensureVisible(self.nodes[key])
 
@@ -0,0 +1,159 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+from PyQt6.QtCore import QThread, QCoreApplication, pyqtSignal
+
+from pyqt6_learning_labs.core.fuzz import FuzzSpec, run_fuzz
+from pyqt6_learning_labs.core.safe_exec import CancelToken, safe_exec_suite
+from pyqt6_learning_labs.core.trace import TraceEvent
+from pyqt6_learning_labs.core.trace_file import write_trace
+
+
+class SuiteRunner(QThread):
+    """
+    Runs safe_exec_suite off the GUI thread.
+
+    case_finished is emitted as each case completes, so results can be shown
+    while the rest of the suite is still running; suite_finished carries the
+    full list of CaseResults (including cases that were skipped). Keyword
+    arguments are passed through to safe_exec_suite.
+
+    prepare, if given, also runs on the background thread before the suite
+    and returns further keyword arguments for it (e.g. a per-case timeout
+    derived from timing a reference solution).
+    """
+
+    case_finished = pyqtSignal(int, object)  # Case index, CaseResult
+    suite_finished = pyqtSignal(object)  # List[CaseResult]
+
+    def __init__(
+        self,
+        code: str,
+        func_name: str,
+        cases: Sequence[tuple],
+        parent=None,
+        prepare: Optional[Callable[[], Dict[str, Any]]] = None,
+        **suite_kwargs: Any
+    ):
+        super().__init__(parent)
+        self.code = code
+        self.func_name = func_name
+        self.cases = list(cases)
+        self.prepare = prepare
+        self.suite_kwargs = suite_kwargs
+        self._token = CancelToken()
+
+        # A QThread must not be destroyed while running
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop)
+
+    def run(self):
+        # A bound method would keep its widget alive in a cycle through this
+        # thread, which the garbage collector may then free from any thread
+        prepare, self.prepare = self.prepare, None
+        if prepare is not None:
+            self.suite_kwargs.update(prepare())
+        results = safe_exec_suite(
+            self.code,
+            self.func_name,
+            self.cases,
+            on_result=self.case_finished.emit,
+            cancel_token=self._token,
+            **self.suite_kwargs
+        )
+        self.suite_finished.emit(results)
+
+    def cancel(self):
+        """Stop the suite; unfinished cases are reported as skipped."""
+        self._token.cancel()
+
+    def _stop(self):
+        self.cancel()
+        self.wait()
+
+
+class FuzzRunner(QThread):
+    """
+    Runs core.fuzz.run_fuzz off the GUI thread.
+
+    progress is emitted after each batch of inputs; fuzz_finished carries
+    the FuzzReport. Keyword arguments are passed through to run_fuzz.
+    """
+
+    progress = pyqtSignal(int, int)  # Inputs done, total
+    fuzz_finished = pyqtSignal(object)  # FuzzReport
+
+    def __init__(self, code: str, spec: FuzzSpec, parent=None, **fuzz_kwargs: Any):
+        super().__init__(parent)
+        self.code = code
+        self.spec = spec
+        self.fuzz_kwargs = fuzz_kwargs
+        self._token = CancelToken()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop)
+
+    def run(self):
+        report = run_fuzz(
+            self.code,
+            self.spec,
+            on_progress=self.progress.emit,
+            cancel_token=self._token,
+            **self.fuzz_kwargs
+        )
+        self.fuzz_finished.emit(report)
+
+    def cancel(self):
+        """Stop fuzzing; batches that did not finish are dropped."""
+        self._token.cancel()
+
+    def _stop(self):
+        self.cancel()
+        self.wait()
+
+
+class TraceWriter(QThread):
+    """
+    Runs core.trace_file.write_trace off the GUI thread.
+
+    progress is emitted every PROGRESS_INTERVAL events; write_finished
+    carries the number of events written and an error message, empty if the
+    file was written. A cancelled write removes the partial file.
+    """
+
+    progress = pyqtSignal(int)  # Events written
+    write_finished = pyqtSignal(int, str)  # Events written, error or ""
+
+    def __init__(self, path: str, events: Iterable[TraceEvent], problem: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.events = events
+        self.problem = problem
+        self._token = CancelToken()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._stop)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._token.cancelled
+
+    def run(self):
+        try:
+            count = write_trace(
+                self.path, self.events, self.problem,
+                on_progress=self.progress.emit, cancel_token=self._token
+            )
+        except OSError as e:
+            self.write_finished.emit(0, f"Could not save trace: {e}")
+            return
+        self.write_finished.emit(count, "")
+
+    def cancel(self):
+        """Stop writing and remove the partial file."""
+        self._token.cancel()
+
+    def _stop(self):
+        self.cancel()
+        self.wait()
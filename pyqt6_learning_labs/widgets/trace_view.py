@@ -0,0 +1,147 @@
+from typing import Optional
+from PyQt6.QtWidgets import QStackedWidget, QPlainTextEdit, QTableView, QHeaderView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QTextCursor
+
+from pyqt6_learning_labs.core.constants import Colors, Playground
+from pyqt6_learning_labs.core.trace import TraceStream
+
+
+class TraceModel(QAbstractListModel):
+    """Steps first..stop-1 of a TraceStream; a row's text is rendered when it is painted."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trace: Optional[TraceStream] = None
+        self.first = 0
+        self.stop = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.stop - self.first
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        step = self.first + index.row()
+        # The stream may already have dropped the top row before the next update
+        if self.trace is None or not self.trace.kept(step):
+            return None
+        return self.trace.text(step)
+
+    def set_steps(self, trace: Optional[TraceStream], first: int, stop: int):
+        """Show steps first..stop-1, inserting and removing rows at the ends where possible."""
+        if trace is not self.trace or first < self.first or first >= self.stop or stop <= first:
+            self.beginResetModel()
+            self.trace, self.first, self.stop = trace, first, max(first, stop)
+            self.endResetModel()
+            return
+
+        if first > self.first:
+            # Steps dropped from the stream's history
+            self.beginRemoveRows(QModelIndex(), 0, first - self.first - 1)
+            self.first = first
+            self.endRemoveRows()
+        if stop > self.stop:
+            self.beginInsertRows(QModelIndex(), self.stop - first, stop - first - 1)
+            self.stop = stop
+            self.endInsertRows()
+        elif stop < self.stop:
+            self.beginRemoveRows(QModelIndex(), stop - first, self.stop - first - 1)
+            self.stop = stop
+            self.endRemoveRows()
+
+
+class TraceView(QStackedWidget):
+    """
+    Trace box for the playgrounds.
+
+    Shows a range of steps from a TraceStream. Stepping forward appends
+    only the new lines and stepping back removes only the last one, so
+    auto-play costs O(1) per step. Once more than Playground.TRACE_TEXT_LINES are shown it switches
+    to a list view that only renders the visible rows, and stays there
+    until cleared.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._trace: Optional[TraceStream] = None
+        self._first = 0
+        self._stop = 0
+
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        self.text_view.setPlaceholderText("Execution trace will appear here...")
+        self.addWidget(self.text_view)
+
+        self.model = TraceModel(self)
+        # A one-column table rather than a QListView: with fixed row heights its
+        # layout does not walk every row when one is added
+        self.list_view = QTableView()
+        self.list_view.setModel(self.model)
+        self.list_view.horizontalHeader().hide()
+        self.list_view.horizontalHeader().setStretchLastSection(True)
+        self.list_view.verticalHeader().hide()
+        self.list_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.list_view.setShowGrid(False)
+        self.list_view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.addWidget(self.list_view)
+
+        self.setStyleSheet(f"""
+            QPlainTextEdit, QTableView {{
+                background-color: {Colors.BG_CARD};
+                border: 1px solid {Colors.ACCENT_TERTIARY};
+                border-radius: 4px;
+                padding: 12px;
+                font-family: 'Courier New', monospace;
+                font-size: 14px;
+                line-height: 1.5;
+            }}
+        """)
+
+    @property
+    def virtualized(self) -> bool:
+        """Whether the list view is showing."""
+        return self.currentWidget() is self.list_view
+
+    def show_steps(self, trace: TraceStream, first: int, stop: int):
+        """Show the texts of steps first..stop-1 of trace, scrolled to the last one."""
+        if stop <= first:
+            self.clear()
+            self._trace = trace
+            return
+
+        if self.virtualized or stop - first > Playground.TRACE_TEXT_LINES:
+            if not self.virtualized:
+                self.text_view.clear()
+                self.setCurrentWidget(self.list_view)
+            self.model.set_steps(trace, first, stop)
+            self.list_view.scrollToBottom()
+        elif trace is self._trace and first == self._first and stop > self._stop:
+            # One step, or the steps of one auto-play frame
+            self.text_view.appendPlainText("\n".join(trace.texts(self._stop, stop)))
+        elif trace is self._trace and first == self._first and stop == self._stop - 1:
+            cursor = QTextCursor(self.text_view.document().lastBlock())
+            cursor.select(QTextCursor.SelectionType.BlockUnderCursor)  # With the newline before it
+            cursor.removeSelectedText()
+        elif trace is not self._trace or first != self._first or stop != self._stop:
+            self.text_view.setPlainText("\n".join(trace.texts(first, stop)))
+            self.text_view.moveCursor(QTextCursor.MoveOperation.End)
+
+        self._trace, self._first, self._stop = trace, first, stop
+
+    def clear(self):
+        """Remove every line and go back to the text view."""
+        self.text_view.clear()
+        self.model.set_steps(None, 0, 0)
+        self.setCurrentWidget(self.text_view)
+        self._trace, self._first, self._stop = None, 0, 0
+
+    def toPlainText(self) -> str:
+        """
+        The lines shown, like QTextEdit.toPlainText(); in list mode this
+        renders every row.
+        """
+        if self.virtualized:
+            first = max(self._first, self._trace.first_kept)
+            return "\n".join(self._trace.texts(first, self._stop))
+        return self.text_view.toPlainText()